@@ -14,6 +14,7 @@ import uvicorn
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore, InMemoryPushNotifier
+from a2a_mcp.common.jsonrpc_batch import JSONRPCBatchMiddleware
 from a2a_mcp.common.types import AgentCard
 
 logger = logging.getLogger(__name__)
@@ -354,6 +355,9 @@ def main(host, port, agent_card):
         # Build the application
         app = server.build()
         
+        # Accept JSON-RPC batch arrays and execute their calls concurrently
+        app.add_middleware(JSONRPCBatchMiddleware)
+        
         # Add authentication middleware if configured
         if hasattr(agent_card_obj, 'auth_required') and agent_card_obj.auth_required:
             auth_schemes = []
@@ -331,4 +331,15 @@ class ParallelOrchestratorAgent(BaseAgent):
                 "is_task_complete": True,
                 "require_user_input": False,
                 "content": summary,
+            }
+        elif self.graph.state == Status.FAILED:
+            failed = ", ".join(
+                f"{node_id}: {error}" for node_id, error in self.graph.failed_nodes.items()
+            )
+            logger.error(f"Workflow failed: {failed}")
+            yield {
+                "response_type": "text",
+                "is_task_complete": True,
+                "require_user_input": False,
+                "content": f"Workflow failed; {len(self.graph.failed_nodes)} task(s) did not complete ({failed}).",
             }
\ No newline at end of file
@@ -3,28 +3,79 @@
 
 import asyncio
 import logging
-from typing import Dict, Optional, Any
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, Union
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import aiohttp
 from contextlib import asynccontextmanager
 
+from .a2a_health import AgentHealthMonitor, LivenessRecord, LivenessTable
+
 logger = logging.getLogger(__name__)
 
 
+AgentTarget = Union[int, str]
+
+
+def normalize_base_url(
+    target: AgentTarget,
+    default_host: str = "localhost",
+    default_scheme: str = "http"
+) -> str:
+    """
+    Normalize an agent target into a ``scheme://host:port`` base URL.
+
+    Args:
+        target: Port number, ``host:port`` string or full URL
+        default_host: Host used when only a port is given
+        default_scheme: Scheme used when the target has none
+
+    Returns:
+        Base URL with explicit scheme, lowercase host and port
+    """
+    if isinstance(target, int):
+        return f"{default_scheme}://{default_host}:{target}"
+
+    raw = str(target).strip()
+    if raw.isdigit():
+        return f"{default_scheme}://{default_host}:{raw}"
+    if "://" not in raw:
+        raw = f"{default_scheme}://{raw}"
+
+    parts = urlsplit(raw)
+    scheme = (parts.scheme or default_scheme).lower()
+    host = (parts.hostname or default_host).lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    if ":" in host:
+        host = f"[{host}]"
+    return f"{scheme}://{host}:{port}"
+
+
+@dataclass
+class _LoopConnections:
+    """Shared connector and session owned by a single event loop."""
+    connector: aiohttp.TCPConnector
+    session: aiohttp.ClientSession
+    created_at: datetime = field(default_factory=datetime.now)
+    last_used: datetime = field(default_factory=datetime.now)
+
+
 class A2AConnectionPool:
     """
     Framework V2.0 Connection Pool Manager for A2A Protocol
-    
+
     Provides connection pooling with:
-    - Persistent HTTP sessions per target port
+    - One shared connector and session per event loop
+    - Targets keyed by full base URL (scheme, host and port)
+    - Global and per-host connection caps
+    - Idle eviction of unused hosts and connectors
     - Automatic connection health monitoring
-    - Connection reuse and lifecycle management
-    - Configurable pool limits and timeouts
     - Performance metrics tracking
-    
+
     Expected performance improvement: 60% reduction in connection overhead
     """
-    
+
     def __init__(
         self,
         max_connections_per_host: int = 10,
@@ -33,11 +84,17 @@ class A2AConnectionPool:
         connection_timeout: int = 10,
         total_timeout: int = 60,
         health_check_interval: int = 300,  # 5 minutes
-        cleanup_interval: int = 600  # 10 minutes
+        cleanup_interval: int = 600,  # 10 minutes
+        max_total_connections: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        default_host: str = "localhost",
+        max_concurrent_health_checks: int = 16,
+        health_check_timeout: float = 5.0,
+        liveness_table: Optional[LivenessTable] = None
     ):
         """
         Initialize connection pool manager.
-        
+
         Args:
             max_connections_per_host: Maximum concurrent connections per host
             max_keepalive_connections: Maximum idle connections to keep alive
@@ -46,6 +103,14 @@ class A2AConnectionPool:
             total_timeout: Total timeout for requests
             health_check_interval: Seconds between health checks
             cleanup_interval: Seconds between cleanup cycles
+            max_total_connections: Global connection cap across all hosts
+                (defaults to 10x the per-host cap)
+            idle_timeout: Seconds a host or connector may stay unused before
+                eviction (defaults to twice the keepalive timeout)
+            default_host: Host used when a target is given as a bare port
+            max_concurrent_health_checks: Upper bound on simultaneous health probes
+            health_check_timeout: Seconds before a health probe counts as failed
+            liveness_table: Table receiving probe results (uses global table if None)
         """
         self.max_connections_per_host = max_connections_per_host
         self.max_keepalive_connections = max_keepalive_connections
@@ -54,13 +119,25 @@ class A2AConnectionPool:
         self.total_timeout = total_timeout
         self.health_check_interval = health_check_interval
         self.cleanup_interval = cleanup_interval
-        
-        # Port -> Session mapping
-        self._sessions: Dict[int, aiohttp.ClientSession] = {}
-        self._session_created_at: Dict[int, datetime] = {}
-        self._session_last_used: Dict[int, datetime] = {}
-        self._session_request_count: Dict[int, int] = {}
-        
+        self.max_total_connections = max_total_connections or max_connections_per_host * 10
+        self.idle_timeout = idle_timeout or keepalive_timeout * 2
+        self.default_host = default_host
+        self.health_check_timeout = health_check_timeout
+        self._health_monitor = AgentHealthMonitor(
+            probe=self._probe_host,
+            table=liveness_table,
+            max_concurrent_probes=max_concurrent_health_checks,
+            probe_timeout=health_check_timeout
+        )
+
+        # Event loop -> shared connector/session
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopConnections] = {}
+
+        # Base URL -> usage tracking
+        self._host_created_at: Dict[str, datetime] = {}
+        self._host_last_used: Dict[str, datetime] = {}
+        self._host_request_count: Dict[str, int] = {}
+
         # Performance metrics
         self._metrics = {
             "connections_created": 0,
@@ -68,28 +145,29 @@ class A2AConnectionPool:
             "connections_closed": 0,
             "health_checks_performed": 0,
             "total_requests": 0,
-            "connection_errors": 0
+            "connection_errors": 0,
+            "hosts_evicted": 0
         }
-        
+
         # Background tasks
         self._health_check_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
         self._running = False
-        
+
     async def start(self):
         """Start background tasks for health monitoring and cleanup."""
         if self._running:
             return
-            
+
         self._running = True
         self._health_check_task = asyncio.create_task(self._health_check_loop())
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
         logger.info("A2A connection pool started")
-        
+
     async def stop(self):
         """Stop background tasks and close all connections."""
         self._running = False
-        
+
         # Cancel background tasks
         if self._health_check_task:
             self._health_check_task.cancel()
@@ -97,74 +175,84 @@ class A2AConnectionPool:
                 await self._health_check_task
             except asyncio.CancelledError:
                 pass
-                
+
         if self._cleanup_task:
             self._cleanup_task.cancel()
             try:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
-        
+
         # Close all sessions
         await self.close_all()
         logger.info("A2A connection pool stopped")
-        
+
+    def base_url(self, target: AgentTarget) -> str:
+        """Resolve a port or URL target to the pool's base URL key."""
+        return normalize_base_url(target, default_host=self.default_host)
+
     @asynccontextmanager
-    async def get_session(self, port: int) -> aiohttp.ClientSession:
+    async def get_session(self, target: AgentTarget) -> aiohttp.ClientSession:
         """
-        Get or create a session for the specified port.
-        
+        Get the shared session for the current event loop.
+
         Args:
-            port: Target agent port
-            
+            target: Target agent port or base URL
+
         Yields:
-            aiohttp.ClientSession configured for the port
-            
+            aiohttp.ClientSession backed by the loop's shared connector
+
         Note:
-            Sessions are automatically reused when possible
+            All hosts share one connector, so keep-alive sockets and the DNS
+            cache are pooled across agents
         """
-        session = await self._get_or_create_session(port)
-        
+        base_url = self.base_url(target)
+        session = await self._get_or_create_session()
+
         try:
             # Update usage tracking
-            self._session_last_used[port] = datetime.now()
-            self._session_request_count[port] = self._session_request_count.get(port, 0) + 1
+            now = datetime.now()
+            if base_url not in self._host_created_at:
+                self._host_created_at[base_url] = now
+            self._host_last_used[base_url] = now
+            self._host_request_count[base_url] = self._host_request_count.get(base_url, 0) + 1
             self._metrics["total_requests"] += 1
-            
+
             yield session
-            
+
         except Exception as e:
-            # Track connection errors
+            # Track connection errors; the shared session stays open because
+            # aiohttp already discards broken sockets and other hosts use it
             self._metrics["connection_errors"] += 1
-            logger.error(f"Connection error for port {port}: {e}")
-            
-            # Consider closing problematic session
-            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
-                await self._close_session(port)
-                
+            logger.error(f"Connection error for {base_url}: {e}")
             raise
-            
-    async def _get_or_create_session(self, port: int) -> aiohttp.ClientSession:
-        """Get existing session or create new one."""
-        if port in self._sessions and not self._sessions[port].closed:
+
+    async def _get_or_create_session(self, track_reuse: bool = True) -> aiohttp.ClientSession:
+        """Get the current loop's shared session or create a new one."""
+        loop = asyncio.get_running_loop()
+        self._prune_closed_loops()
+
+        state = self._loops.get(loop)
+        if state and not state.session.closed:
             # Reuse existing session
-            self._metrics["connections_reused"] += 1
-            logger.debug(f"Reusing connection for port {port}")
-            return self._sessions[port]
-            
-        # Create new session
-        logger.debug(f"Creating new connection for port {port}")
-        
+            if track_reuse:
+                state.last_used = datetime.now()
+                self._metrics["connections_reused"] += 1
+            return state.session
+
+        # Create new shared connector and session
+        logger.debug("Creating shared A2A connector for event loop")
+
         # Configure connector with pooling settings
         connector = aiohttp.TCPConnector(
             limit_per_host=self.max_connections_per_host,
-            limit=self.max_connections_per_host * 10,  # Total limit
+            limit=self.max_total_connections,
             ttl_dns_cache=300,  # DNS cache for 5 minutes
             enable_cleanup_closed=True,
             force_close=False,
             keepalive_timeout=self.keepalive_timeout
         )
-        
+
         # Configure timeouts
         timeout = aiohttp.ClientTimeout(
             total=self.total_timeout,
@@ -172,7 +260,7 @@ class A2AConnectionPool:
             sock_connect=self.connection_timeout,
             sock_read=30
         )
-        
+
         # Create session
         session = aiohttp.ClientSession(
             connector=connector,
@@ -182,41 +270,56 @@ class A2AConnectionPool:
                 "Connection": "keep-alive"
             }
         )
-        
-        # Track session
-        self._sessions[port] = session
-        self._session_created_at[port] = datetime.now()
-        self._session_last_used[port] = datetime.now()
-        self._session_request_count[port] = 0
+
+        self._loops[loop] = _LoopConnections(connector=connector, session=session)
         self._metrics["connections_created"] += 1
-        
+
         return session
-        
-    async def _close_session(self, port: int):
-        """Close and remove a session."""
-        if port in self._sessions:
-            session = self._sessions[port]
-            if not session.closed:
-                await session.close()
-                self._metrics["connections_closed"] += 1
-                
-            # Clean up tracking
-            del self._sessions[port]
-            if port in self._session_created_at:
-                del self._session_created_at[port]
-            if port in self._session_last_used:
-                del self._session_last_used[port]
-            if port in self._session_request_count:
-                del self._session_request_count[port]
-                
-            logger.debug(f"Closed connection for port {port}")
-            
+
+    def _prune_closed_loops(self):
+        """Drop state belonging to event loops that have been closed."""
+        for loop in [loop for loop in self._loops if loop.is_closed()]:
+            del self._loops[loop]
+            self._metrics["connections_closed"] += 1
+
+    async def _close_loop_connections(self, loop: asyncio.AbstractEventLoop):
+        """Close and remove the shared session of an event loop."""
+        state = self._loops.pop(loop, None)
+        if state is None:
+            return
+
+        if not state.session.closed:
+            await state.session.close()
+        self._metrics["connections_closed"] += 1
+        logger.debug("Closed shared A2A connector for event loop")
+
+    def _forget_host(self, base_url: str):
+        """Remove usage tracking for a host."""
+        self._host_created_at.pop(base_url, None)
+        self._host_last_used.pop(base_url, None)
+        self._host_request_count.pop(base_url, None)
+
     async def close_all(self):
         """Close all sessions in the pool."""
-        ports = list(self._sessions.keys())
-        for port in ports:
-            await self._close_session(port)
-            
+        self._prune_closed_loops()
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for loop in list(self._loops.keys()):
+            if loop is current_loop:
+                await self._close_loop_connections(loop)
+            else:
+                # Sessions can only be closed from their own loop
+                state = self._loops.pop(loop)
+                if not state.session.closed and loop.is_running():
+                    asyncio.run_coroutine_threadsafe(state.session.close(), loop)
+                self._metrics["connections_closed"] += 1
+
+        for base_url in list(self._host_last_used.keys()):
+            self._forget_host(base_url)
+
     async def _health_check_loop(self):
         """Background task to check connection health."""
         while self._running:
@@ -227,7 +330,7 @@ class A2AConnectionPool:
                 break
             except Exception as e:
                 logger.error(f"Health check error: {e}")
-                
+
     async def _cleanup_loop(self):
         """Background task to clean up idle connections."""
         while self._running:
@@ -238,82 +341,91 @@ class A2AConnectionPool:
                 break
             except Exception as e:
                 logger.error(f"Cleanup error: {e}")
-                
+
     async def _perform_health_checks(self):
-        """Check health of all active connections."""
-        current_time = datetime.now()
-        ports_to_check = list(self._sessions.keys())
-        
-        for port in ports_to_check:
-            try:
-                session = self._sessions.get(port)
-                if not session or session.closed:
-                    await self._close_session(port)
-                    continue
-                    
-                # Simple health check - OPTIONS request
-                url = f"http://localhost:{port}"
-                async with session.options(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status >= 500:
-                        logger.warning(f"Unhealthy connection to port {port}, closing")
-                        await self._close_session(port)
-                        
-                self._metrics["health_checks_performed"] += 1
-                
-            except Exception as e:
-                logger.debug(f"Health check failed for port {port}: {e}")
-                await self._close_session(port)
-                
+        """Probe all tracked hosts concurrently and evict unhealthy ones."""
+        hosts_to_check = list(self._host_last_used.keys())
+        if not hosts_to_check:
+            return
+
+        results = await self._health_monitor.probe_many(hosts_to_check)
+        self._metrics["health_checks_performed"] += len(results)
+
+        for base_url, record in results.items():
+            if not record.healthy:
+                logger.warning(f"Unhealthy host {base_url}, evicting: {record.error}")
+                self._forget_host(base_url)
+
+    async def _probe_host(self, base_url: str) -> Dict[str, Any]:
+        """Simple health probe - OPTIONS request against the host."""
+        session = await self._get_or_create_session(track_reuse=False)
+        async with session.options(base_url, timeout=aiohttp.ClientTimeout(total=self.health_check_timeout)) as response:
+            if response.status >= 500:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+            return {"status_code": response.status}
+
+    def get_liveness(self, target: AgentTarget) -> Optional[LivenessRecord]:
+        """Read the cached liveness of a target without probing it."""
+        return self._health_monitor.table.get(self.base_url(target))
+
     async def _cleanup_idle_connections(self):
-        """Clean up connections that have been idle too long."""
+        """Evict hosts and connectors that have been idle too long."""
         current_time = datetime.now()
-        idle_threshold = timedelta(seconds=self.keepalive_timeout * 2)
-        
-        ports_to_check = list(self._sessions.keys())
-        
-        for port in ports_to_check:
-            last_used = self._session_last_used.get(port)
-            if last_used and (current_time - last_used) > idle_threshold:
-                logger.debug(f"Closing idle connection for port {port}")
-                await self._close_session(port)
-                
+        idle_threshold = timedelta(seconds=self.idle_timeout)
+
+        for base_url, last_used in list(self._host_last_used.items()):
+            if (current_time - last_used) > idle_threshold:
+                logger.debug(f"Evicting idle host {base_url}")
+                self._forget_host(base_url)
+                self._metrics["hosts_evicted"] += 1
+
+        self._prune_closed_loops()
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state and (current_time - state.last_used) > idle_threshold:
+            logger.debug("Closing idle shared A2A connector")
+            await self._close_loop_connections(loop)
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get connection pool performance metrics."""
-        active_connections = len([s for s in self._sessions.values() if not s.closed])
-        
+        active_connections = len([s for s in self._loops.values() if not s.session.closed])
+
         reuse_rate = 0
         if self._metrics["total_requests"] > 0:
-            reuse_rate = (self._metrics["connections_reused"] / 
+            reuse_rate = (self._metrics["connections_reused"] /
                          self._metrics["total_requests"]) * 100
-                         
+
         return {
             **self._metrics,
             "active_connections": active_connections,
+            "tracked_hosts": len(self._host_last_used),
+            "max_total_connections": self.max_total_connections,
+            "max_connections_per_host": self.max_connections_per_host,
             "connection_reuse_rate": round(reuse_rate, 2),
             "average_requests_per_connection": (
                 self._metrics["total_requests"] / max(1, self._metrics["connections_created"])
             )
         }
-        
-    def get_connection_stats(self) -> Dict[int, Dict[str, Any]]:
-        """Get detailed stats for each connection."""
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get detailed stats for each tracked host, keyed by base URL."""
         stats = {}
         current_time = datetime.now()
-        
-        for port, session in self._sessions.items():
-            if session and not session.closed:
-                created_at = self._session_created_at.get(port)
-                last_used = self._session_last_used.get(port)
-                
-                stats[port] = {
-                    "status": "active",
-                    "created_at": created_at.isoformat() if created_at else None,
-                    "last_used": last_used.isoformat() if last_used else None,
-                    "age_seconds": (current_time - created_at).total_seconds() if created_at else 0,
-                    "idle_seconds": (current_time - last_used).total_seconds() if last_used else 0,
-                    "request_count": self._session_request_count.get(port, 0)
-                }
-                
+
+        for base_url, last_used in self._host_last_used.items():
+            created_at = self._host_created_at.get(base_url)
+
+            stats[base_url] = {
+                "status": "active",
+                "created_at": created_at.isoformat() if created_at else None,
+                "last_used": last_used.isoformat() if last_used else None,
+                "age_seconds": (current_time - created_at).total_seconds() if created_at else 0,
+                "idle_seconds": (current_time - last_used).total_seconds() if last_used else 0,
+                "request_count": self._host_request_count.get(base_url, 0)
+            }
+
         return stats
 
 
@@ -342,4 +454,4 @@ async def shutdown_global_pool():
     global _global_pool
     if _global_pool:
         await _global_pool.stop()
-        _global_pool = None
\ No newline at end of file
+        _global_pool = None
@@ -0,0 +1,250 @@
+# ABOUTME: Concurrent agent health probing with a TTL'd liveness table
+# ABOUTME: Lets routing read cached agent status instead of probing on the request path
+
+import asyncio
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LivenessRecord:
+    """Result of the most recent health probe of an endpoint."""
+    endpoint: str
+    healthy: bool
+    checked_at: float = field(default_factory=time.monotonic)
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    details: Any = None
+
+    def age(self) -> float:
+        """Seconds since the probe finished."""
+        return time.monotonic() - self.checked_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "status": "healthy" if self.healthy else "unhealthy",
+            "response_time_ms": self.latency_ms,
+            "age_seconds": round(self.age(), 3),
+            "error": self.error,
+            "details": self.details
+        }
+
+
+class LivenessTable:
+    """Endpoint base URL to latest liveness record, expiring after a TTL."""
+
+    def __init__(self, ttl: float = 30.0):
+        """
+        Initialize liveness table.
+
+        Args:
+            ttl: Seconds a probe result stays valid
+        """
+        self.ttl = ttl
+        self._records: Dict[str, LivenessRecord] = {}
+        self._lock = threading.Lock()
+
+    def update(self, record: LivenessRecord):
+        """Store a probe result."""
+        with self._lock:
+            self._records[record.endpoint] = record
+
+    def get(self, endpoint: str, max_age: Optional[float] = None) -> Optional[LivenessRecord]:
+        """
+        Get a fresh record for an endpoint.
+
+        Args:
+            endpoint: Endpoint base URL
+            max_age: Override for the table TTL
+
+        Returns:
+            The record, or None if unknown or expired
+        """
+        record = self._records.get(endpoint)
+        if record is None:
+            return None
+        if record.age() > (self.ttl if max_age is None else max_age):
+            return None
+        return record
+
+    def is_alive(self, endpoint: str, default: bool = True) -> bool:
+        """Cached liveness of an endpoint; ``default`` when there is no fresh record."""
+        record = self.get(endpoint)
+        return default if record is None else record.healthy
+
+    def remove(self, endpoint: str):
+        """Forget an endpoint."""
+        with self._lock:
+            self._records.pop(endpoint, None)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get all records, including expired ones, as dicts."""
+        return {endpoint: record.to_dict() for endpoint, record in list(self._records.items())}
+
+
+ProbeFunction = Callable[[str], Awaitable[Any]]
+
+
+class AgentHealthMonitor:
+    """
+    Concurrent health prober backed by a liveness table.
+
+    Every endpoint in a sweep is probed at the same time, bounded by a
+    semaphore, so sweep time follows the slowest agent rather than the
+    number of agents. The probe callable receives an endpoint base URL
+    and raises (or returns an object with ``healthy=False``) on failure.
+    """
+
+    def __init__(
+        self,
+        probe: ProbeFunction,
+        table: Optional[LivenessTable] = None,
+        max_concurrent_probes: int = 16,
+        probe_timeout: float = 5.0
+    ):
+        """
+        Initialize health monitor.
+
+        Args:
+            probe: Async callable probing one endpoint base URL
+            table: Liveness table to write to (uses global table if None)
+            max_concurrent_probes: Upper bound on simultaneous probes
+            probe_timeout: Seconds before a probe counts as failed
+        """
+        self.probe = probe
+        self.table = table or get_global_liveness_table()
+        self.max_concurrent_probes = max_concurrent_probes
+        self.probe_timeout = probe_timeout
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._running = False
+        self._metrics = {
+            "probes_performed": 0,
+            "probes_failed": 0,
+            "sweeps_performed": 0,
+            "last_sweep_seconds": 0.0
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_probes)
+        return self._semaphore
+
+    async def probe_endpoint(self, endpoint: str) -> LivenessRecord:
+        """Probe one endpoint and store the result."""
+        async with self._get_semaphore():
+            started = time.monotonic()
+            try:
+                details = await asyncio.wait_for(self.probe(endpoint), timeout=self.probe_timeout)
+                healthy = not (isinstance(details, dict) and details.get("healthy") is False)
+                record = LivenessRecord(
+                    endpoint=endpoint,
+                    healthy=healthy,
+                    latency_ms=round((time.monotonic() - started) * 1000, 2),
+                    details=details
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                record = LivenessRecord(
+                    endpoint=endpoint,
+                    healthy=False,
+                    latency_ms=round((time.monotonic() - started) * 1000, 2),
+                    error=str(e) or type(e).__name__
+                )
+
+        self._metrics["probes_performed"] += 1
+        if not record.healthy:
+            self._metrics["probes_failed"] += 1
+            logger.debug(f"Health probe failed for {endpoint}: {record.error}")
+        self.table.update(record)
+        return record
+
+    async def probe_many(self, endpoints: Iterable[str]) -> Dict[str, LivenessRecord]:
+        """Probe several endpoints concurrently."""
+        unique = list(dict.fromkeys(endpoints))
+        started = time.monotonic()
+        records = await asyncio.gather(*(self.probe_endpoint(endpoint) for endpoint in unique))
+        self._metrics["sweeps_performed"] += 1
+        self._metrics["last_sweep_seconds"] = round(time.monotonic() - started, 3)
+        return dict(zip(unique, records))
+
+    async def get_status(
+        self,
+        endpoint: str,
+        max_age: Optional[float] = None,
+        probe_if_stale: bool = False
+    ) -> Optional[LivenessRecord]:
+        """
+        Read cached status, optionally probing when there is no fresh record.
+
+        Args:
+            endpoint: Endpoint base URL
+            max_age: Override for the table TTL
+            probe_if_stale: Probe now if the cached record is missing or expired
+
+        Returns:
+            Liveness record, or None if unknown and no probe was made
+        """
+        record = self.table.get(endpoint, max_age=max_age)
+        if record is None and probe_if_stale:
+            record = await self.probe_endpoint(endpoint)
+        return record
+
+    async def start(self, endpoints: Callable[[], Iterable[str]], interval: float = 30.0):
+        """
+        Start a background sweep loop.
+
+        Args:
+            endpoints: Callable returning the endpoints to probe on each sweep
+            interval: Seconds between sweeps
+        """
+        if self._running:
+            return
+        self._running = True
+        self._sweep_task = asyncio.create_task(self._sweep_loop(endpoints, interval))
+
+    async def stop(self):
+        """Stop the background sweep loop."""
+        self._running = False
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+    async def _sweep_loop(self, endpoints: Callable[[], Iterable[str]], interval: float):
+        while self._running:
+            try:
+                await self.probe_many(endpoints())
+                await asyncio.sleep(interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Health sweep error: {e}")
+                await asyncio.sleep(interval)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get probe metrics."""
+        return dict(self._metrics)
+
+
+# Global liveness table shared by the connection pool and protocol clients
+_global_liveness_table: Optional[LivenessTable] = None
+
+
+def get_global_liveness_table() -> LivenessTable:
+    """Get or create the global liveness table."""
+    global _global_liveness_table
+    if _global_liveness_table is None:
+        _global_liveness_table = LivenessTable()
+    return _global_liveness_table
@@ -4,10 +4,19 @@
 import logging
 import json
 import asyncio
+import time
+import uuid
 import aiohttp
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime
-from .a2a_connection_pool import get_global_connection_pool, A2AConnectionPool
+from .a2a_connection_pool import (
+    get_global_connection_pool, A2AConnectionPool, AgentTarget, normalize_base_url
+)
+from .a2a_health import AgentHealthMonitor, LivenessRecord, LivenessTable
+from .a2a_resilience import (
+    CircuitBreaker, CircuitBreakerRegistry, CircuitState, LatencyTracker, RetryBudget,
+    get_global_circuit_breakers, get_global_retry_budget
+)
 from .metrics_collector import record_a2a_message
 
 logger = logging.getLogger(__name__)
@@ -32,7 +41,7 @@ def create_a2a_request(
         Formatted A2A request payload
     """
     if not request_id:
-        request_id = f"a2a_{int(datetime.now().timestamp() * 1000)}"
+        request_id = f"a2a_{uuid.uuid4().hex}"
     
     return {
         "jsonrpc": "2.0",
@@ -93,7 +102,21 @@ class A2AProtocolClient:
         response_processor: Optional[Callable] = None,
         use_connection_pool: bool = True,
         connection_pool: Optional[A2AConnectionPool] = None,
-        source_agent_name: Optional[str] = None
+        source_agent_name: Optional[str] = None,
+        enable_circuit_breaker: bool = True,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        enable_retry_budget: bool = True,
+        enable_hedging: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_endpoints: Optional[Dict[AgentTarget, List[AgentTarget]]] = None,
+        max_hedge_ratio: float = 0.1,
+        latency_tracker: Optional[LatencyTracker] = None,
+        liveness_table: Optional[LivenessTable] = None,
+        max_concurrent_health_checks: int = 16,
+        health_check_timeout: float = 10.0,
+        batch_window: float = 0.005,
+        max_batch_size: int = 20
     ):
         """
         Initialize A2A protocol client.
@@ -107,6 +130,21 @@ class A2AProtocolClient:
             use_connection_pool: Whether to use connection pooling (60% performance improvement)
             connection_pool: Custom connection pool instance (uses global pool if None)
             source_agent_name: Name of the source agent for metrics tracking
+            enable_circuit_breaker: Whether to fail fast on agents with an open circuit
+            circuit_breakers: Custom breaker registry (uses global registry if None)
+            retry_budget: Custom retry budget (uses global budget if None)
+            enable_retry_budget: Whether retries must be paid from the retry budget
+            enable_hedging: Send a duplicate request to an alternate endpoint when
+                the first one is slower than the agent's usual latency
+            hedge_percentile: Observed latency percentile that triggers a hedge
+            hedge_endpoints: Primary target to alternate targets for hedging
+            max_hedge_ratio: Largest fraction of hedgeable requests that may be hedged
+            latency_tracker: Custom per-agent latency statistics store
+            liveness_table: Table for cached health results (uses global table if None)
+            max_concurrent_health_checks: Upper bound on simultaneous health probes
+            health_check_timeout: Seconds before a health probe counts as failed
+            batch_window: Seconds send_message_batched waits to coalesce requests
+            max_batch_size: Largest JSON-RPC batch sent by send_message_batched
         """
         self.default_timeout = default_timeout
         self.max_retries = max_retries
@@ -116,40 +154,80 @@ class A2AProtocolClient:
         self.use_connection_pool = use_connection_pool
         self._connection_pool = connection_pool
         self.source_agent_name = source_agent_name or "unknown"
+        self._circuit_breakers = (
+            (circuit_breakers or get_global_circuit_breakers()) if enable_circuit_breaker else None
+        )
+        self._retry_budget = (
+            (retry_budget or get_global_retry_budget()) if enable_retry_budget else None
+        )
+        self.enable_hedging = enable_hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_endpoints = {
+            self._resolve_url(primary): list(alternates)
+            for primary, alternates in (hedge_endpoints or {}).items()
+        }
+        self._latency_tracker = latency_tracker or LatencyTracker()
+        # Hedges earn tokens like retries, capping the extra load hedging adds
+        self._hedge_budget = RetryBudget(
+            retry_ratio=max_hedge_ratio, min_retries_per_second=0.0, max_tokens=10.0
+        )
+        self._health_monitor = AgentHealthMonitor(
+            probe=self._probe_agent,
+            table=liveness_table,
+            max_concurrent_probes=max_concurrent_health_checks,
+            probe_timeout=health_check_timeout
+        )
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._batcher: Optional[A2ARequestBatcher] = None
         self.session_stats = {
             "requests_sent": 0,
             "requests_successful": 0,
             "requests_failed": 0,
-            "retries_performed": 0
+            "retries_performed": 0,
+            "retries_denied": 0,
+            "circuit_rejections": 0,
+            "hedges_sent": 0,
+            "hedges_won": 0,
+            "hedges_denied": 0
         }
 
     async def send_message(
         self,
-        target_port: int,
+        target_port: AgentTarget,
         message: str,
         metadata: Optional[Dict[str, Any]] = None,
         method: str = "message/send",
         timeout: Optional[int] = None,
-        custom_headers: Optional[Dict[str, str]] = None
+        custom_headers: Optional[Dict[str, str]] = None,
+        hedge_targets: Optional[List[AgentTarget]] = None
     ) -> Dict[str, Any]:
         """
         Send message to target agent using A2A protocol.
         
+        Requests to an agent whose circuit is open fail fast, and retries
+        are only attempted while the shared retry budget has tokens. With
+        hedging enabled, an attempt that outlasts the agent's configured
+        latency percentile is duplicated to an alternate endpoint and the
+        first response wins.
+        
         Args:
-            target_port: Port number of target agent
+            target_port: Port number or base URL of target agent
             message: Message to send
             metadata: Optional metadata
             method: A2A method name
             timeout: Request timeout (uses default if None)
             custom_headers: Additional HTTP headers to include
+            hedge_targets: Alternate endpoints for hedging (overrides hedge_endpoints)
             
         Returns:
             Response from target agent
             
         Raises:
+            CircuitOpenError: If the target agent's circuit is open
             A2ACommunicationError: If communication fails after all retries
         """
-        url = f"http://localhost:{target_port}"
+        url = self._resolve_url(target_port)
         payload = create_a2a_request(method, message, metadata)
         timeout_setting = timeout or self.default_timeout
         
@@ -162,115 +240,289 @@ class A2AProtocolClient:
             headers.update(custom_headers)
         
         self.session_stats["requests_sent"] += 1
+        if self._retry_budget:
+            self._retry_budget.record_request()
         
         # Track start time for latency metrics
         start_time = datetime.now()
         target_agent_name = f"port_{target_port}"  # Default name
+        breaker = self._circuit_breakers.get(url) if self._circuit_breakers else None
+        if hedge_targets is None and self.enable_hedging:
+            hedge_targets = self.hedge_endpoints.get(url)
+        error_message = f"Failed to communicate with port {target_port} after {self.max_retries} attempts"
+        
+        # Hedged sends record breaker outcomes per request inside _post_hedged
+        outcome_breaker = None if hedge_targets else breaker
         
         for attempt in range(self.max_retries):
+            if breaker and not breaker.allow_request():
+                self.session_stats["requests_failed"] += 1
+                self.session_stats["circuit_rejections"] += 1
+                self._record_failure_metric(target_agent_name, start_time)
+                raise CircuitOpenError(f"Circuit open for agent on port {target_port}, failing fast")
+            
+            logger.debug(f"A2A request to port {target_port}, attempt {attempt + 1}/{self.max_retries}")
+            attempt_start = time.monotonic()
+            
             try:
-                logger.debug(f"A2A request to port {target_port}, attempt {attempt + 1}/{self.max_retries}")
-                
-                if self.use_connection_pool:
-                    # Use connection pool for better performance
-                    pool = self._get_connection_pool()
-                    async with pool.get_session(target_port) as session:
-                        async with session.post(url, json=payload, headers=headers) as response:
-                            if response.status == 200:
-                                result = await response.json()
-                                self.session_stats["requests_successful"] += 1
-                                logger.debug(f"A2A communication successful with port {target_port}")
-                                
-                                # Record success metrics
-                                latency = (datetime.now() - start_time).total_seconds()
-                                record_a2a_message(
-                                    source_agent=self.source_agent_name,
-                                    target_agent=target_agent_name,
-                                    status="success",
-                                    latency=latency
-                                )
-                                
-                                return await self._process_a2a_response(result)
-                            else:
-                                error_text = await response.text()
-                                logger.warning(f"A2A HTTP {response.status} from port {target_port}: {error_text}")
-                                
-                                if attempt < self.max_retries - 1:
-                                    await self._wait_for_retry(attempt)
-                                    continue
-                                else:
-                                    raise A2ACommunicationError(
-                                        f"HTTP {response.status} from port {target_port}: {error_text}"
-                                    )
-                else:
-                    # Legacy mode without connection pooling
-                    # Configure timeout
-                    timeout_config = aiohttp.ClientTimeout(
-                        total=timeout_setting,
-                        connect=10,
-                        sock_read=30
+                if hedge_targets:
+                    result = await self._post_hedged(
+                        url, target_port, hedge_targets, payload, headers, timeout_setting, breaker
                     )
+                else:
+                    result = await self._post_timed(url, target_port, payload, headers, timeout_setting)
+                
+            except _A2AHTTPStatusError as e:
+                logger.warning(f"A2A HTTP {e.status} from port {target_port}: {e.body}")
+                error_message = f"HTTP {e.status} from port {target_port}: {e.body}"
+                if outcome_breaker:
+                    if e.status >= 500 or e.status == 429:
+                        outcome_breaker.record_failure(time.monotonic() - attempt_start)
+                    else:
+                        outcome_breaker.record_success(time.monotonic() - attempt_start)
                     
-                    async with aiohttp.ClientSession(timeout=timeout_config) as session:
-                        async with session.post(url, json=payload, headers=headers) as response:
-                            if response.status == 200:
-                                result = await response.json()
-                                self.session_stats["requests_successful"] += 1
-                                logger.debug(f"A2A communication successful with port {target_port}")
-                                
-                                # Record success metrics
-                                latency = (datetime.now() - start_time).total_seconds()
-                                record_a2a_message(
-                                    source_agent=self.source_agent_name,
-                                    target_agent=target_agent_name,
-                                    status="success",
-                                    latency=latency
-                                )
-                                
-                                return await self._process_a2a_response(result)
-                            else:
-                                error_text = await response.text()
-                                logger.warning(f"A2A HTTP {response.status} from port {target_port}: {error_text}")
-                                
-                                if attempt < self.max_retries - 1:
-                                    await self._wait_for_retry(attempt)
-                                    continue
-                                else:
-                                    raise A2ACommunicationError(
-                                        f"HTTP {response.status} from port {target_port}: {error_text}"
-                                    )
-                                
             except asyncio.TimeoutError:
                 logger.warning(f"A2A timeout for port {target_port} (attempt {attempt + 1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    await self._wait_for_retry(attempt)
-                    continue
-                else:
-                    self.session_stats["requests_failed"] += 1
-                    raise A2ACommunicationError(f"Timeout communicating with agent on port {target_port}")
+                error_message = f"Timeout communicating with agent on port {target_port}"
+                if outcome_breaker:
+                    outcome_breaker.record_failure(time.monotonic() - attempt_start)
                     
             except aiohttp.ClientError as e:
                 logger.warning(f"A2A network error for port {target_port}: {e} (attempt {attempt + 1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    await self._wait_for_retry(attempt)
-                    continue
-                else:
-                    self.session_stats["requests_failed"] += 1
-                    raise A2ACommunicationError(f"Network error communicating with port {target_port}: {e}")
+                error_message = f"Network error communicating with port {target_port}: {e}"
+                if outcome_breaker:
+                    outcome_breaker.record_failure(time.monotonic() - attempt_start)
                     
             except Exception as e:
                 logger.error(f"A2A unexpected error for port {target_port}: {e}")
-                if attempt < self.max_retries - 1:
-                    await self._wait_for_retry(attempt)
-                    continue
-                else:
-                    self.session_stats["requests_failed"] += 1
-                    raise A2ACommunicationError(f"Unexpected error communicating with port {target_port}: {e}")
+                error_message = f"Unexpected error communicating with port {target_port}: {e}"
+                if outcome_breaker:
+                    outcome_breaker.record_failure(time.monotonic() - attempt_start)
+                    
+            except BaseException:
+                # Cancelled mid-call: no outcome to record, but a half-open probe slot must be freed
+                if outcome_breaker:
+                    outcome_breaker.release_probe()
+                raise
+                    
+            else:
+                if outcome_breaker:
+                    outcome_breaker.record_success(time.monotonic() - attempt_start)
+                self.session_stats["requests_successful"] += 1
+                logger.debug(f"A2A communication successful with port {target_port}")
+                
+                # Record success metrics
+                latency = (datetime.now() - start_time).total_seconds()
+                record_a2a_message(
+                    source_agent=self.source_agent_name,
+                    target_agent=target_agent_name,
+                    status="success",
+                    latency=latency
+                )
+                
+                return await self._process_a2a_response(result)
+            
+            if attempt < self.max_retries - 1 and self._acquire_retry():
+                await self._wait_for_retry(attempt)
+                continue
+            break
         
-        # Should not reach here due to explicit handling above
         self.session_stats["requests_failed"] += 1
+        self._record_failure_metric(target_agent_name, start_time)
+        raise A2ACommunicationError(error_message)
+
+    async def _post_request(
+        self,
+        url: str,
+        target: AgentTarget,
+        payload: Any,
+        headers: Dict[str, str],
+        timeout_setting: int
+    ) -> Any:
+        """
+        Send a single A2A POST and return the decoded JSON body.
+        
+        Raises:
+            _A2AHTTPStatusError: If the agent answers with a non-200 status
+        """
+        if self.use_connection_pool:
+            # Use connection pool for better performance
+            pool = self._get_connection_pool()
+            async with pool.get_session(target) as session:
+                async with session.post(url, json=payload, headers=headers) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    raise _A2AHTTPStatusError(response.status, await response.text())
+        
+        # Legacy mode without connection pooling
+        # Configure timeout
+        timeout_config = aiohttp.ClientTimeout(
+            total=timeout_setting,
+            connect=10,
+            sock_read=30
+        )
+        
+        async with aiohttp.ClientSession(timeout=timeout_config) as session:
+            async with session.post(url, json=payload, headers=headers) as response:
+                if response.status == 200:
+                    return await response.json()
+                raise _A2AHTTPStatusError(response.status, await response.text())
+
+    async def _post_timed(
+        self,
+        url: str,
+        target: AgentTarget,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout_setting: int
+    ) -> Dict[str, Any]:
+        """Send a single A2A POST and record its latency for the endpoint."""
+        started = time.monotonic()
+        result = await self._post_request(url, target, payload, headers, timeout_setting)
+        self._latency_tracker.record(url, time.monotonic() - started)
+        return result
+
+    async def _post_hedged(
+        self,
+        url: str,
+        target: AgentTarget,
+        hedge_targets: List[AgentTarget],
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout_setting: int,
+        breaker: Optional[CircuitBreaker] = None
+    ) -> Dict[str, Any]:
+        """
+        Send an A2A POST, hedging to an alternate endpoint if it is slow.
         
-        # Record failure metrics
+        The hedge fires once the primary has been in flight longer than the
+        configured latency percentile for that endpoint, if the hedge budget
+        (``max_hedge_ratio`` of hedgeable requests) allows it. Whichever
+        request answers successfully first wins and the other one is
+        cancelled.
+        
+        Only the primary endpoint's latency feeds the percentile: the
+        hedge's own latency is never recorded, and when the hedge wins the
+        primary is recorded with the time it had been in flight, a lower
+        bound that keeps slow requests in the distribution instead of
+        biasing the hedge delay downward.
+        
+        Each request's outcome goes to its own endpoint's circuit breaker,
+        and only if that request completed: a primary cancelled because the
+        hedge won records nothing and just frees its half-open probe slot.
+        The caller has already been admitted by ``breaker``; the hedge must
+        be admitted by the alternate's breaker.
+        """
+        self._hedge_budget.record_request()
+        started = time.monotonic()
+        primary = asyncio.create_task(
+            self._post_request(url, target, payload, headers, timeout_setting)
+        )
+        primary.add_done_callback(
+            lambda task: self._record_hedged_outcome(url, breaker, task, started, track_latency=True)
+        )
+        hedge_delay = self._latency_tracker.percentile(url, self.hedge_percentile)
+        alternate = self._pick_hedge_target(url, hedge_targets)
+        if hedge_delay is None or alternate is None:
+            return await primary
+        
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+        if not self._hedge_budget.try_acquire():
+            self.session_stats["hedges_denied"] += 1
+            return await primary
+        
+        alternate_url = self._resolve_url(alternate)
+        alternate_breaker = self._circuit_breakers.get(alternate_url) if self._circuit_breakers else None
+        if alternate_breaker and not alternate_breaker.allow_request():
+            return await primary
+        logger.debug(f"Hedging A2A request for {url} to {alternate_url} after {hedge_delay:.3f}s")
+        self.session_stats["hedges_sent"] += 1
+        hedge_started = time.monotonic()
+        hedge = asyncio.create_task(
+            self._post_request(alternate_url, alternate, payload, headers, timeout_setting)
+        )
+        hedge.add_done_callback(
+            lambda task: self._record_hedged_outcome(alternate_url, alternate_breaker, task, hedge_started)
+        )
+        
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            self.session_stats["hedges_won"] += 1
+                            if primary in pending:
+                                self._latency_tracker.record(url, time.monotonic() - started)
+                        return task.result()
+                    if first_error is None or task is primary:
+                        first_error = error
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise first_error
+
+    def _record_hedged_outcome(
+        self,
+        url: str,
+        breaker: Optional[CircuitBreaker],
+        task: asyncio.Task,
+        started: float,
+        track_latency: bool = False
+    ):
+        """Record the breaker outcome (and optionally latency) of one request of a hedged send."""
+        latency = time.monotonic() - started
+        if task.cancelled():
+            if breaker:
+                breaker.release_probe()
+            return
+        error = task.exception()
+        if error is None and track_latency:
+            self._latency_tracker.record(url, latency)
+        if breaker:
+            if error is not None and self._is_breaker_failure(error):
+                breaker.record_failure(latency)
+            else:
+                breaker.record_success(latency)
+
+    @staticmethod
+    def _is_breaker_failure(error: BaseException) -> bool:
+        """Whether an error counts against the endpoint: anything but a non-retryable HTTP status."""
+        if isinstance(error, _A2AHTTPStatusError):
+            return error.status >= 500 or error.status == 429
+        return True
+
+    def _pick_hedge_target(self, url: str, hedge_targets: List[AgentTarget]) -> Optional[AgentTarget]:
+        """Pick the first alternate endpoint whose circuit is not open."""
+        for candidate in hedge_targets:
+            candidate_url = self._resolve_url(candidate)
+            if candidate_url == url:
+                continue
+            if self._circuit_breakers and self._circuit_breakers.get(candidate_url).state == CircuitState.OPEN:
+                continue
+            return candidate
+        return None
+
+    def _acquire_retry(self) -> bool:
+        """Take a token from the retry budget; False means do not retry."""
+        if self._retry_budget is None or self._retry_budget.try_acquire():
+            return True
+        self.session_stats["retries_denied"] += 1
+        logger.debug("A2A retry budget exhausted, not retrying")
+        return False
+
+    def _record_failure_metric(self, target_agent_name: str, start_time: datetime):
+        """Record failure metrics for a request."""
         latency = (datetime.now() - start_time).total_seconds()
         record_a2a_message(
             source_agent=self.source_agent_name,
@@ -278,8 +530,6 @@ class A2AProtocolClient:
             status="error",
             latency=latency
         )
-        
-        raise A2ACommunicationError(f"Failed to communicate with port {target_port} after {self.max_retries} attempts")
 
     def _get_connection_pool(self) -> A2AConnectionPool:
         """Get the connection pool instance."""
@@ -287,6 +537,54 @@ class A2AProtocolClient:
             return self._connection_pool
         return get_global_connection_pool()
 
+    def _resolve_url(self, target: AgentTarget) -> str:
+        """Resolve a port or URL target to the agent's base URL."""
+        if self.use_connection_pool:
+            return self._get_connection_pool().base_url(target)
+        return normalize_base_url(target)
+
+    async def send_message_batched(
+        self,
+        target_port: AgentTarget,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        method: str = "message/send"
+    ) -> Dict[str, Any]:
+        """
+        Send message as part of a JSON-RPC batch to the target agent.
+        
+        Concurrent calls to the same agent within the batch window share
+        one HTTP POST. A batch that fails with a server error, timeout or
+        network error is retried as a whole while the retry budget allows;
+        failures surface as A2ACommunicationError for every request in the
+        failed batch.
+        
+        Args:
+            target_port: Port number or base URL of target agent
+            message: Message to send
+            metadata: Optional metadata
+            method: A2A method name
+            
+        Returns:
+            Response from target agent
+        """
+        if self._batcher is None:
+            self._batcher = A2ARequestBatcher(
+                self, batch_window=self.batch_window, max_batch_size=self.max_batch_size
+            )
+        
+        self.session_stats["requests_sent"] += 1
+        if self._retry_budget:
+            self._retry_budget.record_request()
+        try:
+            reply = await self._batcher.submit(target_port, create_a2a_request(method, message, metadata))
+            result = await self._process_a2a_response(reply)
+        except Exception:
+            self.session_stats["requests_failed"] += 1
+            raise
+        self.session_stats["requests_successful"] += 1
+        return result
+
     async def send_message_by_name(
         self,
         agent_name: str,
@@ -469,47 +767,87 @@ class A2AProtocolClient:
         if self.use_connection_pool:
             pool = self._get_connection_pool()
             stats["pool_metrics"] = pool.get_metrics()
+        
+        if self._circuit_breakers:
+            stats["circuit_breakers"] = self._circuit_breakers.get_stats()
+        if self._retry_budget:
+            stats["retry_budget"] = self._retry_budget.get_stats()
+        if self.enable_hedging:
+            stats["latency"] = self._latency_tracker.get_stats()
+            stats["hedge_budget"] = self._hedge_budget.get_stats()
+        if self._batcher:
+            stats["batching"] = dict(self._batcher.stats)
             
         return stats
 
-    async def health_check(self, target_port: int) -> Dict[str, Any]:
+    async def health_check(self, target_port: AgentTarget) -> Dict[str, Any]:
         """
         Perform health check on target agent.
         
+        Sends a single ``system/health`` probe (no retries) and stores the
+        result in the shared liveness table.
+        
         Args:
-            target_port: Port of target agent
+            target_port: Port or base URL of target agent
             
         Returns:
             Health check result
         """
-        try:
-            response = await self.send_message(
-                target_port,
-                "health_check",
-                {"check_type": "connectivity"},
-                method="system/health",
-                timeout=10
-            )
-            return {
-                "port": target_port,
-                "status": "healthy",
-                "response_time_ms": None,  # Could be measured
-                "details": response
-            }
-        except Exception as e:
-            return {
-                "port": target_port,
-                "status": "unhealthy",
-                "error": str(e),
-                "details": None
-            }
+        record = await self._health_monitor.probe_endpoint(self._resolve_url(target_port))
+        return self._format_health(target_port, record)
+
+    async def _probe_agent(self, url: str) -> Dict[str, Any]:
+        """Health probe used by the health monitor."""
+        payload = create_a2a_request("system/health", "health_check", {"check_type": "connectivity"})
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "A2A-Protocol-Client/1.0"
+        }
+        result = await self._post_request(url, url, payload, headers, self._health_monitor.probe_timeout)
+        return await self._process_a2a_response(result)
+
+    @staticmethod
+    def _format_health(target: AgentTarget, record: LivenessRecord) -> Dict[str, Any]:
+        """Convert a liveness record to the health check result format."""
+        result = {
+            "port": target,
+            "status": "healthy" if record.healthy else "unhealthy",
+            "response_time_ms": record.latency_ms,
+            "checked_seconds_ago": round(record.age(), 3),
+            "details": record.details
+        }
+        if record.error:
+            result["error"] = record.error
+        return result
+
+    def get_cached_health(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an agent's cached health without probing it.
+        
+        Args:
+            agent_name: Name of the agent
+            
+        Returns:
+            Health check result, or None if there is no fresh record
+        """
+        port = self.get_agent_port(agent_name)
+        record = self._health_monitor.table.get(self._resolve_url(port))
+        return self._format_health(port, record) if record else None
 
-    async def batch_health_check(self, agent_names: Optional[list] = None) -> Dict[str, Any]:
+    async def batch_health_check(
+        self,
+        agent_names: Optional[list] = None,
+        use_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Check health of multiple agents concurrently.
         
+        All agents are probed at once under the monitor's concurrency
+        bound, so a sweep takes about as long as the slowest agent.
+        
         Args:
             agent_names: List of agent names to check (None = check all known agents)
+            use_cache: Return fresh cached results and only probe the rest
             
         Returns:
             Health status for all checked agents
@@ -519,27 +857,217 @@ class A2AProtocolClient:
             all_agents = set(A2A_AGENT_PORTS.keys()) | set(self.custom_port_mapping.keys())
             agent_names = list(all_agents)
         
-        health_tasks = []
+        targets = {}
         for agent_name in agent_names:
             try:
-                port = self.get_agent_port(agent_name)
-                health_tasks.append((agent_name, self.health_check(port)))
+                targets[agent_name] = self.get_agent_port(agent_name)
             except ValueError:
                 logger.warning(f"Unknown agent for health check: {agent_name}")
         
         results = {}
-        for agent_name, task in health_tasks:
-            result = await task
-            results[agent_name] = result
+        to_probe = {}
+        for agent_name, port in targets.items():
+            url = self._resolve_url(port)
+            record = self._health_monitor.table.get(url) if use_cache else None
+            if record:
+                results[agent_name] = self._format_health(port, record)
+            else:
+                to_probe[agent_name] = url
+        
+        records = await self._health_monitor.probe_many(to_probe.values())
+        for agent_name, url in to_probe.items():
+            results[agent_name] = self._format_health(targets[agent_name], records[url])
         
         return results
 
 
+class A2ARequestBatcher:
+    """
+    Coalesce A2A requests to the same endpoint into JSON-RPC batches.
+    
+    Requests queued for one endpoint within ``batch_window`` seconds (or
+    until ``max_batch_size`` is reached) go out as a single JSON-RPC 2.0
+    batch array. Replies are matched back to callers by request id.
+    """
+
+    def __init__(
+        self,
+        client: "A2AProtocolClient",
+        batch_window: float = 0.005,
+        max_batch_size: int = 20
+    ):
+        """
+        Initialize request batcher.
+        
+        Args:
+            client: Protocol client used to send batches
+            batch_window: Seconds to wait for more requests before flushing
+            max_batch_size: Flush immediately once this many requests are queued
+        """
+        self.client = client
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, List[tuple]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._flush_tasks: set = set()
+        self.stats = {
+            "requests_batched": 0,
+            "batches_sent": 0
+        }
+
+    async def submit(self, target: AgentTarget, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a JSON-RPC request and wait for its raw reply.
+        
+        Args:
+            target: Port or base URL of the target agent
+            payload: JSON-RPC request with a unique id
+            
+        Returns:
+            Raw JSON-RPC reply for this request
+        """
+        url = self.client._resolve_url(target)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        queue = self._pending.setdefault(url, [])
+        queue.append((payload, future))
+        self.stats["requests_batched"] += 1
+        
+        if len(queue) >= self.max_batch_size:
+            self._schedule_flush(url)
+        elif url not in self._flush_handles:
+            self._flush_handles[url] = loop.call_later(self.batch_window, self._schedule_flush, url)
+        
+        return await future
+
+    def _schedule_flush(self, url: str):
+        handle = self._flush_handles.pop(url, None)
+        if handle:
+            handle.cancel()
+        batch = self._pending.pop(url, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._flush(url, batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, url: str, batch: List[tuple]):
+        """Send one batch and resolve each caller's future."""
+        self.stats["batches_sent"] += 1
+        breaker = self.client._circuit_breakers.get(url) if self.client._circuit_breakers else None
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "A2A-Protocol-Client/1.0"
+        }
+        
+        try:
+            replies = await self._post_batch(url, [payload for payload, _ in batch], headers, breaker)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            error = e if isinstance(e, A2ACommunicationError) else A2ACommunicationError(
+                f"Batch request to {url} failed: {e}"
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        
+        if isinstance(replies, dict):
+            # Server answered the whole batch with a single error object
+            replies = [replies] if len(batch) == 1 else []
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        for payload, future in batch:
+            if future.done():
+                continue
+            reply = by_id.get(payload["id"])
+            if reply is None:
+                future.set_exception(A2ACommunicationError(
+                    f"No reply for request {payload['id']} in batch to {url}"
+                ))
+            else:
+                future.set_result(reply)
+
+    async def _post_batch(
+        self,
+        url: str,
+        payloads: List[Dict[str, Any]],
+        headers: Dict[str, str],
+        breaker: Optional[CircuitBreaker]
+    ) -> Any:
+        """
+        POST a batch, following send_message's circuit breaker and retry rules.
+        
+        Server errors (5xx, 429), timeouts and network errors count against
+        the breaker and are retried while the client's retry budget has
+        tokens. Other HTTP errors mean the batch itself was rejected: they
+        are neither counted as breaker failures nor retried.
+        """
+        client = self.client
+        error: Exception = A2ACommunicationError(f"Batch request to {url} failed")
+        for attempt in range(client.max_retries):
+            if breaker and not breaker.allow_request():
+                client.session_stats["circuit_rejections"] += 1
+                raise CircuitOpenError(f"Circuit open for agent at {url}, failing fast")
+            started = time.monotonic()
+            try:
+                replies = await client._post_request(url, url, payloads, headers, client.default_timeout)
+            except _A2AHTTPStatusError as e:
+                error = A2ACommunicationError(f"HTTP {e.status} from {url}: {e.body}")
+                server_error = e.status >= 500 or e.status == 429
+                if breaker:
+                    if server_error:
+                        breaker.record_failure(time.monotonic() - started)
+                    else:
+                        breaker.record_success(time.monotonic() - started)
+                if not server_error:
+                    raise error
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                error = A2ACommunicationError(f"Batch request to {url} failed: {e}")
+                if breaker:
+                    breaker.record_failure(time.monotonic() - started)
+            except Exception:
+                if breaker:
+                    breaker.record_failure(time.monotonic() - started)
+                raise
+            except BaseException:
+                if breaker:
+                    breaker.release_probe()
+                raise
+            else:
+                if breaker:
+                    breaker.record_success(time.monotonic() - started)
+                return replies
+            
+            if attempt < client.max_retries - 1 and client._acquire_retry():
+                await client._wait_for_retry(attempt)
+                continue
+            break
+        raise error
+
+
 class A2ACommunicationError(Exception):
     """Exception raised for A2A communication failures."""
     pass
 
 
+class CircuitOpenError(A2ACommunicationError):
+    """Exception raised when a request is rejected by an open circuit breaker."""
+    pass
+
+
+class _A2AHTTPStatusError(Exception):
+    """Internal signal for a non-200 HTTP answer from an agent."""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
 # Default port mapping for common agents
 # TO EXTEND: Add your new agent mappings here or use custom_port_mapping in client
 A2A_AGENT_PORTS = {
@@ -0,0 +1,361 @@
+# ABOUTME: Circuit breakers, retry budgets and latency tracking for A2A communication
+# ABOUTME: Fails fast on unhealthy agents, caps retries and drives request hedging
+
+import time
+import logging
+import threading
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """State of a per-endpoint circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single A2A endpoint.
+
+    Outcomes are kept in a sliding time window. The breaker opens when,
+    with at least ``minimum_calls`` in the window, either the error rate or
+    the share of slow calls crosses its threshold. After ``open_duration``
+    it lets a few probe calls through (half-open) and closes again only if
+    they all succeed.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 30.0,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_threshold: float = 30.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_duration: float = 15.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            window_seconds: Length of the sliding outcome window
+            minimum_calls: Calls required in the window before tripping
+            failure_rate_threshold: Error rate (0-1) that opens the circuit
+            slow_call_threshold: Latency in seconds above which a call is slow
+            slow_call_rate_threshold: Slow call rate (0-1) that opens the circuit
+            open_duration: Seconds to stay open before probing
+            half_open_max_calls: Concurrent probe calls allowed when half-open
+        """
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        # (timestamp, success, slow)
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow_calls = 0
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the cooldown ends."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be sent to the endpoint now."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self, latency: float):
+        """Record a successful call and its latency in seconds."""
+        with self._lock:
+            slow = latency >= self.slow_call_threshold
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if slow:
+                    self._open(time.monotonic())
+                elif self._half_open_in_flight == 0:
+                    self._close()
+                return
+            self._record(True, slow)
+
+    def record_failure(self, latency: float = 0.0):
+        """Record a failed call and its latency in seconds."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._open(time.monotonic())
+                return
+            self._record(False, latency >= self.slow_call_threshold)
+
+    def release_probe(self):
+        """Free a half-open probe slot for a call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _record(self, success: bool, slow: bool):
+        """Add an outcome to the window and trip the breaker if needed."""
+        now = time.monotonic()
+        self._window.append((now, success, slow))
+        if not success:
+            self._failures += 1
+        if slow:
+            self._slow_calls += 1
+        self._evict_expired(now)
+
+        total = len(self._window)
+        if self._state != CircuitState.CLOSED or total < self.minimum_calls:
+            return
+
+        if (self._failures / total >= self.failure_rate_threshold or
+                self._slow_calls / total >= self.slow_call_rate_threshold):
+            self._open(now)
+
+    def _evict_expired(self, now: float):
+        """Drop outcomes that have left the sliding window."""
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            _, success, slow = self._window.popleft()
+            if not success:
+                self._failures -= 1
+            if slow:
+                self._slow_calls -= 1
+
+    def _maybe_half_open(self, now: float):
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+
+    def _open(self, now: float):
+        if self._state != CircuitState.OPEN:
+            self._times_opened += 1
+            logger.warning("A2A circuit opened")
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._window.clear()
+        self._failures = 0
+        self._slow_calls = 0
+        logger.info("A2A circuit closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and window statistics."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            self._evict_expired(now)
+            total = len(self._window)
+            return {
+                "state": self._state.value,
+                "window_calls": total,
+                "error_rate": round(self._failures / total, 4) if total else 0.0,
+                "slow_call_rate": round(self._slow_calls / total, 4) if total else 0.0,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected
+            }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide map of endpoint base URL to its circuit breaker."""
+
+    def __init__(self, **breaker_kwargs):
+        """
+        Initialize registry.
+
+        Args:
+            **breaker_kwargs: Settings applied to every breaker created
+                (see CircuitBreaker for available options)
+        """
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Get or create the breaker for an endpoint."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(**self._breaker_kwargs))
+        return breaker
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get stats for every known endpoint."""
+        return {endpoint: breaker.get_stats() for endpoint, breaker in list(self._breakers.items())}
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget shared by all A2A clients.
+
+    Every original request deposits ``retry_ratio`` tokens and every retry
+    spends one, so retries stay at roughly that fraction of live traffic.
+    A small time-based refill keeps low-traffic callers able to retry.
+    """
+
+    def __init__(
+        self,
+        retry_ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 100.0
+    ):
+        """
+        Initialize retry budget.
+
+        Args:
+            retry_ratio: Retry tokens earned per original request
+            min_retries_per_second: Tokens refilled per second regardless of traffic
+            max_tokens: Upper bound on saved-up retry tokens
+        """
+        self.retry_ratio = retry_ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+
+        self._tokens = min(max_tokens, max(1.0, min_retries_per_second))
+        self._last_refill = time.monotonic()
+        self._retries_allowed = 0
+        self._retries_denied = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_retries_per_second)
+
+    def record_request(self):
+        """Deposit tokens for an original (non-retry) request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.retry_ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend one token for a retry; return False if the budget is exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._retries_allowed += 1
+                return True
+            self._retries_denied += 1
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget statistics."""
+        with self._lock:
+            self._refill()
+            return {
+                "available_tokens": round(self._tokens, 2),
+                "retries_allowed": self._retries_allowed,
+                "retries_denied": self._retries_denied
+            }
+
+
+# Global instances shared by all A2A clients in the process
+_global_breakers: Optional[CircuitBreakerRegistry] = None
+_global_retry_budget: Optional[RetryBudget] = None
+
+
+def get_global_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get or create the global circuit breaker registry."""
+    global _global_breakers
+    if _global_breakers is None:
+        _global_breakers = CircuitBreakerRegistry()
+    return _global_breakers
+
+
+def get_global_retry_budget() -> RetryBudget:
+    """Get or create the global retry budget."""
+    global _global_retry_budget
+    if _global_retry_budget is None:
+        _global_retry_budget = RetryBudget()
+    return _global_retry_budget
+
+
+class LatencyTracker:
+    """
+    Rolling per-endpoint latency samples for hedging decisions.
+
+    Keeps the most recent ``max_samples`` successful call latencies for
+    each endpoint and answers percentile queries over them.
+    """
+
+    def __init__(self, max_samples: int = 256, min_samples: int = 20):
+        """
+        Initialize latency tracker.
+
+        Args:
+            max_samples: Samples kept per endpoint
+            min_samples: Samples required before percentiles are reported
+        """
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, latency: float):
+        """Record a latency sample in seconds for an endpoint."""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.max_samples)
+            samples.append(latency)
+
+    def percentile(self, endpoint: str, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile for an endpoint.
+
+        Args:
+            endpoint: Endpoint base URL
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if there are not enough samples yet
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(percentile / 100 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get sample counts and key percentiles per endpoint."""
+        stats = {}
+        for endpoint in list(self._samples.keys()):
+            stats[endpoint] = {
+                "samples": len(self._samples[endpoint]),
+                "p50": self.percentile(endpoint, 50),
+                "p95": self.percentile(endpoint, 95),
+                "p99": self.percentile(endpoint, 99)
+            }
+        return stats
@@ -0,0 +1,173 @@
+# ABOUTME: Admission control for workflow execution with global and per-agent concurrency limits
+# ABOUTME: Callers over a limit wait in a FIFO queue; queue times are recorded per target agent
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """
+    Bounds concurrent calls overall and per target agent.
+
+    ``acquire`` admits a caller at once if both the global limit and its
+    agent's limit have room and nobody for that agent is already waiting;
+    otherwise the caller joins a single FIFO queue. Whenever a slot is
+    released, the queue is scanned in arrival order and every waiter whose
+    agent has room is admitted while global capacity remains, so a burst
+    aimed at one saturated agent never holds back calls to other agents.
+    Waiting callers are never rejected.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_agent_limits: Optional[Dict[str, int]] = None,
+        default_agent_limit: Optional[int] = None
+    ):
+        """
+        Initialize controller.
+
+        Args:
+            max_concurrency: Limit on calls in flight overall; None means no limit
+            per_agent_limits: Limit on calls in flight per agent name
+            default_agent_limit: Limit for agents not in ``per_agent_limits``;
+                None means no limit
+        """
+        self.max_concurrency = max_concurrency
+        self.per_agent_limits = dict(per_agent_limits or {})
+        self.default_agent_limit = default_agent_limit
+
+        self._in_flight = 0
+        self._agent_in_flight: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[str, asyncio.Future, float]] = deque()
+        self._metrics = {
+            "admitted": 0,
+            "queued": 0,
+            "cancelled_while_queued": 0,
+            "total_queue_time": 0.0,
+            "max_queue_time": 0.0,
+            "peak_in_flight": 0,
+            "peak_queue_length": 0
+        }
+        self._agent_metrics: Dict[str, Dict[str, Any]] = {}
+
+    def agent_limit(self, agent: str) -> Optional[int]:
+        return self.per_agent_limits.get(agent, self.default_agent_limit)
+
+    def _has_room(self, agent: str) -> bool:
+        if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+            return False
+        limit = self.agent_limit(agent)
+        return limit is None or self._agent_in_flight.get(agent, 0) < limit
+
+    def _admit(self, agent: str, queue_time: float):
+        self._in_flight += 1
+        self._agent_in_flight[agent] = self._agent_in_flight.get(agent, 0) + 1
+        self._metrics["admitted"] += 1
+        self._metrics["total_queue_time"] += queue_time
+        self._metrics["max_queue_time"] = max(self._metrics["max_queue_time"], queue_time)
+        self._metrics["peak_in_flight"] = max(self._metrics["peak_in_flight"], self._in_flight)
+
+        stats = self._agent_metrics.setdefault(
+            agent, {"admitted": 0, "queued": 0, "total_queue_time": 0.0, "max_queue_time": 0.0}
+        )
+        stats["admitted"] += 1
+        stats["total_queue_time"] += queue_time
+        stats["max_queue_time"] = max(stats["max_queue_time"], queue_time)
+
+    async def acquire(self, agent: str = "default") -> float:
+        """
+        Wait for a slot for a call to ``agent``.
+
+        Returns:
+            Seconds spent queued
+        """
+        if self._has_room(agent) and not any(waiting == agent for waiting, _, _ in self._waiters):
+            self._admit(agent, 0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.monotonic()
+        self._waiters.append((agent, future, enqueued_at))
+        self._metrics["queued"] += 1
+        self._metrics["peak_queue_length"] = max(self._metrics["peak_queue_length"], len(self._waiters))
+        self._agent_metrics.setdefault(
+            agent, {"admitted": 0, "queued": 0, "total_queue_time": 0.0, "max_queue_time": 0.0}
+        )["queued"] += 1
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as we were cancelled; hand the slot back
+                self.release(agent)
+            else:
+                self._metrics["cancelled_while_queued"] += 1
+                try:
+                    self._waiters.remove((agent, future, enqueued_at))
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, agent: str = "default"):
+        """Free a slot taken by ``acquire`` and admit waiters that now fit."""
+        self._in_flight -= 1
+        self._agent_in_flight[agent] -= 1
+        if not self._agent_in_flight[agent]:
+            del self._agent_in_flight[agent]
+        self._dispatch()
+
+    def _dispatch(self):
+        if not self._waiters:
+            return
+        now = time.monotonic()
+        still_waiting: Deque[Tuple[str, asyncio.Future, float]] = deque()
+        while self._waiters:
+            agent, future, enqueued_at = self._waiters.popleft()
+            if future.done():
+                continue
+            if self._has_room(agent):
+                queue_time = now - enqueued_at
+                self._admit(agent, queue_time)
+                future.set_result(queue_time)
+            else:
+                still_waiting.append((agent, future, enqueued_at))
+                if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+                    # No global room left; keep the rest in order
+                    still_waiting.extend(self._waiters)
+                    self._waiters.clear()
+        self._waiters = still_waiting
+
+    @asynccontextmanager
+    async def slot(self, agent: str = "default"):
+        """Hold a slot for ``agent`` for the duration of the block; yields the queue time."""
+        queue_time = await self.acquire(agent)
+        try:
+            yield queue_time
+        finally:
+            self.release(agent)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        admitted = self._metrics["admitted"]
+        return {
+            **self._metrics,
+            "avg_queue_time": self._metrics["total_queue_time"] / admitted if admitted else 0.0,
+            "in_flight": self._in_flight,
+            "queue_length": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "agents": {
+                agent: {
+                    **stats,
+                    "in_flight": self._agent_in_flight.get(agent, 0),
+                    "limit": self.agent_limit(agent),
+                    "avg_queue_time": stats["total_queue_time"] / stats["admitted"] if stats["admitted"] else 0.0
+                }
+                for agent, stats in self._agent_metrics.items()
+            }
+        }
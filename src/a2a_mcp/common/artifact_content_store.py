@@ -0,0 +1,189 @@
+# ABOUTME: Content-addressed, reference-counted storage for artifact payloads
+# ABOUTME: Serializes once, deduplicates identical payloads and spills large ones to disk
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_content(content: Any) -> Tuple[bytes, str]:
+    """
+    Canonical bytes of an artifact payload and how to read them back.
+
+    Returns:
+        ``(data, kind)`` where kind is ``'json'`` for dicts and lists,
+        ``'text'`` for strings and ``'repr'`` for anything else (stored as
+        its ``str()``)
+    """
+    if isinstance(content, (dict, list)):
+        return json.dumps(content, sort_keys=True, default=str).encode('utf-8'), 'json'
+    if isinstance(content, str):
+        return content.encode('utf-8'), 'text'
+    return str(content).encode('utf-8'), 'repr'
+
+
+def hash_content(data: bytes, kind: str) -> str:
+    """
+    Content address of serialized payload bytes.
+
+    The kind is part of the address, so a dict and its JSON text, or ``1``
+    and ``'1'``, are stored as different payloads.
+    """
+    return hashlib.blake2b(kind.encode('utf-8') + b'\0' + data, digest_size=16).hexdigest()
+
+
+@dataclass
+class _Blob:
+    size: int
+    kind: str
+    refcount: int = 1
+    content: Any = None  # Payload kept in memory, or None when spilled
+    path: Optional[str] = None  # File holding the payload when spilled
+
+
+class ArtifactContentStore:
+    """
+    Stores artifact payloads once per distinct content.
+
+    ``put`` serializes a payload a single time, which yields both its size
+    and its BLAKE2b content address. A payload already stored only gains a
+    reference; otherwise it is kept in memory, or, when it is at least
+    ``spill_threshold`` bytes and a ``spill_dir`` is configured, written to
+    a file so that only its address and size stay in memory. ``release``
+    drops a reference and deletes the payload with the last one.
+
+    Reference counts are per store, so each store spills into its own
+    subdirectory of ``spill_dir``; stores sharing a directory (in one
+    process or several) never delete each other's files.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None, spill_threshold: int = 256 * 1024):
+        """
+        Initialize store.
+
+        Args:
+            spill_dir: Directory for large payloads; everything stays in memory when None
+            spill_threshold: Payloads of at least this many bytes are spilled
+        """
+        self.spill_dir = os.path.join(spill_dir, f"store-{uuid.uuid4().hex}") if spill_dir else None
+        self.spill_threshold = spill_threshold
+        self._blobs: Dict[str, _Blob] = {}
+        self._metrics = {
+            "puts": 0,
+            "dedup_hits": 0,
+            "spilled": 0,
+            "disk_reads": 0,
+            "spill_errors": 0
+        }
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def put(self, content: Any) -> Tuple[str, int]:
+        """
+        Store a payload, or add a reference to an identical stored one.
+
+        Returns:
+            ``(content_hash, size_in_bytes)``
+        """
+        data, kind = serialize_content(content)
+        content_hash = hash_content(data, kind)
+        self._metrics["puts"] += 1
+
+        blob = self._blobs.get(content_hash)
+        if blob is not None:
+            blob.refcount += 1
+            self._metrics["dedup_hits"] += 1
+            return content_hash, blob.size
+
+        blob = _Blob(size=len(data), kind=kind)
+        if self.spill_dir and blob.size >= self.spill_threshold:
+            blob.path = self._spill(content_hash, data)
+        if blob.path is None:
+            blob.content = content
+        self._blobs[content_hash] = blob
+        return content_hash, blob.size
+
+    def _spill(self, content_hash: str, data: bytes) -> Optional[str]:
+        directory = os.path.join(self.spill_dir, content_hash[:2])
+        path = os.path.join(directory, content_hash)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._metrics["spilled"] += 1
+            return path
+        except OSError as e:
+            logger.warning(f"Could not spill artifact content {content_hash}, keeping it in memory: {e}")
+            self._metrics["spill_errors"] += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    def get(self, content_hash: str) -> Any:
+        """Payload stored under a content address, or None if unknown."""
+        blob = self._blobs.get(content_hash)
+        if blob is None:
+            return None
+        if blob.path is None:
+            return blob.content
+
+        self._metrics["disk_reads"] += 1
+        try:
+            with open(blob.path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.error(f"Could not read spilled artifact content {content_hash}: {e}")
+            return None
+        if blob.kind == 'json':
+            return json.loads(data)
+        return data.decode('utf-8')
+
+    def refcount(self, content_hash: str) -> int:
+        blob = self._blobs.get(content_hash)
+        return blob.refcount if blob else 0
+
+    def release(self, content_hash: str):
+        """Drop one reference; the payload is deleted with its last reference."""
+        blob = self._blobs.get(content_hash)
+        if blob is None:
+            return
+        blob.refcount -= 1
+        if blob.refcount > 0:
+            return
+        del self._blobs[content_hash]
+        if blob.path is not None:
+            try:
+                os.remove(blob.path)
+            except OSError as e:
+                logger.warning(f"Could not delete spilled artifact content {blob.path}: {e}")
+
+    def close(self):
+        """Drop every payload and remove this store's spill directory."""
+        self._blobs.clear()
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        in_memory = [blob for blob in self._blobs.values() if blob.path is None]
+        return {
+            **self._metrics,
+            "unique_payloads": len(self._blobs),
+            "total_references": sum(blob.refcount for blob in self._blobs.values()),
+            "bytes_in_memory": sum(blob.size for blob in in_memory),
+            "bytes_on_disk": sum(blob.size for blob in self._blobs.values() if blob.path is not None)
+        }
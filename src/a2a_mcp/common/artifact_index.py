@@ -0,0 +1,257 @@
+# ABOUTME: Inverted index over orchestrator artifacts with BM25 ranking
+# ABOUTME: Set-style postings, tokenization once per artifact and single-pass multi-term queries
+
+import heapq
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class IndexedArtifact:
+    """What the index keeps about one artifact."""
+    artifact_id: str
+    term_counts: Dict[str, int]
+    length: int
+    created_ts: float
+    artifact_type: Optional[str]
+    session_id: Optional[str]
+    collection_id: Optional[str]
+    tags: FrozenSet[str]
+
+
+class ArtifactIndex:
+    """
+    Inverted index of artifacts for keyword search.
+
+    Each artifact is tokenized once when added. Postings map a term to a
+    dict of artifact ID to term frequency, so membership, insertion and
+    removal are O(1), and removing an artifact only touches its own terms.
+    Queries score every matching artifact with BM25 in one pass over the
+    query terms' postings; session, type, collection and tag filters are
+    set lookups, and ordering uses numeric creation timestamps.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_indexed_chars: int = 4000):
+        """
+        Initialize index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            max_indexed_chars: Text content beyond this many characters is not indexed
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_indexed_chars = max_indexed_chars
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._docs: Dict[str, IndexedArtifact] = {}
+        self._total_length = 0
+        self._by_session: Dict[str, Set[str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+        self._by_collection: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct indexed terms."""
+        return len(self._postings)
+
+    def __contains__(self, artifact_id: str) -> bool:
+        return artifact_id in self._docs
+
+    @property
+    def artifact_count(self) -> int:
+        return len(self._docs)
+
+    def terms(self, artifact_id: str) -> Set[str]:
+        """Distinct terms an artifact was indexed under."""
+        doc = self._docs.get(artifact_id)
+        return set(doc.term_counts) if doc else set()
+
+    def _extract_terms(self, artifact: Dict[str, Any]) -> List[str]:
+        """Searchable tokens of an artifact: type, tags, short source values and content."""
+        terms = tokenize(artifact.get('artifact_type') or '')
+        for tag in artifact.get('tags') or []:
+            terms.extend(tokenize(str(tag)))
+
+        for value in (artifact.get('source_info') or {}).values():
+            if isinstance(value, str) and len(value) < 50:  # Avoid indexing large text
+                terms.extend(tokenize(value))
+
+        content = artifact.get('content')
+        budget = self.max_indexed_chars
+        if isinstance(content, dict):
+            for key, value in content.items():
+                if isinstance(key, str) and len(key) < 30:
+                    terms.extend(tokenize(key))
+                if isinstance(value, str) and budget > 0:
+                    terms.extend(tokenize(value[:budget]))
+                    budget -= len(value)
+        elif isinstance(content, str):
+            terms.extend(tokenize(content[:budget]))
+        return terms
+
+    def add(self, artifact: Dict[str, Any]):
+        """Index an artifact, replacing any earlier version with the same ID."""
+        artifact_id = artifact['artifact_id']
+        if artifact_id in self._docs:
+            self.remove(artifact_id)
+
+        terms = self._extract_terms(artifact)
+        term_counts: Dict[str, int] = {}
+        for term in terms:
+            term_counts[term] = term_counts.get(term, 0) + 1
+
+        doc = IndexedArtifact(
+            artifact_id=artifact_id,
+            term_counts=term_counts,
+            length=len(terms),
+            created_ts=float(artifact.get('created_ts') or 0.0),
+            artifact_type=artifact.get('artifact_type'),
+            session_id=artifact.get('session_id'),
+            collection_id=artifact.get('collection_id'),
+            tags=frozenset(artifact.get('tags') or ())
+        )
+        self._docs[artifact_id] = doc
+        self._total_length += doc.length
+        for term, count in term_counts.items():
+            self._postings.setdefault(term, {})[artifact_id] = count
+
+        for attribute, value in self._filter_keys(doc):
+            attribute.setdefault(value, set()).add(artifact_id)
+
+    def remove(self, artifact_id: str):
+        """Drop an artifact from the index; unknown IDs are ignored."""
+        doc = self._docs.pop(artifact_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.term_counts:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(artifact_id, None)
+                if not posting:
+                    del self._postings[term]
+
+        for attribute, value in self._filter_keys(doc):
+            members = attribute.get(value)
+            if members is not None:
+                members.discard(artifact_id)
+                if not members:
+                    del attribute[value]
+
+    def _filter_keys(self, doc: IndexedArtifact) -> Iterable:
+        if doc.session_id is not None:
+            yield self._by_session, doc.session_id
+        if doc.artifact_type is not None:
+            yield self._by_type, doc.artifact_type
+        if doc.collection_id is not None:
+            yield self._by_collection, doc.collection_id
+        for tag in doc.tags:
+            yield self._by_tag, tag
+
+    def _matches(
+        self,
+        doc: IndexedArtifact,
+        artifact_type: Optional[str],
+        session_id: Optional[str],
+        collection_id: Optional[str],
+        tags: Optional[Set[str]]
+    ) -> bool:
+        return (
+            (artifact_type is None or doc.artifact_type == artifact_type)
+            and (session_id is None or doc.session_id == session_id)
+            and (collection_id is None or doc.collection_id == collection_id)
+            and (not tags or not doc.tags.isdisjoint(tags))
+        )
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        session_id: Optional[str] = None,
+        collection_id: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        limit: int = 50
+    ) -> List[str]:
+        """
+        Find artifacts matching any query term and all given filters.
+
+        Args:
+            query: Free text; artifacts matching any of its terms are ranked
+                by BM25, newest first among equal scores
+            artifact_type: Only artifacts of this type
+            session_id: Only artifacts of this session
+            collection_id: Only artifacts in this collection
+            tags: Only artifacts carrying at least one of these tags
+            limit: Maximum number of IDs returned
+
+        Returns:
+            Artifact IDs, best match first (newest first without a query)
+        """
+        tags = set(tags) if tags else None
+        query_terms = set(tokenize(query)) if query else set()
+
+        if not query_terms:
+            if query:
+                return []
+            candidates = self._filtered_candidates(artifact_type, session_id, collection_id, tags)
+            return heapq.nlargest(limit, candidates, key=lambda aid: self._docs[aid].created_ts)
+
+        total = len(self._docs)
+        average_length = self._total_length / total if total else 0.0
+        scores: Dict[str, float] = {}
+        for term in query_terms:
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for artifact_id, frequency in posting.items():
+                doc = self._docs[artifact_id]
+                norm = self.k1 * (1.0 - self.b + self.b * doc.length / average_length) if average_length else self.k1
+                scores[artifact_id] = scores.get(artifact_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+
+        ranked = (
+            (score, self._docs[artifact_id].created_ts, artifact_id)
+            for artifact_id, score in scores.items()
+            if self._matches(self._docs[artifact_id], artifact_type, session_id, collection_id, tags)
+        )
+        return [artifact_id for _, _, artifact_id in heapq.nlargest(limit, ranked)]
+
+    def _filtered_candidates(
+        self,
+        artifact_type: Optional[str],
+        session_id: Optional[str],
+        collection_id: Optional[str],
+        tags: Optional[Set[str]]
+    ) -> Iterable[str]:
+        """Artifact IDs passing the filters, starting from the smallest filter set."""
+        sets = []
+        if session_id is not None:
+            sets.append(self._by_session.get(session_id, set()))
+        if artifact_type is not None:
+            sets.append(self._by_type.get(artifact_type, set()))
+        if collection_id is not None:
+            sets.append(self._by_collection.get(collection_id, set()))
+        if tags:
+            sets.append(set().union(*(self._by_tag.get(tag, set()) for tag in tags)))
+        if not sets:
+            return self._docs.keys()
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'indexed_artifacts': len(self._docs),
+            'indexed_terms': len(self._postings),
+            'avg_artifact_terms': self._total_length / len(self._docs) if self._docs else 0.0
+        }
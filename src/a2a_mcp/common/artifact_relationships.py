@@ -0,0 +1,175 @@
+# ABOUTME: Incremental artifact relationship detection with MinHash locality-sensitive hashing
+# ABOUTME: Keeps relationships as adjacency sets so neighbor queries cost O(degree)
+
+import hashlib
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """MinHash signatures of token sets; equal positions estimate Jaccard similarity."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # Coefficients below 2**32 keep a * hash + b within uint64
+        self._a = rng.randint(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """Signature of a token set, or None when there are no tokens."""
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+                for token in set(tokens)
+            ),
+            dtype=np.uint64
+        )
+        if not len(hashes):
+            return None
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.mean(first == second))
+
+
+class ArtifactRelationshipIndex:
+    """
+    Detects artifact relationships incrementally, one new artifact at a time.
+
+    Artifacts of a session are related when they share a task ID, a
+    specialist or identical content, or when their token sets are similar.
+    Rather than comparing a new artifact with every other one, candidates
+    come from hash buckets: exact-key buckets for the shared attributes and
+    MinHash LSH band buckets for content, so only artifacts that collide in
+    some bucket are checked. Relationships are undirected edges held in
+    adjacency sets.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, similarity_threshold: float = 0.5):
+        """
+        Initialize index.
+
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands; ``num_perm / bands`` rows each. More bands
+                catch less similar pairs as candidates
+            similarity_threshold: Minimum estimated Jaccard similarity for
+                a content relationship
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.similarity_threshold = similarity_threshold
+        self.minhasher = MinHasher(num_perm)
+
+        self._adjacency: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Hashable, Set[str]] = {}
+        self._bucket_keys: Dict[str, List[Hashable]] = {}
+        self._metrics = {"candidates_checked": 0, "content_matches": 0}
+
+    def __contains__(self, artifact_id: str) -> bool:
+        return artifact_id in self._adjacency
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(neighbors) for neighbors in self._adjacency.values()) // 2
+
+    def neighbors(self, artifact_id: str) -> Set[str]:
+        """Artifacts related to ``artifact_id`` (a live set; do not modify)."""
+        return self._adjacency.get(artifact_id, set())
+
+    def _exact_keys(self, artifact: Dict[str, Any]) -> List[Hashable]:
+        session_id = artifact.get('session_id')
+        source_info = artifact.get('source_info') or {}
+        keys = []
+        if source_info.get('task_id'):
+            keys.append((session_id, 'task', source_info['task_id']))
+        if source_info.get('specialist_used'):
+            keys.append((session_id, 'specialist', source_info['specialist_used']))
+        if artifact.get('content_hash'):
+            keys.append((session_id, 'hash', artifact['content_hash']))
+        return keys
+
+    def _band_keys(self, session_id: Optional[str], signature: np.ndarray) -> List[Hashable]:
+        return [
+            (session_id, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, artifact: Dict[str, Any], terms: Iterable[str]) -> Set[str]:
+        """
+        Add an artifact and link it to related artifacts of its session.
+
+        Args:
+            artifact: Artifact metadata (``artifact_id``, ``session_id``,
+                ``source_info``, ``content_hash``)
+            terms: The artifact's content tokens
+
+        Returns:
+            IDs of the artifacts it was linked to
+        """
+        artifact_id = artifact['artifact_id']
+        if artifact_id in self._adjacency:
+            self.remove(artifact_id)
+
+        related: Set[str] = set()
+        exact_keys = self._exact_keys(artifact)
+        for key in exact_keys:
+            related.update(self._buckets.get(key, ()))
+
+        band_keys: List[Hashable] = []
+        signature = self.minhasher.signature(terms)
+        if signature is not None:
+            self._signatures[artifact_id] = signature
+            band_keys = self._band_keys(artifact.get('session_id'), signature)
+            candidates: Set[str] = set()
+            for key in band_keys:
+                candidates.update(self._buckets.get(key, ()))
+            candidates -= related
+            self._metrics["candidates_checked"] += len(candidates)
+            for candidate in candidates:
+                if MinHasher.similarity(signature, self._signatures[candidate]) >= self.similarity_threshold:
+                    related.add(candidate)
+                    self._metrics["content_matches"] += 1
+
+        self._adjacency[artifact_id] = related
+        for other in related:
+            self._adjacency[other].add(artifact_id)
+
+        keys = exact_keys + band_keys
+        self._bucket_keys[artifact_id] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(artifact_id)
+        return related
+
+    def remove(self, artifact_id: str):
+        """Remove an artifact and its edges in O(degree + buckets)."""
+        neighbors = self._adjacency.pop(artifact_id, None)
+        if neighbors is None:
+            return
+        for other in neighbors:
+            self._adjacency[other].discard(artifact_id)
+        for key in self._bucket_keys.pop(artifact_id, ()):
+            members = self._buckets.get(key)
+            if members is not None:
+                members.discard(artifact_id)
+                if not members:
+                    del self._buckets[key]
+        self._signatures.pop(artifact_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "artifacts": len(self._adjacency),
+            "edges": self.edge_count,
+            "buckets": len(self._buckets)
+        }
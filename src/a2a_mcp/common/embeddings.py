@@ -0,0 +1,229 @@
+# ABOUTME: Batched text embedding with a persistent content-hash cache
+# ABOUTME: Includes a deterministic local embedder used when the remote model is unavailable
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+EmbedBatchFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def content_hash(text: str, model_name: str) -> str:
+    """Stable cache key for a text embedded with a given model."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def deterministic_embedding(text: str, dimension: int = 768) -> np.ndarray:
+    """
+    Embed text locally with signed feature hashing.
+
+    Word unigrams and bigrams are hashed with BLAKE2b into ``dimension``
+    buckets, so the same text gives the same vector in every process
+    (unlike the built-in ``hash()``, which is salted per process) and
+    texts sharing words get similar vectors.
+
+    Args:
+        text: Input text
+        dimension: Size of the returned vector
+
+    Returns:
+        L2-normalized float32 vector
+    """
+    vector = np.zeros(dimension, dtype=np.float32)
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        sign = 1.0 if value & 1 else -1.0
+        vector[(value >> 1) % dimension] += sign
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by content hash.
+
+    Vectors are kept in memory and written to a single ``.npz`` file,
+    replaced atomically on save so concurrent readers never see a
+    partial file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize cache.
+
+        Args:
+            path: File backing the cache; memory only when None
+        """
+        self.path = path
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self._vectors = {key: data[key] for key in data.files}
+            logger.info(f"Loaded {len(self._vectors)} cached embeddings from {self.path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.path}: {e}")
+            self._vectors = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self._vectors.get(key)
+
+    def put(self, key: str, vector: Sequence[float]):
+        with self._lock:
+            self._vectors[key] = np.asarray(vector, dtype=np.float32)
+            self._dirty = True
+
+    def prune(self, keep: Sequence[str]):
+        """Drop every entry whose key is not in ``keep``."""
+        keep = set(keep)
+        with self._lock:
+            stale = [key for key in self._vectors if key not in keep]
+            for key in stale:
+                del self._vectors[key]
+            self._dirty = self._dirty or bool(stale)
+
+    def save(self):
+        """Write the cache to disk if it changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    np.savez(f, **self._vectors)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save embedding cache to {self.path}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+
+class CachedEmbedder:
+    """
+    Embeds texts in batches, reusing cached vectors for unchanged texts.
+
+    Texts whose content hash is in the cache are not sent to the model.
+    The rest are embedded ``batch_size`` at a time; when a remote batch
+    fails, its texts get deterministic local embeddings, which are cached
+    under the local embedder's own model name so they are retried with
+    the remote model next time.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Optional[EmbedBatchFn],
+        model_name: str,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 100,
+        fallback_dimension: int = 768
+    ):
+        """
+        Initialize embedder.
+
+        Args:
+            embed_batch: Remote embedding call for a list of texts; local
+                embedding only when None
+            model_name: Remote model name, part of every cache key
+            cache: Cache shared across calls; memory only when None
+            batch_size: Maximum texts per remote call
+            fallback_dimension: Size of deterministic local embeddings
+        """
+        self.embed_batch = embed_batch
+        self.model_name = model_name
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.batch_size = batch_size
+        self.fallback_dimension = fallback_dimension
+        self.fallback_model_name = f"local-hash-{fallback_dimension}"
+        self._metrics = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "remote_calls": 0,
+            "remote_failures": 0,
+            "fallback_embeddings": 0
+        }
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """
+        Embed texts, using the cache where possible.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One float32 vector per text, in input order
+        """
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: List[int] = []
+        for position, text in enumerate(texts):
+            cached = self.cache.get(content_hash(text, self.model_name))
+            if cached is None:
+                cached = self.cache.get(content_hash(text, self.fallback_model_name))
+                if cached is not None and self.embed_batch is not None:
+                    # Local vector from an earlier outage; retry the remote model
+                    cached = None
+            if cached is not None:
+                vectors[position] = cached
+                self._metrics["cache_hits"] += 1
+            else:
+                missing.append(position)
+        self._metrics["cache_misses"] += len(missing)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            batch_texts = [texts[position] for position in batch]
+            embedded, model_name = self._embed_batch(batch_texts)
+            for position, text, vector in zip(batch, batch_texts, embedded):
+                self.cache.put(content_hash(text, model_name), vector)
+                vectors[position] = self.cache.get(content_hash(text, model_name))
+
+        return vectors
+
+    def _embed_batch(self, texts: List[str]):
+        if self.embed_batch is not None:
+            try:
+                self._metrics["remote_calls"] += 1
+                embedded = list(self.embed_batch(texts))
+                if len(embedded) != len(texts):
+                    raise ValueError(f"Expected {len(texts)} embeddings, got {len(embedded)}")
+                return embedded, self.model_name
+            except Exception as e:
+                self._metrics["remote_failures"] += 1
+                logger.warning(f"Embedding generation failed: {e}. Using fallback method.")
+        self._metrics["fallback_embeddings"] += len(texts)
+        return [deterministic_embedding(text, self.fallback_dimension) for text in texts], self.fallback_model_name
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {**self._metrics, "cached_vectors": len(self.cache)}
@@ -10,17 +10,21 @@ This module provides sophisticated workflow management capabilities including:
 - State management (RUNNING, PAUSED, COMPLETED)
 - Node attribute management for orchestration
 - Integration with existing ParallelWorkflow system
+- Durable checkpointing of node transitions and resume after restart
 
 Based on reference orchestrator patterns but enhanced for Framework V2.0.
 """
 
+import os
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Callable, Dict, List, Any, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from a2a_mcp.common.workflow_checkpoint import CheckpointStore, SQLiteCheckpointStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +81,10 @@ class WorkflowNode:
     error: Optional[str] = None
     dependencies: Set[str] = field(default_factory=set)
     dependents: Set[str] = field(default_factory=set)
+    # Called after every state transition; set by a checkpointing graph
+    _listener: Optional[Callable[['WorkflowNode'], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def __post_init__(self):
         """Initialize node with default values."""
@@ -95,18 +103,25 @@ class WorkflowNode:
         """Mark node as started."""
         self.state = NodeState.RUNNING
         self.started_at = datetime.now()
+        self._notify()
     
     def complete_execution(self, result: Any = None):
         """Mark node as completed."""
         self.state = NodeState.COMPLETED
         self.completed_at = datetime.now()
         self.result = result
+        self._notify()
     
     def fail_execution(self, error: str):
         """Mark node as failed."""
         self.state = NodeState.FAILED
         self.completed_at = datetime.now()
         self.error = error
+        self._notify()
+    
+    def _notify(self):
+        if self._listener is not None:
+            self._listener(self)
     
     def can_execute(self, completed_nodes: Set[str]) -> bool:
         """Check if node can execute based on dependencies."""
@@ -129,6 +144,49 @@ class WorkflowNode:
             'has_result': self.result is not None,
             'error': self.error
         }
+    
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Convert node to a record holding everything needed to restore it."""
+        return {
+            'id': self.id,
+            'task': self.task,
+            'node_key': self.node_key,
+            'node_label': self.node_label,
+            'state': self.state.value,
+            'metadata': self.metadata,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'result': self.result,
+            'error': self.error,
+            'dependencies': sorted(self.dependencies)
+        }
+    
+    @classmethod
+    def from_checkpoint(cls, record: Dict[str, Any]) -> 'WorkflowNode':
+        """
+        Rebuild a node from a checkpoint record.
+        
+        A node that was running when the record was written did not finish,
+        so it comes back pending and will be executed again.
+        """
+        state = NodeState(record['state'])
+        interrupted = state == NodeState.RUNNING
+        return cls(
+            task=record['task'],
+            id=record['id'],
+            node_key=record.get('node_key'),
+            node_label=record.get('node_label'),
+            state=NodeState.PENDING if interrupted else state,
+            metadata=record.get('metadata') or {},
+            created_at=datetime.fromisoformat(record['created_at']),
+            started_at=None if interrupted or not record.get('started_at')
+            else datetime.fromisoformat(record['started_at']),
+            completed_at=datetime.fromisoformat(record['completed_at']) if record.get('completed_at') else None,
+            result=record.get('result'),
+            error=record.get('error'),
+            dependencies=set(record.get('dependencies') or ())
+        )
 
 
 class DynamicWorkflowGraph:
@@ -141,18 +199,31 @@ class DynamicWorkflowGraph:
     - Dependency resolution
     - Pause/resume capabilities
     - Execution ordering and validation
+    
+    Adjacency in both directions and per-node in-degree counters are kept
+    up to date on every node and edge change, so planning is a single
+    O(V+E) Kahn pass and removing a node costs O(degree).
+    
+    With a checkpoint store attached, every node change and state
+    transition is written through as it happens, and ``restore`` rebuilds
+    the graph with its completed nodes and their results.
     """
     
-    def __init__(self, workflow_id: Optional[str] = None):
+    def __init__(self, workflow_id: Optional[str] = None, checkpoint_store: Optional[CheckpointStore] = None):
         """
         Initialize dynamic workflow graph.
         
         Args:
             workflow_id: Optional workflow identifier
+            checkpoint_store: Optional store that node and workflow changes are written to
         """
         self.workflow_id = workflow_id or str(uuid.uuid4())
         self.nodes: Dict[str, WorkflowNode] = {}
         self.edges: Dict[str, Set[str]] = {}  # node_id -> set of dependent node_ids
+        self._predecessors: Dict[str, Set[str]] = {}  # node_id -> set of dependency node_ids
+        self._in_degree: Dict[str, int] = {}
+        # Missing dependency id -> nodes waiting for it to be added
+        self._unresolved: Dict[str, Set[str]] = {}
         self.state = WorkflowState.PENDING
         self.created_at = datetime.now()
         self.started_at: Optional[datetime] = None
@@ -160,26 +231,99 @@ class DynamicWorkflowGraph:
         self.paused_node_id: Optional[str] = None
         self.execution_order: List[str] = []
         self.metadata: Dict[str, Any] = {}
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        
+        if checkpoint_store is not None:
+            self.attach_checkpoint_store(checkpoint_store)
         
         logger.info(f"Initialized DynamicWorkflowGraph {self.workflow_id}")
     
+    def attach_checkpoint_store(self, checkpoint_store: CheckpointStore):
+        """Write the whole graph to a store and keep it updated from now on."""
+        self.checkpoint_store = checkpoint_store
+        self._persist_workflow()
+        for node in self.nodes.values():
+            node._listener = self._persist_node
+            self._persist_node(node)
+    
+    def _persist_workflow(self):
+        if self.checkpoint_store is None:
+            return
+        try:
+            self.checkpoint_store.save_workflow(self.to_checkpoint())
+        except Exception as e:
+            logger.error(f"Failed to checkpoint workflow {self.workflow_id}: {e}")
+    
+    def _persist_node(self, node: WorkflowNode):
+        if self.checkpoint_store is None:
+            return
+        try:
+            self.checkpoint_store.save_node(self.workflow_id, node.to_checkpoint())
+        except Exception as e:
+            logger.error(f"Failed to checkpoint node {node.id} of workflow {self.workflow_id}: {e}")
+    
+    def record_node(self, node_id: str):
+        """Checkpoint a node after changing its state directly."""
+        if node_id in self.nodes:
+            self._persist_node(self.nodes[node_id])
+    
     def add_node(self, node: WorkflowNode) -> str:
         """
         Add a node to the workflow graph.
         
+        Dependencies already listed on the node are linked as edges; those
+        naming nodes not yet in the graph block the node until added.
+        
         Args:
             node: WorkflowNode to add
             
         Returns:
             Node ID
         """
+        if node.id in self.nodes:
+            self.remove_node(node.id)
+        
         self.nodes[node.id] = node
-        if node.id not in self.edges:
-            self.edges[node.id] = set()
+        self.edges[node.id] = set()
+        self._predecessors[node.id] = set()
+        
+        for dependency_id in node.dependencies:
+            if dependency_id in self.nodes:
+                self.edges[dependency_id].add(node.id)
+                self._predecessors[node.id].add(dependency_id)
+                self.nodes[dependency_id].dependents.add(node.id)
+            else:
+                self._unresolved.setdefault(dependency_id, set()).add(node.id)
+        # Every declared dependency counts, resolved or not
+        self._in_degree[node.id] = len(node.dependencies)
+        
+        for waiting_id in self._unresolved.pop(node.id, ()):
+            self.edges[node.id].add(waiting_id)
+            self._predecessors[waiting_id].add(node.id)
+            node.dependents.add(waiting_id)
+        for dependent_id in list(node.dependents):
+            if dependent_id in self.nodes and dependent_id != node.id:
+                self._link(node.id, dependent_id)
+        
+        if self.checkpoint_store is not None:
+            node._listener = self._persist_node
+            self._persist_node(node)
         
         logger.debug(f"Added node {node.id} ({node.node_label}) to workflow {self.workflow_id}")
         return node.id
     
+    def _link(self, from_node_id: str, to_node_id: str):
+        """Record an edge in the adjacency sets, nodes and in-degree counter."""
+        self.edges[from_node_id].add(to_node_id)
+        self._predecessors[to_node_id].add(from_node_id)
+        self.nodes[from_node_id].dependents.add(to_node_id)
+        
+        target = self.nodes[to_node_id]
+        if from_node_id not in target.dependencies:
+            target.dependencies.add(from_node_id)
+            self._in_degree[to_node_id] += 1
+            self._persist_node(target)
+    
     def add_edge(self, from_node_id: str, to_node_id: str):
         """
         Add an edge (dependency) between nodes.
@@ -191,35 +335,56 @@ class DynamicWorkflowGraph:
         if from_node_id not in self.nodes or to_node_id not in self.nodes:
             raise ValueError(f"Cannot add edge: nodes {from_node_id} or {to_node_id} not found")
         
-        # Add edge in adjacency list
-        self.edges[from_node_id].add(to_node_id)
-        
-        # Update node dependencies
-        self.nodes[to_node_id].dependencies.add(from_node_id)
-        self.nodes[from_node_id].dependents.add(to_node_id)
+        self._link(from_node_id, to_node_id)
         
         logger.debug(f"Added edge {from_node_id} -> {to_node_id} in workflow {self.workflow_id}")
     
+    def remove_edge(self, from_node_id: str, to_node_id: str):
+        """Remove the dependency of one node on another, if present."""
+        if from_node_id not in self.nodes or to_node_id not in self.nodes:
+            return
+        
+        self.edges[from_node_id].discard(to_node_id)
+        self._predecessors[to_node_id].discard(from_node_id)
+        self.nodes[from_node_id].dependents.discard(to_node_id)
+        
+        target = self.nodes[to_node_id]
+        if from_node_id in target.dependencies:
+            target.dependencies.discard(from_node_id)
+            self._in_degree[to_node_id] -= 1
+            self._persist_node(target)
+    
     def remove_node(self, node_id: str):
         """Remove a node and all its edges."""
         if node_id not in self.nodes:
             return
         
-        # Remove all edges involving this node
-        for other_id in list(self.edges.keys()):
-            self.edges[other_id].discard(node_id)
-            if other_id in self.nodes:
-                self.nodes[other_id].dependencies.discard(node_id)
-                self.nodes[other_id].dependents.discard(node_id)
-        
-        # Remove from dependencies/dependents of other nodes
-        for other_node in self.nodes.values():
-            other_node.dependencies.discard(node_id)
-            other_node.dependents.discard(node_id)
+        # Only the node's own neighbours need updating
+        for dependent_id in self.edges.pop(node_id):
+            self._predecessors[dependent_id].discard(node_id)
+            dependent = self.nodes[dependent_id]
+            if node_id in dependent.dependencies:
+                dependent.dependencies.discard(node_id)
+                self._in_degree[dependent_id] -= 1
+                self._persist_node(dependent)
+        for dependency_id in self._predecessors.pop(node_id):
+            self.edges[dependency_id].discard(node_id)
+            self.nodes[dependency_id].dependents.discard(node_id)
+        for dependency_id in self.nodes[node_id].dependencies:
+            waiting = self._unresolved.get(dependency_id)
+            if waiting is not None:
+                waiting.discard(node_id)
+                if not waiting:
+                    del self._unresolved[dependency_id]
         
         # Remove the node itself
-        del self.nodes[node_id]
-        del self.edges[node_id]
+        del self._in_degree[node_id]
+        self.nodes.pop(node_id)._listener = None
+        if self.checkpoint_store is not None:
+            try:
+                self.checkpoint_store.delete_node(self.workflow_id, node_id)
+            except Exception as e:
+                logger.error(f"Failed to delete checkpoint of node {node_id}: {e}")
         
         logger.debug(f"Removed node {node_id} from workflow {self.workflow_id}")
     
@@ -264,51 +429,61 @@ class DynamicWorkflowGraph:
         Returns:
             List of layers, each containing node IDs that can execute in parallel
         """
-        remaining_nodes = set(self.nodes.keys())
-        completed_nodes = set()
+        execution_layers, unresolved = self._plan_layers()
+        if unresolved:
+            # Circular dependency or other issue
+            logger.error(f"Cannot resolve execution order for nodes: {unresolved}")
+        return execution_layers
+    
+    def _plan_layers(self):
+        """Kahn's algorithm by layers; returns the layers and any nodes left in cycles."""
+        in_degree = dict(self._in_degree)
+        layer = [node_id for node_id, degree in in_degree.items() if degree == 0]
         execution_layers = []
+        planned = 0
         
-        while remaining_nodes:
-            # Find nodes that can execute now
-            executable_now = []
-            for node_id in remaining_nodes:
-                node = self.nodes[node_id]
-                if node.can_execute(completed_nodes):
-                    executable_now.append(node_id)
-            
-            if not executable_now:
-                # Circular dependency or other issue
-                logger.error(f"Cannot resolve execution order for nodes: {remaining_nodes}")
-                break
-            
-            execution_layers.append(executable_now)
-            completed_nodes.update(executable_now)
-            remaining_nodes.difference_update(executable_now)
+        while layer:
+            execution_layers.append(layer)
+            planned += len(layer)
+            next_layer = []
+            for node_id in layer:
+                for dependent_id in self.edges[node_id]:
+                    in_degree[dependent_id] -= 1
+                    if in_degree[dependent_id] == 0:
+                        next_layer.append(dependent_id)
+            layer = next_layer
         
-        return execution_layers
+        unresolved = set()
+        if planned < len(self.nodes):
+            unresolved = {node_id for node_id, degree in in_degree.items() if degree > 0}
+        return execution_layers, unresolved
     
     def start_workflow(self):
         """Start workflow execution."""
         self.state = WorkflowState.RUNNING
         self.started_at = datetime.now()
+        self._persist_workflow()
         logger.info(f"Started workflow {self.workflow_id}")
     
     def pause_workflow(self, paused_node_id: Optional[str] = None):
         """Pause workflow execution."""
         self.state = WorkflowState.PAUSED
         self.paused_node_id = paused_node_id
+        self._persist_workflow()
         logger.info(f"Paused workflow {self.workflow_id} at node {paused_node_id}")
     
     def resume_workflow(self):
         """Resume workflow execution."""
         if self.state == WorkflowState.PAUSED:
             self.state = WorkflowState.RUNNING
+            self._persist_workflow()
             logger.info(f"Resumed workflow {self.workflow_id}")
     
     def complete_workflow(self):
         """Mark workflow as completed."""
         self.state = WorkflowState.COMPLETED
         self.completed_at = datetime.now()
+        self._persist_workflow()
         logger.info(f"Completed workflow {self.workflow_id}")
     
     def fail_workflow(self, error: str):
@@ -316,6 +491,7 @@ class DynamicWorkflowGraph:
         self.state = WorkflowState.FAILED
         self.completed_at = datetime.now()
         self.metadata['error'] = error
+        self._persist_workflow()
         logger.error(f"Failed workflow {self.workflow_id}: {error}")
     
     def get_workflow_stats(self) -> Dict[str, Any]:
@@ -326,6 +502,8 @@ class DynamicWorkflowGraph:
                 1 for node in self.nodes.values() if node.state == state
             )
         
+        execution_layers, unresolved = self._plan_layers()
+        
         return {
             'workflow_id': self.workflow_id,
             'state': self.state.value,
@@ -335,35 +513,14 @@ class DynamicWorkflowGraph:
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'paused_node_id': self.paused_node_id,
-            'has_cycles': self._has_cycles(),
-            'execution_layers': len(self.get_execution_plan())
+            'has_cycles': bool(unresolved),
+            'execution_layers': len(execution_layers)
         }
     
     def _has_cycles(self) -> bool:
-        """Check if the graph has cycles using DFS."""
-        visited = set()
-        rec_stack = set()
-        
-        def has_cycle_util(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            for neighbor in self.edges.get(node_id, []):
-                if neighbor not in visited:
-                    if has_cycle_util(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            
-            rec_stack.remove(node_id)
-            return False
-        
-        for node_id in self.nodes.keys():
-            if node_id not in visited:
-                if has_cycle_util(node_id):
-                    return True
-        
-        return False
+        """Check if the graph has cycles (nodes Kahn's algorithm cannot order)."""
+        _, unresolved = self._plan_layers()
+        return bool(unresolved)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert workflow to dictionary representation."""
@@ -379,6 +536,58 @@ class DynamicWorkflowGraph:
             'edges': {node_id: list(edges) for node_id, edges in self.edges.items()},
             'stats': self.get_workflow_stats()
         }
+    
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Convert workflow-level state to a checkpoint record (nodes are stored separately)."""
+        return {
+            'workflow_id': self.workflow_id,
+            'state': self.state.value,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'paused_node_id': self.paused_node_id,
+            'execution_order': self.execution_order,
+            'metadata': self.metadata
+        }
+    
+    @classmethod
+    def restore(cls, checkpoint_store: CheckpointStore, workflow_id: str) -> Optional['DynamicWorkflowGraph']:
+        """
+        Rebuild a workflow from its checkpoints.
+        
+        Completed, failed and skipped nodes keep their results; nodes that
+        were running are reset to pending. The restored graph stays attached
+        to the store.
+        
+        Args:
+            checkpoint_store: Store the workflow was checkpointed to
+            workflow_id: Workflow to restore
+            
+        Returns:
+            Restored graph, or None if the store has no such workflow
+        """
+        data = checkpoint_store.load_workflow(workflow_id)
+        if data is None:
+            return None
+        
+        record = data['workflow']
+        graph = cls(workflow_id)
+        for node_record in data['nodes']:
+            graph.add_node(WorkflowNode.from_checkpoint(node_record))
+        
+        graph.state = WorkflowState(record['state'])
+        graph.created_at = datetime.fromisoformat(record['created_at'])
+        graph.started_at = datetime.fromisoformat(record['started_at']) if record.get('started_at') else None
+        graph.completed_at = datetime.fromisoformat(record['completed_at']) if record.get('completed_at') else None
+        graph.paused_node_id = record.get('paused_node_id')
+        graph.execution_order = list(record.get('execution_order') or [])
+        graph.metadata = record.get('metadata') or {}
+        graph.metadata['restored_at'] = datetime.now().isoformat()
+        graph.attach_checkpoint_store(checkpoint_store)
+        
+        completed = sum(1 for node in graph.nodes.values() if node.state == NodeState.COMPLETED)
+        logger.info(f"Restored workflow {workflow_id} with {completed}/{len(graph.nodes)} nodes completed")
+        return graph
 
 
 class WorkflowManager:
@@ -390,10 +599,17 @@ class WorkflowManager:
     - Session-based workflow isolation
     - Workflow templates and patterns
     - Performance monitoring
+    - Optional durable checkpointing and restore
     """
     
-    def __init__(self):
-        """Initialize workflow manager."""
+    def __init__(self, checkpoint_store: Optional[CheckpointStore] = None):
+        """
+        Initialize workflow manager.
+        
+        Args:
+            checkpoint_store: Optional store new workflows are checkpointed to
+        """
+        self.checkpoint_store = checkpoint_store
         self.workflows: Dict[str, DynamicWorkflowGraph] = {}
         self.session_workflows: Dict[str, List[str]] = {}  # session_id -> [workflow_ids]
         self.active_workflows: Set[str] = set()
@@ -402,16 +618,30 @@ class WorkflowManager:
     
     def create_workflow(self, session_id: str, workflow_id: Optional[str] = None) -> DynamicWorkflowGraph:
         """Create a new workflow for a session."""
-        workflow = DynamicWorkflowGraph(workflow_id)
+        workflow = DynamicWorkflowGraph(workflow_id, checkpoint_store=self.checkpoint_store)
+        self._register(session_id, workflow)
+        
+        logger.info(f"Created workflow {workflow.workflow_id} for session {session_id}")
+        return workflow
+    
+    def restore_workflow(self, session_id: str, workflow_id: str) -> Optional[DynamicWorkflowGraph]:
+        """Restore a checkpointed workflow into a session, if the store has it."""
+        if workflow_id in self.workflows:
+            return self.workflows[workflow_id]
+        if self.checkpoint_store is None:
+            return None
         
+        workflow = DynamicWorkflowGraph.restore(self.checkpoint_store, workflow_id)
+        if workflow is not None:
+            self._register(session_id, workflow)
+        return workflow
+    
+    def _register(self, session_id: str, workflow: DynamicWorkflowGraph):
         self.workflows[workflow.workflow_id] = workflow
         
         if session_id not in self.session_workflows:
             self.session_workflows[session_id] = []
         self.session_workflows[session_id].append(workflow.workflow_id)
-        
-        logger.info(f"Created workflow {workflow.workflow_id} for session {session_id}")
-        return workflow
     
     def get_workflow(self, workflow_id: str) -> Optional[DynamicWorkflowGraph]:
         """Get workflow by ID."""
@@ -430,6 +660,8 @@ class WorkflowManager:
                 if workflow_id in self.workflows:
                     del self.workflows[workflow_id]
                 self.active_workflows.discard(workflow_id)
+                if self.checkpoint_store is not None:
+                    self.checkpoint_store.delete_workflow(workflow_id)
             
             del self.session_workflows[session_id]
             logger.info(f"Cleaned up {len(workflow_ids)} workflows for session {session_id}")
@@ -449,5 +681,8 @@ class WorkflowManager:
         }
 
 
-# Global workflow manager instance
-workflow_manager = WorkflowManager()
\ No newline at end of file
+# Global workflow manager instance; set WORKFLOW_CHECKPOINT_DB to checkpoint to SQLite
+_checkpoint_db = os.getenv('WORKFLOW_CHECKPOINT_DB')
+workflow_manager = WorkflowManager(
+    checkpoint_store=SQLiteCheckpointStore(_checkpoint_db) if _checkpoint_db else None
+)
\ No newline at end of file
@@ -0,0 +1,187 @@
+# ABOUTME: ASGI middleware adding JSON-RPC 2.0 batch support to A2A agent servers
+# ABOUTME: Splits batch arrays into single calls, runs them concurrently and merges replies
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _jsonrpc_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message}
+    }
+
+
+class JSONRPCBatchMiddleware:
+    """
+    Accept JSON-RPC 2.0 batch arrays in front of a single-request handler.
+
+    A POST whose body is a JSON array is split into its calls, each call is
+    dispatched to the wrapped application as an ordinary request, and the
+    replies are returned as one array. Calls run concurrently, bounded by
+    ``max_concurrency``. Notifications (calls without an ``id``) get no
+    entry in the reply, as the specification requires. All other requests
+    pass through untouched.
+    """
+
+    def __init__(self, app, max_batch_size: int = 100, max_concurrency: int = 16):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application handling single JSON-RPC calls
+            max_batch_size: Largest accepted batch
+            max_concurrency: Calls of one batch executed at the same time
+        """
+        self.app = app
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        body, more_messages = await self._read_body(receive)
+        if not body.lstrip().startswith(b"["):
+            await self.app(scope, self._replay(body, more_messages, receive), send)
+            return
+
+        try:
+            calls = json.loads(body)
+        except json.JSONDecodeError:
+            await self._send_json(send, _jsonrpc_error(None, -32700, "Parse error"))
+            return
+
+        if not calls:
+            await self._send_json(send, _jsonrpc_error(None, -32600, "Invalid Request: empty batch"))
+            return
+        if len(calls) > self.max_batch_size:
+            await self._send_json(
+                send,
+                _jsonrpc_error(None, -32600, f"Invalid Request: batch larger than {self.max_batch_size}")
+            )
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await self._dispatch_call(scope, call)
+
+        replies = await asyncio.gather(*(run(call) for call in calls))
+        replies = [reply for reply in replies if reply is not None]
+
+        if not replies:
+            # Batch of notifications only
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await self._send_json(send, replies)
+
+    async def _dispatch_call(self, scope, call: Any) -> Optional[Dict[str, Any]]:
+        """Run one call of a batch through the wrapped app and decode its reply."""
+        if not isinstance(call, dict):
+            return _jsonrpc_error(None, -32600, "Invalid Request")
+
+        request_id = call.get("id")
+        is_notification = "id" not in call
+        payload = json.dumps(call).encode()
+
+        headers = [
+            (name, value) for name, value in scope.get("headers", [])
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(payload)).encode()))
+        call_scope = dict(scope, headers=headers)
+
+        try:
+            status, body = await self._run_app(call_scope, payload)
+        except Exception as e:
+            # One failing call must not take down the replies of the others
+            logger.error(f"Batch call {request_id} raised: {e}", exc_info=True)
+            return None if is_notification else _jsonrpc_error(request_id, -32603, f"Internal error: {e}")
+
+        if is_notification:
+            return None
+        try:
+            reply = json.loads(body) if body else None
+        except json.JSONDecodeError:
+            reply = None
+        if not isinstance(reply, dict):
+            logger.warning(f"Batch call {request_id} returned non JSON-RPC reply (HTTP {status})")
+            return _jsonrpc_error(request_id, -32603, f"Internal error: HTTP {status}")
+        return reply
+
+    async def _run_app(self, scope, payload: bytes) -> Tuple[int, bytes]:
+        """Invoke the wrapped app with a fixed body and capture its response."""
+        sent = False
+        status = 500
+        chunks: List[bytes] = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnected.set()
+        return status, b"".join(chunks)
+
+    @staticmethod
+    async def _read_body(receive) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """Read the full request body, keeping any trailing non-body messages."""
+        chunks = []
+        extra = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                extra.append(message)
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks), extra
+
+    @staticmethod
+    def _replay(body: bytes, extra: List[Dict[str, Any]], receive):
+        """Build a receive callable that yields an already-read body first."""
+        pending = [{"type": "http.request", "body": body, "more_body": False}] + extra
+
+        async def replay():
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        return replay
+
+    @staticmethod
+    async def _send_json(send, content: Any, status: int = 200):
+        body = json.dumps(content).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -24,11 +24,14 @@ This provides the best of both worlds:
 """
 
 import logging
+import hashlib
 import json
 import asyncio
+import uuid
 import warnings
+from collections import deque
 from collections.abc import AsyncIterable
-from typing import Dict, Any, List, Literal, Optional
+from typing import Callable, Dict, Any, List, Literal, Optional, Sequence
 from datetime import datetime
 
 from a2a_mcp.common.standardized_agent_base import StandardizedAgentBase
@@ -50,6 +53,14 @@ from a2a_mcp.common.enhanced_workflow import (
     NodeState,
     workflow_manager
 )
+from a2a_mcp.common.workflow_checkpoint import CheckpointStore
+from a2a_mcp.common.admission_control import AdmissionController
+from a2a_mcp.common.artifact_index import ArtifactIndex
+from a2a_mcp.common.artifact_content_store import ArtifactContentStore
+from a2a_mcp.common.artifact_relationships import ArtifactRelationshipIndex
+from a2a_mcp.common.session_state import BoundedStateCache, SessionArchive, estimate_size
+from a2a_mcp.common.embeddings import deterministic_embedding
+from a2a_mcp.common.vector_index import VectorIndex
 
 # Observability imports
 try:
@@ -89,6 +100,17 @@ import os
 # Get structured logger
 logger = get_logger(__name__) if OBSERVABILITY_ENABLED else logging.getLogger(__name__)
 
+# Bounds on per-session state kept in memory; None disables a limit.
+# ttl_seconds is idle time since an entry was last read or written through its
+# store; streaming sessions are pinned while the stream runs.
+DEFAULT_SESSION_STATE_LIMITS: Dict[str, Dict[str, Any]] = {
+    'session_contexts': {'max_entries': 1000, 'ttl_seconds': 24 * 3600, 'max_bytes': None},
+    'execution_history': {'max_entries': 1000, 'ttl_seconds': 24 * 3600, 'max_bytes': 64 * 1024 * 1024},
+    'artifact_store': {'max_entries': 10000, 'ttl_seconds': None, 'max_bytes': None},
+    'streaming_sessions': {'max_entries': 256, 'ttl_seconds': 300.0, 'max_bytes': None},
+    'coordination_history': {'max_entries': 1000}
+}
+
 class MasterOrchestratorTemplate(StandardizedAgentBase):
     """
     Refactored Master Orchestrator Template - Framework V2.0
@@ -123,7 +145,19 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         planning_instructions: Optional[str] = None,
         synthesis_prompt: Optional[str] = None,
         enable_parallel: bool = True,
-        enable_dynamic_workflow: bool = True
+        enable_dynamic_workflow: bool = True,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        max_concurrent_tasks: Optional[int] = None,
+        per_agent_concurrency: Optional[Dict[str, int]] = None,
+        default_agent_concurrency: Optional[int] = None,
+        artifact_spill_dir: Optional[str] = None,
+        artifact_spill_threshold: int = 256 * 1024,
+        session_state_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        session_archive_dir: Optional[str] = None,
+        qa_embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        qa_embedding_dimension: int = 256,
+        qa_similarity_threshold: float = 0.4,
+        qa_knowledge_base_limit: int = 10000
     ):
         """
         Initialize refactored Master Orchestrator that delegates planning to Enhanced Planner.
@@ -138,6 +172,22 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             synthesis_prompt: Domain-specific synthesis prompt (optional)
             enable_parallel: Enable parallel execution of independent tasks
             enable_dynamic_workflow: Enable dynamic workflow graph capabilities (Phase 1)
+            checkpoint_store: Durable store for workflow progress and pause checkpoints
+                (defaults to the workflow manager's store, if any)
+            max_concurrent_tasks: Limit on tasks in flight at once (None for no limit)
+            per_agent_concurrency: Limit on tasks in flight per specialist agent
+            default_agent_concurrency: Limit for specialists not in per_agent_concurrency (None for no limit)
+            artifact_spill_dir: Directory for large artifact payloads (kept in memory when None)
+            artifact_spill_threshold: Payloads of at least this many bytes are spilled to disk
+            session_state_limits: Per-store overrides of DEFAULT_SESSION_STATE_LIMITS
+                (max_entries, ttl_seconds, max_bytes)
+            session_archive_dir: Directory where evicted session state is archived
+                (discarded when None)
+            qa_embed_fn: Embeds a question into a vector of qa_embedding_dimension floats
+                (deterministic local embedding when None)
+            qa_embedding_dimension: Length of question vectors
+            qa_similarity_threshold: Minimum cosine similarity of a similar question
+            qa_knowledge_base_limit: Maximum stored Q&A entries; the oldest are dropped
         """
         init_api_key()
         
@@ -155,6 +205,13 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             content_types=['text', 'text/plain'],
         )
         
+        # Bounded session state; evicted entries are optionally archived to disk
+        self.session_state_limits = {
+            store: {**limits, **((session_state_limits or {}).get(store) or {})}
+            for store, limits in DEFAULT_SESSION_STATE_LIMITS.items()
+        }
+        self.session_archive = SessionArchive(session_archive_dir) if session_archive_dir else None
+        
         # Core configuration
         self.domain_name = domain_name
         self.domain_description = domain_description
@@ -162,6 +219,13 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         self.enable_parallel = enable_parallel
         self.enable_dynamic_workflow = enable_dynamic_workflow
         
+        # Optionally bounds concurrent tasks overall and per specialist; excess tasks queue
+        self.task_admission = AdmissionController(
+            max_concurrency=max_concurrent_tasks,
+            per_agent_limits=per_agent_concurrency,
+            default_agent_limit=default_agent_concurrency
+        )
+        
         # Initialize Enhanced Planner Agent for all planning tasks
         planning_mode = 'sophisticated'  # Always use sophisticated mode for enterprise features
         self.planner = EnhancedGenericPlannerAgent(
@@ -182,7 +246,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         # Execution tracking (legacy)
         self.active_agents = {}
         self.execution_context = {}
-        self.coordination_history = []
+        self.coordination_history = deque(maxlen=self.session_state_limits['coordination_history']['max_entries'])
         self.workflow_graph = None
         
         # Enhanced workflow capabilities (Phase 1)
@@ -190,8 +254,8 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         self.current_session_id: Optional[str] = None
         
         # PHASE 2: Context & History Tracking
-        self.session_contexts: Dict[str, Dict[str, Any]] = {}  # session_id -> context data
-        self.execution_history: Dict[str, List[Dict[str, Any]]] = {}  # session_id -> execution records
+        self.session_contexts = self._bounded_state('session_contexts')  # session_id -> context data
+        self.execution_history = self._bounded_state('execution_history')  # session_id -> execution records
         self.domain_context: Dict[str, Any] = {}  # Persistent domain-specific context
         self.context_evolution: List[Dict[str, Any]] = []  # Track context changes over time
         self.query_patterns: Dict[str, int] = {}  # Track query patterns for intelligence
@@ -206,18 +270,29 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         self.pause_checkpoints: Dict[str, List[Dict[str, Any]]] = {}  # session_id -> checkpoints
         self.state_transitions: List[Dict[str, Any]] = []  # Track state transition events
         self.resumption_strategies: Dict[str, str] = {}  # session_id -> resumption strategy
+        self.checkpoint_store: Optional[CheckpointStore] = (
+            checkpoint_store if checkpoint_store is not None else workflow_manager.checkpoint_store
+        )
         
         # PHASE 4: Artifact Management & Result Collection
-        self.artifact_store: Dict[str, Dict[str, Any]] = {}  # artifact_id -> artifact data
+        self.artifact_store = self._bounded_state('artifact_store')  # artifact_id -> artifact metadata
+        self.artifact_contents = ArtifactContentStore(  # content_hash -> deduplicated payload
+            spill_dir=artifact_spill_dir,
+            spill_threshold=artifact_spill_threshold
+        )
         self.session_artifacts: Dict[str, List[str]] = {}  # session_id -> [artifact_ids]
         self.task_artifacts: Dict[str, List[str]] = {}  # task_id -> [artifact_ids]
-        self.artifact_relationships: Dict[str, List[str]] = {}  # artifact_id -> [related_artifact_ids]
+        self.artifact_relationships = ArtifactRelationshipIndex()  # artifact_id -> related ids (adjacency sets)
         self.result_collections: Dict[str, Dict[str, Any]] = {}  # collection_id -> collection metadata
-        self.artifact_search_index: Dict[str, List[str]] = {}  # keyword -> [artifact_ids]
+        self.artifact_search_index = ArtifactIndex()  # term -> artifact postings, BM25 ranked
         self.artifact_templates: Dict[str, Dict[str, Any]] = {}  # template_name -> template config
         
         # PHASE 5: Intelligent Q&A based on Domain Context
         self.qa_knowledge_base: Dict[str, Dict[str, Any]] = {}  # question_id -> qa_entry
+        self.qa_knowledge_base_limit = qa_knowledge_base_limit
+        self.qa_embed_fn = qa_embed_fn or (lambda text: deterministic_embedding(text, qa_embedding_dimension))
+        self.qa_question_index = VectorIndex(qa_embedding_dimension)  # question_id -> question vector (LSH)
+        self.qa_similarity_threshold = qa_similarity_threshold
         self.domain_knowledge: Dict[str, Any] = {}  # Accumulated domain knowledge
         self.qa_patterns: Dict[str, int] = {}  # question_pattern -> frequency
         self.context_vectors: Dict[str, List[float]] = {}  # context_id -> vector representation
@@ -231,7 +306,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         self.summary_analytics: Dict[str, Any] = {}  # Analytics on summary generation patterns
         
         # PHASE 7: Workflow Streaming with Artifact Events
-        self.streaming_sessions: Dict[str, Dict[str, Any]] = {}  # streaming_session_id -> session data
+        self.streaming_sessions = self._bounded_state('streaming_sessions')  # streaming_session_id -> session data
         self.stream_buffer_size: int = 100  # Maximum events to buffer
         self.stream_timeout: float = 300.0  # 5 minute timeout for streaming sessions
         self.artifact_stream_config: Dict[str, Any] = {
@@ -662,10 +737,10 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         return results
 
     async def _coordinate_parallel_execution(self, tasks: List[dict], sessionId: str) -> List[dict]:
-        """Coordinate parallel task execution."""
+        """Coordinate parallel task execution, admitting tasks through the concurrency limits."""
         # Create coroutines for parallel execution
         task_coroutines = [
-            self._coordinate_single_task(task, sessionId) 
+            self._coordinate_admitted_task(task, sessionId) 
             for task in tasks
         ]
         
@@ -687,24 +762,138 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         return processed_results
 
     async def _coordinate_hybrid_execution(self, tasks: List[dict], sessionId: str) -> List[dict]:
-        """Coordinate hybrid execution (parallel batches in sequence)."""
-        # Group tasks by dependencies
-        independent_tasks = [t for t in tasks if not t.get('dependencies', [])]
-        dependent_tasks = [t for t in tasks if t.get('dependencies', [])]
-        
-        results = []
+        """
+        Coordinate hybrid execution from the task dependency edges.
         
-        # Execute independent tasks in parallel
-        if independent_tasks:
-            parallel_results = await self._coordinate_parallel_execution(independent_tasks, sessionId)
-            results.extend(parallel_results)
+        Each task starts as soon as all of its own prerequisites have
+        finished, so independent chains progress side by side and dependent
+        tasks without an edge between them run concurrently. Dependencies on
+        IDs outside the plan are ignored; tasks caught in a dependency cycle
+        run sequentially at the end. Results are returned in plan order.
+        """
+        task_ids = [str(task.get('id', f'task_{i}')) for i, task in enumerate(tasks)]
+        position = {task_id: i for i, task_id in enumerate(task_ids)}
+        dependents: Dict[int, List[int]] = {i: [] for i in range(len(tasks))}
+        remaining: Dict[int, int] = {}
+        
+        for i, task in enumerate(tasks):
+            prerequisites = set()
+            for dependency in task.get('dependencies') or []:
+                prerequisite = position.get(str(dependency))
+                if prerequisite is None:
+                    logger.warning(f"Task {task_ids[i]} depends on unknown task {dependency}; ignoring")
+                elif prerequisite != i:
+                    prerequisites.add(prerequisite)
+            remaining[i] = len(prerequisites)
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(i)
+        
+        results: List[Optional[dict]] = [None] * len(tasks)
+        running: Dict[asyncio.Task, int] = {}
+        
+        def start(index: int):
+            coroutine = self._coordinate_admitted_task(tasks[index], sessionId)
+            running[asyncio.create_task(coroutine)] = index
+        
+        for i in range(len(tasks)):
+            if remaining[i] == 0:
+                start(i)
         
-        # Execute dependent tasks sequentially
-        if dependent_tasks:
-            sequential_results = await self._coordinate_sequential_execution(dependent_tasks, sessionId)
-            results.extend(sequential_results)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    index = running.pop(finished)
+                    results[index] = self._hybrid_task_result(tasks[index].get('id', f'task_{index}'), finished)
+                    for dependent in dependents[index]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            start(dependent)
+        finally:
+            for pending in running:
+                pending.cancel()
+        
+        for index, result in enumerate(results):
+            if result is None:
+                logger.warning(f"Task {task_ids[index]} is in a dependency cycle; running it sequentially")
+                try:
+                    results[index] = await self._coordinate_admitted_task(tasks[index], sessionId)
+                except Exception as e:
+                    results[index] = {
+                        'task_id': tasks[index].get('id', f'task_{index}'),
+                        'status': 'error',
+                        'error': str(e)
+                    }
+                self.coordination_history.append({
+                    'task_id': task_ids[index],
+                    'status': results[index].get('status'),
+                    'timestamp': datetime.now().isoformat()
+                })
         
         return results
+    
+    def _hybrid_task_result(self, task_id: Any, finished: asyncio.Task) -> dict:
+        """Turn a finished hybrid task into its result dict and record it in the history."""
+        if finished.exception() is not None:
+            result = {'task_id': task_id, 'status': 'error', 'error': str(finished.exception())}
+        else:
+            result = finished.result()
+        
+        self.coordination_history.append({
+            'task_id': task_id,
+            'status': result.get('status'),
+            'timestamp': datetime.now().isoformat()
+        })
+        return result
+
+    async def _coordinate_admitted_task(self, task: dict, sessionId: str) -> dict:
+        """Run a task once its specialist has a free slot, recording the queue time."""
+        specialist = task.get('agent_type', 'generalist')
+        async with self.task_admission.slot(specialist) as queue_time:
+            result = await self._coordinate_single_task(task, sessionId)
+        result['queue_time'] = queue_time
+        if queue_time:
+            record_metric('task_queue_time_seconds', queue_time, {'specialist': specialist})
+        return result
+    
+    def get_concurrency_metrics(self) -> Dict[str, Any]:
+        """Get admission control metrics: in-flight tasks, queue lengths and queue times."""
+        return self.task_admission.get_metrics()
+    
+    def _bounded_state(self, store: str) -> BoundedStateCache:
+        """Create a bounded per-session store with its configured limits."""
+        limits = self.session_state_limits[store]
+        return BoundedStateCache(
+            store,
+            max_entries=limits.get('max_entries'),
+            ttl_seconds=limits.get('ttl_seconds'),
+            max_bytes=limits.get('max_bytes'),
+            on_evict=self._on_session_state_evicted
+        )
+    
+    def _on_session_state_evicted(self, store: str, key: str, value: Any, reason: str):
+        """Archive an evicted entry and release anything that referenced it."""
+        record_metric('session_state_evictions_total', 1, {'store': store, 'reason': reason})
+        if self.session_archive is not None:
+            archived = self._with_content(value) if store == 'artifact_store' else value
+            self.session_archive(store, key, archived, reason)
+        if store == 'artifact_store':
+            self._release_artifact_references(key, value)
+        logger.debug(f"Evicted {store}[{key}] ({reason})")
+    
+    def get_session_state_metrics(self) -> Dict[str, Any]:
+        """Get hit, eviction and resident size metrics for bounded session state."""
+        metrics = {}
+        for store in (self.session_contexts, self.execution_history, self.artifact_store, self.streaming_sessions):
+            metrics[store.name] = store.get_metrics()
+            if metrics[store.name]['resident_bytes'] is not None:
+                record_metric('memory_usage_bytes', metrics[store.name]['resident_bytes'], {'component': store.name})
+        metrics['coordination_history'] = {
+            'entries': len(self.coordination_history),
+            'max_entries': self.coordination_history.maxlen
+        }
+        metrics['archived_entries'] = self.session_archive.archived if self.session_archive else 0
+        return metrics
 
     @trace_async("coordinate_single_task")
     @measure_performance("task_duration_seconds")
@@ -875,6 +1064,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         
         # Update global query patterns
         self.query_patterns[query_type] = self.query_patterns.get(query_type, 0) + 1
+        self.session_contexts.update_size(session_id)
         
         logger.debug("Initialized session context",
                     session_id=session_id,
@@ -926,6 +1116,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         }
         
         self.execution_history[session_id].append(enhanced_record)
+        self.execution_history.adjust_size(session_id, estimate_size(enhanced_record))
         
         # Update session performance metrics
         self._update_session_performance(session_id, enhanced_record)
@@ -1089,7 +1280,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             'query_type': self._classify_query_type(execution_record['query']),
             'complexity_change': self._detect_complexity_change(session_id, execution_record),
             'new_patterns': self._detect_new_patterns(execution_record),
-            'context_version': self.session_contexts[session_id]['context_version']
+            'context_version': self.session_contexts.get(session_id, {}).get('context_version', 1)
         }
         
         self.context_evolution.append(evolution_entry)
@@ -1586,6 +1777,13 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         if len(self.pause_checkpoints[session_id]) > 10:
             self.pause_checkpoints[session_id] = self.pause_checkpoints[session_id][-10:]
         
+        # Survive restarts: the store keeps its own last N per session
+        if self.checkpoint_store is not None:
+            try:
+                self.checkpoint_store.save_checkpoint(session_id, checkpoint)
+            except Exception as e:
+                logger.error(f"Failed to persist checkpoint {checkpoint['checkpoint_id']}: {e}")
+        
         logger.debug(f"Created execution checkpoint {checkpoint['checkpoint_id']} for session {session_id}")
     
     def _capture_workflow_state(self) -> Dict[str, Any]:
@@ -1717,6 +1915,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
                     node.completed_at = None
                     node.result = None
                     node.error = None
+                    self.dynamic_workflow.record_node(node.id)
             
             # Reset workflow state
             self.dynamic_workflow.state = WorkflowState.RUNNING
@@ -1735,6 +1934,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
                 # Mark paused node as skipped
                 paused_node.state = NodeState.SKIPPED
                 paused_node.completed_at = datetime.now()
+                self.dynamic_workflow.record_node(paused_node.id)
                 
                 # Clear pause state
                 self.dynamic_workflow.paused_node_id = None
@@ -1746,6 +1946,12 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
     
     def _resume_rollback_strategy(self, session_id: str) -> bool:
         """Rollback to previous checkpoint and resume."""
+        if not self.pause_checkpoints.get(session_id) and self.checkpoint_store is not None:
+            # After a restart only the durable store still has the checkpoints
+            persisted = self.checkpoint_store.load_checkpoints(session_id)
+            if persisted:
+                self.pause_checkpoints[session_id] = persisted
+        
         if session_id in self.pause_checkpoints and self.pause_checkpoints[session_id]:
             # Get most recent checkpoint
             checkpoint = self.pause_checkpoints[session_id][-1]
@@ -1757,6 +1963,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             # Restore session context
             if session_id in self.session_contexts:
                 self.session_contexts[session_id].update(checkpoint['session_context_snapshot'])
+                self.session_contexts.update_size(session_id)
             
             self.resumption_strategies[session_id] = 'rollback'
             logger.debug(f"Applied rollback strategy for session {session_id}")
@@ -1772,6 +1979,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             'current_state': self.execution_states.get(session_id, {}).get('current_state', 'unknown'),
             'workflow_state': self._capture_workflow_state(),
             'available_checkpoints': len(self.pause_checkpoints.get(session_id, [])),
+            'durable_checkpoints': self.checkpoint_store is not None,
             'state_transitions': len(self.execution_states.get(session_id, {}).get('state_history', [])),
             'resumption_strategy': self.resumption_strategies.get(session_id),
             'can_resume': self._validate_resumption_conditions(session_id) if session_id in self.execution_states else False,
@@ -1952,23 +2160,30 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         tags: Optional[List[str]] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Store an artifact with comprehensive metadata."""
+        """
+        Store an artifact with comprehensive metadata.
+        
+        The payload is serialized once and stored by content hash, shared
+        with identical earlier payloads; the artifact record itself only
+        holds metadata.
+        """
         artifact_id = str(uuid.uuid4())
+        created_at = datetime.now()
+        content_hash, content_size = self.artifact_contents.put(content)
         
-        # Prepare artifact data
+        # Prepare artifact metadata
         artifact = {
             'artifact_id': artifact_id,
-            'content': content,
             'artifact_type': artifact_type,
             'source_info': source_info,
             'session_id': session_id,
             'collection_id': collection_id,
-            'created_at': datetime.now().isoformat(),
+            'created_at': created_at.isoformat(),
+            'created_ts': created_at.timestamp(),
             'tags': tags or [],
             'metadata': metadata or {},
-            'content_size': self._calculate_content_size(content),
-            'content_hash': self._calculate_content_hash(content),
-            'relationships': []
+            'content_size': content_size,
+            'content_hash': content_hash
         }
         
         # Store in artifact store
@@ -1984,7 +2199,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             self.result_collections[collection_id]['artifact_ids'].append(artifact_id)
         
         # Update search index
-        self._update_artifact_search_index(artifact_id, artifact)
+        self._update_artifact_search_index(artifact_id, {**artifact, 'content': content})
         
         # Auto-detect relationships
         await self._detect_artifact_relationships(artifact_id)
@@ -1992,130 +2207,31 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         logger.debug(f"Stored artifact {artifact_id} (type: {artifact_type}, session: {session_id})")
         return artifact_id
     
-    def _calculate_content_size(self, content: Any) -> int:
-        """Calculate approximate content size in bytes."""
-        try:
-            import json
-            if isinstance(content, (dict, list)):
-                return len(json.dumps(content, default=str).encode('utf-8'))
-            elif isinstance(content, str):
-                return len(content.encode('utf-8'))
-            else:
-                return len(str(content).encode('utf-8'))
-        except Exception:
-            return 0
-    
-    def _calculate_content_hash(self, content: Any) -> str:
-        """Calculate content hash for deduplication."""
-        try:
-            import hashlib
-            import json
-            
-            if isinstance(content, (dict, list)):
-                content_str = json.dumps(content, sort_keys=True, default=str)
-            else:
-                content_str = str(content)
-            
-            return hashlib.md5(content_str.encode('utf-8')).hexdigest()
-        except Exception:
-            return 'unknown'
+    def _with_content(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        """Artifact metadata joined with its payload and current relationships."""
+        return {
+            **artifact,
+            'content': self.artifact_contents.get(artifact['content_hash']),
+            'relationships': list(self.artifact_relationships.neighbors(artifact['artifact_id']))
+        }
     
     def _update_artifact_search_index(self, artifact_id: str, artifact: Dict[str, Any]):
-        """Update search index for artifact discovery."""
-        # Extract searchable keywords
-        keywords = set()
-        
-        # From artifact type
-        keywords.add(artifact['artifact_type'])
-        
-        # From tags
-        keywords.update(artifact.get('tags', []))
-        
-        # From source info
-        source_info = artifact.get('source_info', {})
-        for key, value in source_info.items():
-            if isinstance(value, str) and len(value) < 50:  # Avoid indexing large text
-                keywords.add(value.lower())
-        
-        # From content (limited extraction)
-        content = artifact.get('content', {})
-        if isinstance(content, dict):
-            for key in content.keys():
-                if isinstance(key, str) and len(key) < 30:
-                    keywords.add(key.lower())
-        
-        # Update index
-        for keyword in keywords:
-            if keyword not in self.artifact_search_index:
-                self.artifact_search_index[keyword] = []
-            if artifact_id not in self.artifact_search_index[keyword]:
-                self.artifact_search_index[keyword].append(artifact_id)
+        """Update search index for artifact discovery (tokenized once, here)."""
+        self.artifact_search_index.add(artifact)
     
     async def _detect_artifact_relationships(self, artifact_id: str):
-        """Detect relationships between artifacts."""
+        """
+        Detect relationships between artifacts.
+        
+        Only artifacts sharing a task, specialist or content hash, or whose
+        indexed terms collide in a MinHash band, are checked, instead of
+        every artifact of the session.
+        """
         artifact = self.artifact_store.get(artifact_id)
         if not artifact:
             return
         
-        relationships = []
-        
-        # Find artifacts from same session
-        session_id = artifact['session_id']
-        session_artifacts = self.session_artifacts.get(session_id, [])
-        
-        for other_artifact_id in session_artifacts:
-            if other_artifact_id == artifact_id:
-                continue
-            
-            other_artifact = self.artifact_store.get(other_artifact_id)
-            if not other_artifact:
-                continue
-            
-            # Check for task sequence relationships
-            if self._are_artifacts_task_related(artifact, other_artifact):
-                relationships.append(other_artifact_id)
-            
-            # Check for content similarity relationships
-            if self._are_artifacts_content_similar(artifact, other_artifact):
-                relationships.append(other_artifact_id)
-        
-        # Store relationships
-        if relationships:
-            self.artifact_relationships[artifact_id] = relationships
-            artifact['relationships'] = relationships
-    
-    def _are_artifacts_task_related(self, artifact1: Dict[str, Any], artifact2: Dict[str, Any]) -> bool:
-        """Check if artifacts are related through task execution."""
-        source1 = artifact1.get('source_info', {})
-        source2 = artifact2.get('source_info', {})
-        
-        # Same task ID
-        if source1.get('task_id') and source1.get('task_id') == source2.get('task_id'):
-            return True
-        
-        # Same specialist
-        if source1.get('specialist_used') and source1.get('specialist_used') == source2.get('specialist_used'):
-            return True
-        
-        return False
-    
-    def _are_artifacts_content_similar(self, artifact1: Dict[str, Any], artifact2: Dict[str, Any]) -> bool:
-        """Check if artifacts have similar content."""
-        # Simple hash-based similarity
-        hash1 = artifact1.get('content_hash')
-        hash2 = artifact2.get('content_hash')
-        
-        if hash1 and hash2 and hash1 == hash2:
-            return True
-        
-        # Type-based similarity
-        type1 = artifact1.get('artifact_type')
-        type2 = artifact2.get('artifact_type')
-        
-        if type1 and type2 and type1 == type2:
-            return True
-        
-        return False
+        self.artifact_relationships.add(artifact, self.artifact_search_index.terms(artifact_id))
     
     def search_artifacts(
         self, 
@@ -2126,63 +2242,36 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         tags: List[str] = None,
         limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Search artifacts with multiple criteria."""
-        matching_artifacts = []
-        
-        # Get candidate artifact IDs
-        candidate_ids = set()
-        
-        if query:
-            # Search by keywords
-            query_keywords = query.lower().split()
-            for keyword in query_keywords:
-                if keyword in self.artifact_search_index:
-                    candidate_ids.update(self.artifact_search_index[keyword])
-        else:
-            # If no query, start with all artifacts
-            candidate_ids = set(self.artifact_store.keys())
-        
-        # Filter candidates
-        for artifact_id in candidate_ids:
-            artifact = self.artifact_store.get(artifact_id)
-            if not artifact:
-                continue
-            
-            # Apply filters
-            if artifact_type and artifact.get('artifact_type') != artifact_type:
-                continue
-            
-            if session_id and artifact.get('session_id') != session_id:
-                continue
-            
-            if collection_id and artifact.get('collection_id') != collection_id:
-                continue
-            
-            if tags:
-                artifact_tags = set(artifact.get('tags', []))
-                if not any(tag in artifact_tags for tag in tags):
-                    continue
-            
-            matching_artifacts.append(artifact)
-        
-        # Sort by creation time (newest first)
-        matching_artifacts.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        """
+        Search artifacts with multiple criteria.
         
-        return matching_artifacts[:limit]
+        With a query, artifacts matching any of its terms are ranked by
+        BM25 relevance; without one, newest first.
+        """
+        artifact_ids = self.artifact_search_index.search(
+            query=query,
+            artifact_type=artifact_type,
+            session_id=session_id,
+            collection_id=collection_id,
+            tags=tags,
+            limit=limit
+        )
+        return [self._with_content(self.artifact_store[aid]) for aid in artifact_ids if aid in self.artifact_store]
     
     def get_artifact(self, artifact_id: str) -> Optional[Dict[str, Any]]:
         """Get artifact by ID."""
-        return self.artifact_store.get(artifact_id)
+        artifact = self.artifact_store.get(artifact_id)
+        return self._with_content(artifact) if artifact else None
     
     def get_session_artifacts(self, session_id: str) -> List[Dict[str, Any]]:
         """Get all artifacts for a session."""
         artifact_ids = self.session_artifacts.get(session_id, [])
-        return [self.artifact_store[aid] for aid in artifact_ids if aid in self.artifact_store]
+        return [self._with_content(self.artifact_store[aid]) for aid in artifact_ids if aid in self.artifact_store]
     
     def get_task_artifacts(self, task_id: str) -> List[Dict[str, Any]]:
         """Get all artifacts for a specific task."""
         artifact_ids = self.task_artifacts.get(task_id, [])
-        return [self.artifact_store[aid] for aid in artifact_ids if aid in self.artifact_store]
+        return [self._with_content(self.artifact_store[aid]) for aid in artifact_ids if aid in self.artifact_store]
     
     def get_collection_artifacts(self, collection_id: str) -> List[Dict[str, Any]]:
         """Get all artifacts in a collection."""
@@ -2191,12 +2280,12 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             return []
         
         artifact_ids = collection.get('artifact_ids', [])
-        return [self.artifact_store[aid] for aid in artifact_ids if aid in self.artifact_store]
+        return [self._with_content(self.artifact_store[aid]) for aid in artifact_ids if aid in self.artifact_store]
     
     def get_related_artifacts(self, artifact_id: str) -> List[Dict[str, Any]]:
         """Get artifacts related to a specific artifact."""
-        related_ids = self.artifact_relationships.get(artifact_id, [])
-        return [self.artifact_store[aid] for aid in related_ids if aid in self.artifact_store]
+        related_ids = self.artifact_relationships.neighbors(artifact_id)
+        return [self._with_content(self.artifact_store[aid]) for aid in related_ids if aid in self.artifact_store]
     
     def get_artifact_analytics(self) -> Dict[str, Any]:
         """Get comprehensive artifact analytics."""
@@ -2227,7 +2316,10 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             'type_distribution': type_distribution,
             'size_distribution': size_distribution,
             'search_index_keywords': len(self.artifact_search_index),
-            'total_relationships': sum(len(rels) for rels in self.artifact_relationships.values()),
+            'search_index': self.artifact_search_index.get_stats(),
+            'content_store': self.artifact_contents.get_metrics(),
+            'total_relationships': self.artifact_relationships.edge_count,
+            'relationship_index': self.artifact_relationships.get_stats(),
             'avg_artifacts_per_session': total_artifacts / len(self.session_artifacts) if self.session_artifacts else 0
         }
     
@@ -2244,8 +2336,10 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             
             # Time-based cleanup
             if older_than_hours:
-                created_at = datetime.fromisoformat(artifact.get('created_at', '1970-01-01T00:00:00'))
-                if (datetime.now() - created_at).total_seconds() > (older_than_hours * 3600):
+                created_ts = artifact.get('created_ts')
+                if created_ts is None:
+                    created_ts = datetime.fromisoformat(artifact.get('created_at', '1970-01-01T00:00:00')).timestamp()
+                if datetime.now().timestamp() - created_ts > (older_than_hours * 3600):
                     should_remove = True
             
             if should_remove:
@@ -2260,12 +2354,15 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
     
     def _remove_artifact(self, artifact_id: str):
         """Remove artifact and all references."""
-        artifact = self.artifact_store.get(artifact_id)
+        artifact = self.artifact_store.pop_silently(artifact_id)
         if not artifact:
             return
-        
-        # Remove from store
-        del self.artifact_store[artifact_id]
+        self._release_artifact_references(artifact_id, artifact)
+    
+    def _release_artifact_references(self, artifact_id: str, artifact: Dict[str, Any]):
+        """Drop every reference to an artifact that is no longer in the store."""
+        # Release its share of the payload
+        self.artifact_contents.release(artifact['content_hash'])
         
         # Remove from session artifacts
         session_id = artifact.get('session_id')
@@ -2283,16 +2380,10 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             collection['artifact_ids'] = [aid for aid in collection.get('artifact_ids', []) if aid != artifact_id]
         
         # Remove from search index
-        for keyword, artifact_ids in self.artifact_search_index.items():
-            self.artifact_search_index[keyword] = [aid for aid in artifact_ids if aid != artifact_id]
-        
-        # Remove relationships
-        if artifact_id in self.artifact_relationships:
-            del self.artifact_relationships[artifact_id]
+        self.artifact_search_index.remove(artifact_id)
         
-        # Remove from other artifacts' relationships
-        for other_artifact_id, related_ids in self.artifact_relationships.items():
-            self.artifact_relationships[other_artifact_id] = [aid for aid in related_ids if aid != artifact_id]
+        # Remove relationships, including the other end of each edge
+        self.artifact_relationships.remove(artifact_id)
     
     # ============================================================================
     # PHASE 5: Intelligent Q&A Based on Domain Context Methods
@@ -2429,52 +2520,37 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         # Extract keywords from question
         keywords = question.lower().split()
         keywords = [word for word in keywords if len(word) > 3]  # Filter short words
+        if not keywords:
+            return []
         
-        # Search artifacts
-        relevant_artifacts = []
-        for keyword in keywords:
-            search_results = self.search_artifacts(
-                query=keyword,
-                session_id=session_id,
-                limit=limit
-            )
-            relevant_artifacts.extend(search_results)
-        
-        # Remove duplicates and sort by relevance
-        seen_ids = set()
-        unique_artifacts = []
-        for artifact in relevant_artifacts:
-            if artifact['artifact_id'] not in seen_ids:
-                unique_artifacts.append(artifact)
-                seen_ids.add(artifact['artifact_id'])
-        
-        return unique_artifacts[:limit]
+        # One ranked search over all keywords
+        return self.search_artifacts(
+            query=' '.join(keywords),
+            session_id=session_id,
+            limit=limit
+        )
     
     def _find_similar_questions(self, question: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Find similar previously asked questions."""
-        similar_questions = []
-        question_words = set(question.lower().split())
-        
-        for qa_id, qa_entry in self.qa_knowledge_base.items():
-            stored_question = qa_entry.get('question', '').lower()
-            stored_words = set(stored_question.split())
-            
-            # Calculate word overlap
-            overlap = len(question_words & stored_words)
-            total_words = len(question_words | stored_words)
-            
-            if total_words > 0 and overlap / total_words > 0.3:  # 30% similarity threshold
-                similar_questions.append({
-                    'qa_id': qa_id,
-                    'question': qa_entry.get('question'),
-                    'answer': qa_entry.get('answer'),
-                    'similarity_score': overlap / total_words,
-                    'timestamp': qa_entry.get('timestamp')
-                })
+        """Find similar previously asked questions via the question vector index."""
+        matches = self.qa_question_index.search(
+            self.qa_embed_fn(question),
+            k=limit,
+            min_score=self.qa_similarity_threshold
+        )
         
-        # Sort by similarity and return top results
-        similar_questions.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return similar_questions[:limit]
+        similar_questions = []
+        for qa_id, score in matches:
+            qa_entry = self.qa_knowledge_base.get(qa_id)
+            if qa_entry is None:
+                continue
+            similar_questions.append({
+                'qa_id': qa_id,
+                'question': qa_entry.get('question'),
+                'answer': qa_entry.get('answer'),
+                'similarity_score': score,
+                'timestamp': qa_entry.get('timestamp')
+            })
+        return similar_questions
     
     async def _generate_contextual_answer(self, question: str, question_type: str, context: Dict[str, Any], session_id: str) -> Dict[str, Any]:
         """Generate answer based on question type and context."""
@@ -2960,15 +3036,17 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         }
         
         self.qa_knowledge_base[qa_id] = qa_entry
+        self.qa_question_index.add(qa_id, self.qa_embed_fn(question))
         
         # Update Q&A patterns
         question_type = answer_data.get('question_type', 'unknown')
         self.qa_patterns[question_type] = self.qa_patterns.get(question_type, 0) + 1
         
-        # Keep only last 100 Q&A entries to manage memory
-        if len(self.qa_knowledge_base) > 100:
-            oldest_qa = min(self.qa_knowledge_base.items(), key=lambda x: x[1]['timestamp'])
-            del self.qa_knowledge_base[oldest_qa[0]]
+        # Drop the oldest entries (insertion order) beyond the configured limit
+        while len(self.qa_knowledge_base) > self.qa_knowledge_base_limit:
+            oldest_qa_id = next(iter(self.qa_knowledge_base))
+            del self.qa_knowledge_base[oldest_qa_id]
+            self.qa_question_index.remove(oldest_qa_id)
         
         logger.debug(f"Stored Q&A interaction {qa_id}")
         return qa_id
@@ -3025,7 +3103,8 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             'average_confidence': avg_confidence,
             'domain_knowledge_areas': len(self.domain_knowledge),
             'qa_patterns': self.qa_patterns,
-            'high_confidence_answers': len([qa for qa in self.qa_knowledge_base.values() if qa.get('confidence', 0) > 0.8])
+            'high_confidence_answers': len([qa for qa in self.qa_knowledge_base.values() if qa.get('confidence', 0) > 0.8]),
+            'question_index': self.qa_question_index.get_stats()
         }
     
     # ============================================================================
@@ -4396,15 +4475,19 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
         Yields:
             Enhanced streaming events with artifact notifications
         """
+        # Assigned before the try so the error handler and cleanup can always use it
+        streaming_session_id = f"{sessionId}_stream_{datetime.now().timestamp()}"
         try:
             # Initialize streaming session
-            streaming_session_id = f"{sessionId}_stream_{datetime.now().timestamp()}"
-            self.streaming_sessions[streaming_session_id] = {
+            stream_state = {
                 'start_time': datetime.now(),
                 'events_count': 0,
                 'artifacts_streamed': 0,
                 'last_progress': 0
             }
+            # Pinned: the stream updates stream_state directly, so the entry looks idle
+            self.streaming_sessions.pin(streaming_session_id)
+            self.streaming_sessions[streaming_session_id] = stream_state
             
             # PHASE 7: Initial setup event
             yield {
@@ -4492,34 +4575,45 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             
             # PHASE 1: Initialize dynamic workflow if enabled
             if self.enable_dynamic_workflow and hasattr(self, 'dynamic_workflow'):
-                self.dynamic_workflow = DynamicWorkflowGraph(f"workflow_{sessionId}")
+                workflow_id = f"workflow_{sessionId}"
+                plan_fingerprint = self._plan_fingerprint(execution_plan)
+                restored = self._restore_dynamic_workflow(sessionId, workflow_id, plan_fingerprint)
+                self.dynamic_workflow = restored or DynamicWorkflowGraph(workflow_id)
                 
-                # Build workflow graph from plan
-                for i, task in enumerate(tasks):
-                    node = WorkflowNode(
-                        task=task.get('description', f'Task {i+1}'),
-                        node_key=f"task_{i}",
-                        metadata={
-                            'task_id': task.get('task_id', str(uuid.uuid4())),
-                            'specialist': task.get('assigned_to'),
-                            'priority': task.get('priority', 'medium')
-                        }
-                    )
-                    self.dynamic_workflow.add_node(node)
+                # Build workflow graph from plan (a restored graph already has it)
+                if restored is None:
+                    self.dynamic_workflow.metadata['plan_fingerprint'] = plan_fingerprint
+                    for i, task in enumerate(tasks):
+                        node = WorkflowNode(
+                            task=task.get('description', f'Task {i+1}'),
+                            node_key=f"task_{i}",
+                            metadata={
+                                'task_id': task.get('task_id', str(uuid.uuid4())),
+                                'specialist': task.get('assigned_to'),
+                                'priority': task.get('priority', 'medium')
+                            }
+                        )
+                        self.dynamic_workflow.add_node(node)
+                        
+                        # Add dependencies
+                        if i > 0 and execution_plan.get('coordination_strategy') == 'sequential':
+                            prev_node_id = self.dynamic_workflow.get_nodes_by_key(f"task_{i-1}")[0].id
+                            self.dynamic_workflow.add_edge(prev_node_id, node.id)
                     
-                    # Add dependencies
-                    if i > 0 and execution_plan.get('coordination_strategy') == 'sequential':
-                        prev_node_id = self.dynamic_workflow.get_nodes_by_key(f"task_{i-1}")[0].id
-                        self.dynamic_workflow.add_edge(prev_node_id, node.id)
+                    # Checkpoint the complete graph once, fingerprint included
+                    if self.checkpoint_store is not None:
+                        self.dynamic_workflow.attach_checkpoint_store(self.checkpoint_store)
                 
                 # Stream workflow creation event
                 yield {
                     'response_type': 'stream_event',
                     'event_type': 'workflow_created',
-                    'content': '📊 Dynamic workflow graph created',
+                    'content': '📊 Dynamic workflow graph restored from checkpoint' if restored
+                    else '📊 Dynamic workflow graph created',
                     'metadata': {
                         'total_nodes': len(self.dynamic_workflow.nodes),
-                        'execution_layers': len(self.dynamic_workflow.get_execution_plan())
+                        'execution_layers': len(self.dynamic_workflow.get_execution_plan()),
+                        'restored': restored is not None
                     },
                     'progress': 20
                 }
@@ -4537,9 +4631,9 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             orchestration_result = None
             async for event in self._stream_orchestration_with_artifacts(execution_plan, sessionId, streaming_session_id):
                 # Update streaming session stats
-                self.streaming_sessions[streaming_session_id]['events_count'] += 1
+                stream_state['events_count'] += 1
                 if event.get('event_type') == 'artifact_created':
-                    self.streaming_sessions[streaming_session_id]['artifacts_streamed'] += 1
+                    stream_state['artifacts_streamed'] += 1
                 
                 # Capture final orchestration result
                 if event.get('event_type') == 'orchestration_complete':
@@ -4589,15 +4683,15 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
                 'content': f'🎉 Enhanced {self.domain_name} orchestration completed',
                 'metadata': {
                     'session_stats': session_stats,
-                    'total_artifacts': self.streaming_sessions[streaming_session_id]['artifacts_streamed'],
-                    'execution_time': (datetime.now() - self.streaming_sessions[streaming_session_id]['start_time']).total_seconds()
+                    'total_artifacts': stream_state['artifacts_streamed'],
+                    'execution_time': (datetime.now() - stream_state['start_time']).total_seconds()
                 },
                 'progress': 100,
                 'stage': 'completion'
             }
             
             # Cleanup streaming session
-            del self.streaming_sessions[streaming_session_id]
+            self.streaming_sessions.pop_silently(streaming_session_id)
             
         except Exception as e:
             logger.error("Enhanced stream orchestration error",
@@ -4615,6 +4709,8 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
                 },
                 'stage': 'error'
             }
+        finally:
+            self.streaming_sessions.unpin(streaming_session_id)
     
     async def _stream_orchestration_with_artifacts(
         self, 
@@ -4732,6 +4828,49 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             'progress': 90
         }
     
+    @staticmethod
+    def _plan_fingerprint(execution_plan: dict) -> str:
+        """Hash of a plan's strategy and tasks (ids, descriptions, assignees, dependencies)."""
+        tasks = [
+            {
+                'id': task.get('id', task.get('task_id')),
+                'description': task.get('description'),
+                'assigned_to': task.get('assigned_to', task.get('agent_type')),
+                'dependencies': sorted(str(dependency) for dependency in task.get('dependencies') or [])
+            }
+            for task in execution_plan.get('tasks', [])
+        ]
+        payload = json.dumps(
+            {'strategy': execution_plan.get('coordination_strategy'), 'tasks': tasks},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _restore_dynamic_workflow(self, session_id: str, workflow_id: str,
+                                  plan_fingerprint: str) -> Optional[DynamicWorkflowGraph]:
+        """Restore a checkpointed workflow for the same plan, if one has unfinished work."""
+        if self.checkpoint_store is None:
+            return None
+        
+        try:
+            workflow = DynamicWorkflowGraph.restore(self.checkpoint_store, workflow_id)
+        except Exception as e:
+            logger.error(f"Failed to restore workflow {workflow_id}: {e}")
+            return None
+        
+        if workflow is None:
+            return None
+        if (workflow.state == WorkflowState.COMPLETED
+                or workflow.metadata.get('plan_fingerprint') != plan_fingerprint):
+            # Finished or built from a different plan: start over
+            self.checkpoint_store.delete_workflow(workflow_id)
+            return None
+        
+        self.current_session_id = session_id
+        logger.info(f"Resuming workflow {workflow_id} from checkpoint")
+        return workflow
+    
     async def _stream_task_execution(self, task: dict, sessionId: str, task_index: int) -> AsyncIterable[dict[str, Any]]:
         """
         Stream individual task execution with artifact events.
@@ -4746,6 +4885,20 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
                 nodes = self.dynamic_workflow.get_nodes_by_key(f"task_{task_index}")
                 if nodes:
                     node = nodes[0]
+                    if node.state == NodeState.COMPLETED:
+                        # Finished before a restart; reuse the checkpointed result
+                        yield {
+                            'response_type': 'stream_event',
+                            'event_type': 'task_complete',
+                            'content': '✅ Task restored from checkpoint',
+                            'metadata': {
+                                'task_id': task_id,
+                                'restored': True,
+                                'result': node.result
+                            },
+                            'progress': 100
+                        }
+                        return
                     node.start_execution()
             
             # Simulate task execution stages
@@ -4837,7 +4990,7 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             logger.error("Task execution error",
                        error=str(e),
                        error_type=type(e).__name__,
-                       task_id=task_info.get('task', {}).get('id', 'unknown'))
+                       task_id=task_id)
             yield {
                 'response_type': 'stream_event',
                 'event_type': 'task_error',
@@ -4856,20 +5009,72 @@ class MasterOrchestratorTemplate(StandardizedAgentBase):
             event['metadata']['total_tasks'] = total_tasks
             yield event
     
-    async def _merge_task_streams(self, task_streams: List[AsyncIterable]) -> AsyncIterable[dict[str, Any]]:
-        """Merge multiple task streams into a single stream."""
-        # Simple round-robin merge for demonstration
-        # In production, use more sophisticated merging with asyncio.Queue
-        iterators = [stream.__aiter__() for stream in task_streams]
-        pending = list(range(len(iterators)))
+    async def _merge_task_streams(
+        self,
+        task_streams: List[AsyncIterable],
+        buffer_size: Optional[int] = None
+    ) -> AsyncIterable[dict[str, Any]]:
+        """
+        Merge multiple task streams into a single stream in arrival order.
+        
+        Every stream is consumed concurrently by its own task feeding one
+        bounded queue of ``buffer_size`` events (``stream_buffer_size`` by
+        default), so a slow stream never holds back the others and a fast
+        one waits when the consumer falls behind. Each event is tagged with
+        its ``stream_index`` and per-stream ``stream_sequence``. A stream
+        that raises ends with a ``task_error`` event while the rest carry
+        on; when the consumer stops or is cancelled, all streams are
+        cancelled and closed.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or self.stream_buffer_size)
+        finished = object()
         
-        while pending:
-            for i in list(pending):
-                try:
-                    event = await iterators[i].__anext__()
-                    yield event
-                except StopAsyncIteration:
-                    pending.remove(i)
+        async def pump(stream_index: int, stream: AsyncIterable):
+            sequence = 0
+            try:
+                async for event in stream:
+                    await queue.put((stream_index, sequence, event))
+                    sequence += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task stream {stream_index} failed: {e}")
+                await queue.put((stream_index, sequence, {
+                    'response_type': 'stream_event',
+                    'event_type': 'task_error',
+                    'content': f'❌ Task stream failed: {str(e)}',
+                    'metadata': {'error': str(e), 'error_type': type(e).__name__}
+                }))
+            finally:
+                # A pump cancelled while waiting for queue space leaves its
+                # stream suspended at a yield; close it so its cleanup runs now
+                aclose = getattr(stream, 'aclose', None)
+                if aclose is not None:
+                    try:
+                        await aclose()
+                    except Exception as e:
+                        logger.warning(f"Closing task stream {stream_index} failed: {e}")
+            await queue.put((stream_index, None, finished))
+        
+        pumps = [
+            asyncio.create_task(pump(stream_index, stream))
+            for stream_index, stream in enumerate(task_streams)
+        ]
+        active = len(pumps)
+        try:
+            while active:
+                stream_index, sequence, event = await queue.get()
+                if event is finished:
+                    active -= 1
+                    continue
+                metadata = event.setdefault('metadata', {})
+                metadata['stream_index'] = stream_index
+                metadata['stream_sequence'] = sequence
+                yield event
+        finally:
+            for pump_task in pumps:
+                pump_task.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
     
     def _get_streaming_session_stats(self, streaming_session_id: str) -> Dict[str, Any]:
         """Get statistics for a streaming session."""
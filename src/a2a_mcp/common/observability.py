@@ -278,6 +278,11 @@ class ObservabilityManager:
                     'Total number of errors',
                     ['component', 'error_type']
                 ),
+                'session_state_evictions_total': Counter(
+                    'session_state_evictions_total',
+                    'Total number of entries evicted from bounded session state',
+                    ['store', 'reason']
+                ),
                 
                 # Histograms
                 'orchestration_duration_seconds': Histogram(
@@ -292,6 +297,12 @@ class ObservabilityManager:
                     ['specialist'],
                     buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
                 ),
+                'task_queue_time_seconds': Histogram(
+                    'task_queue_time_seconds',
+                    'Time tasks waited for a concurrency slot in seconds',
+                    ['specialist'],
+                    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+                ),
                 'artifact_size_bytes': Histogram(
                     'artifact_size_bytes',
                     'Size of created artifacts in bytes',
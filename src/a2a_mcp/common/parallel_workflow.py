@@ -1,11 +1,13 @@
 """Enhanced workflow module with parallel task execution support."""
 
 import asyncio
+import heapq
 import json
 import logging
 import uuid
 from collections.abc import AsyncIterable
 from collections import defaultdict
+from dataclasses import dataclass
 from enum import Enum
 from uuid import uuid4
 
@@ -22,6 +24,7 @@ from a2a.types import (
     TaskState,
     TaskStatusUpdateEvent,
 )
+from a2a_mcp.common.admission_control import AdmissionController
 from a2a_mcp.common.utils import get_mcp_server_config
 from a2a_mcp.common.workflow import Status, WorkflowNode
 from a2a_mcp.mcp import client
@@ -30,9 +33,35 @@ from a2a_mcp.mcp import client
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class NodeChunk:
+    """A chunk streamed from a workflow node, tagged with its origin."""
+    node_id: str
+    sequence: int  # Position of the chunk within its node's stream
+    chunk: any
+
+
+@dataclass
+class _NodeFinished:
+    """Queue marker sent when a node's stream ends."""
+    node_id: str
+    error: Exception | None = None
+
+
 class ParallelWorkflowNode(WorkflowNode):
     """Enhanced workflow node with parallel execution support."""
     
+    def __init__(
+        self,
+        task: str,
+        node_key: str | None = None,
+        node_label: str | None = None,
+        priority: int = 0,
+    ):
+        super().__init__(task, node_key=node_key, node_label=node_label)
+        # Among ready nodes, higher priority starts first
+        self.priority = priority
+    
     async def run_node_with_result(
         self,
         query: str,
@@ -47,9 +76,32 @@ class ParallelWorkflowNode(WorkflowNode):
 
 
 class ParallelWorkflowGraph:
-    """Enhanced workflow graph with parallel task execution."""
+    """Enhanced workflow graph with parallel task execution.
 
-    def __init__(self):
+    ``run_workflow`` schedules nodes from a ready queue: a node starts as
+    soon as all of its own predecessors have completed, rather than
+    waiting for every node of its level. At most ``max_in_flight`` nodes
+    run at once; among ready nodes, higher ``priority`` (a node attribute)
+    starts first, with ties broken by topological order.
+
+    Chunks of concurrently running nodes are merged into the caller's
+    stream as they arrive, through a queue of ``stream_queue_size``
+    entries; a node producing faster than the caller consumes waits on
+    the full queue instead of buffering.
+
+    With an ``admission`` controller, every node also takes a slot for its
+    target agent (the ``agent_id`` node attribute, else its ``node_key``)
+    before running; a node over the global or per-agent limit waits in the
+    controller's queue rather than failing. Share one controller between
+    graphs to bound load on agents across workflows.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        stream_queue_size: int = 64,
+        admission: AdmissionController | None = None,
+    ):
         self.graph = nx.DiGraph()
         self.nodes = {}
         self.latest_node = None
@@ -57,10 +109,16 @@ class ParallelWorkflowGraph:
         self.state = Status.INITIALIZED
         self.paused_node_id = None
         self.parallel_threshold = 2  # Min nodes to trigger parallel execution
+        self.max_in_flight = max_in_flight  # None means no limit
+        self.stream_queue_size = stream_queue_size
+        self.admission = admission
+        self.failed_nodes: dict[str, Exception] = {}
 
     def add_node(self, node: ParallelWorkflowNode) -> None:
         logger.info(f'Adding node {node.id}')
-        self.graph.add_node(node.id, query=node.task)
+        self.graph.add_node(
+            node.id, query=node.task, priority=getattr(node, 'priority', 0)
+        )
         self.nodes[node.id] = node
         self.latest_node = node.id
 
@@ -69,18 +127,25 @@ class ParallelWorkflowGraph:
             raise ValueError('Invalid node IDs')
         self.graph.add_edge(from_node_id, to_node_id)
 
-    def get_execution_levels(self, start_node_id: str = None) -> list[list[str]]:
-        """Get nodes grouped by execution level for parallel processing."""
+    def _get_start_nodes(self, start_node_id: str = None) -> list[str]:
         if not start_node_id or start_node_id not in self.nodes:
-            start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
-        else:
-            start_nodes = [start_node_id]
+            return [n for n, d in self.graph.in_degree() if d == 0]
+        return [start_node_id]
 
-        # Build applicable subgraph
+    def _get_applicable_nodes(self, start_nodes: list[str]) -> set[str]:
+        """Start nodes plus everything reachable from them."""
         applicable_graph = set()
         for node_id in start_nodes:
             applicable_graph.add(node_id)
             applicable_graph.update(nx.descendants(self.graph, node_id))
+        return applicable_graph
+
+    def get_execution_levels(self, start_node_id: str = None) -> list[list[str]]:
+        """Get nodes grouped by execution level for parallel processing."""
+        start_nodes = self._get_start_nodes(start_node_id)
+
+        # Build applicable subgraph
+        applicable_graph = self._get_applicable_nodes(start_nodes)
 
         # Calculate levels using BFS
         levels = []
@@ -110,113 +175,198 @@ class ParallelWorkflowGraph:
     async def execute_parallel_level(
         self, 
         node_ids: list[str],
-        chunk_callback: callable
+        chunk_callback: callable,
+        collect_results: bool = True
     ) -> dict[str, any]:
-        """Execute a level of nodes in parallel."""
-        tasks = []
-        node_map = {}
-        
-        for node_id in node_ids:
-            node = self.nodes[node_id]
-            query = self.graph.nodes[node_id].get('query')
-            task_id = self.graph.nodes[node_id].get('task_id')
-            context_id = self.graph.nodes[node_id].get('context_id')
-            
-            # Create async task for each node
-            task = asyncio.create_task(
-                node.run_node_with_result(query, task_id, context_id)
-            )
-            tasks.append(task)
-            node_map[task] = node
-        
-        # Execute all tasks in parallel
-        logger.info(f"Executing {len(tasks)} nodes in parallel: {node_ids}")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        """Execute a level of nodes in parallel.
+
+        ``chunk_callback`` receives each chunk as soon as its node produces
+        it. Pass ``collect_results=False`` to avoid keeping every chunk
+        for the returned mapping.
+        """
+        logger.info(f"Executing {len(node_ids)} nodes in parallel: {node_ids}")
+        level_results = {node_id: [] for node_id in node_ids}
         
-        # Process results
-        level_results = {}
-        for task, (node_id, chunks) in zip(tasks, results):
-            if isinstance(chunks, Exception):
-                logger.error(f"Node {node_id} failed with error: {chunks}")
-                node_map[task].state = Status.PAUSED
-                continue
-                
-            node = self.nodes[node_id]
-            node.state = Status.COMPLETED
-            level_results[node_id] = chunks
-            
-            # Yield chunks through callback
-            for chunk in chunks:
-                await chunk_callback(chunk)
+        async for node_chunk in self.stream_parallel_level(node_ids):
+            if collect_results:
+                level_results[node_chunk.node_id].append(node_chunk.chunk)
+            await chunk_callback(node_chunk.chunk)
         
-        return level_results
+        return {
+            node_id: chunks for node_id, chunks in level_results.items()
+            if self.nodes[node_id].state == Status.COMPLETED
+        }
+
+    async def stream_parallel_level(
+        self, node_ids: list[str]
+    ) -> AsyncIterable[NodeChunk]:
+        """Run nodes concurrently and yield their tagged chunks as they arrive."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_queue_size)
+        tasks = [
+            asyncio.create_task(self._stream_node(node_id, queue))
+            for node_id in node_ids
+        ]
+        pending = len(tasks)
+        try:
+            while pending:
+                item = await queue.get()
+                if isinstance(item, _NodeFinished):
+                    pending -= 1
+                    node = self.nodes[item.node_id]
+                    if item.error is not None:
+                        logger.error(f"Node {item.node_id} failed with error: {item.error}")
+                        node.state = Status.PAUSED
+                    elif node.state == Status.RUNNING:
+                        node.state = Status.COMPLETED
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def run_workflow(
-        self, start_node_id: str = None
+        self, start_node_id: str = None, tagged: bool = False
     ) -> AsyncIterable[dict[str, any]]:
-        """Execute workflow with parallel task execution."""
+        """Execute workflow, starting each node as soon as its predecessors finish.
+
+        Chunks are yielded as they arrive from any running node; with
+        ``tagged=True`` each is wrapped in a NodeChunk carrying its node id
+        and sequence number. A failed node is recorded in ``failed_nodes``
+        and its descendants are not run; the graph then ends FAILED rather
+        than COMPLETED. When a node asks for input, no
+        further nodes are started; nodes already running finish and their
+        chunks are still yielded.
+        """
         logger.info('Executing parallel workflow graph')
         
-        # Get execution levels
-        levels = self.get_execution_levels(start_node_id)
-        logger.info(f'Execution levels: {[[n for n in level] for level in levels]}')
+        start_nodes = self._get_start_nodes(start_node_id)
+        applicable = self._get_applicable_nodes(start_nodes)
+        order = {
+            node_id: position
+            for position, node_id in enumerate(
+                n for n in nx.topological_sort(self.graph) if n in applicable
+            )
+        }
+        remaining = {
+            node_id: sum(1 for p in self.graph.predecessors(node_id) if p in applicable)
+            for node_id in applicable
+        }
+        logger.info(f'Scheduling {len(applicable)} nodes, max in flight {self.max_in_flight}')
+        
+        ready: list[tuple[int, int, str]] = []
+        for node_id in applicable:
+            if remaining[node_id] == 0:
+                self._push_ready(ready, node_id, order)
         
         self.state = Status.RUNNING
-        collected_chunks = []
+        self.failed_nodes = {}
+        limit = self.max_in_flight or max(1, len(applicable))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_queue_size)
+        in_flight: dict[str, asyncio.Task] = {}
         
-        # Define callback to collect chunks
-        async def chunk_collector(chunk):
-            collected_chunks.append(chunk)
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < limit and self.state == Status.RUNNING:
+                    _, _, node_id = heapq.heappop(ready)
+                    self.nodes[node_id].state = Status.RUNNING
+                    in_flight[node_id] = asyncio.create_task(
+                        self._stream_node(node_id, queue)
+                    )
+                
+                if not in_flight:
+                    break
+                
+                item = await queue.get()
+                if isinstance(item, NodeChunk):
+                    yield item if tagged else item.chunk
+                    continue
+                
+                node_id = item.node_id
+                del in_flight[node_id]
+                node = self.nodes[node_id]
+                if item.error is not None:
+                    logger.error(f"Node {node_id} failed with error: {item.error}")
+                    node.state = Status.PAUSED
+                    self.failed_nodes[node_id] = item.error
+                    continue
+                if node.state == Status.PAUSED:
+                    continue
+                node.state = Status.COMPLETED
+                for successor in self.graph.successors(node_id):
+                    if successor in applicable:
+                        remaining[successor] -= 1
+                        if remaining[successor] == 0:
+                            self._push_ready(ready, successor, order)
+        finally:
+            # Consumer stopped early or the workflow was cancelled
+            for task in in_flight.values():
+                task.cancel()
         
-        # Execute each level
-        for level_idx, level_nodes in enumerate(levels):
-            logger.info(f'Executing level {level_idx} with {len(level_nodes)} nodes')
-            
-            # Clear collected chunks for this level
-            collected_chunks.clear()
-            
-            if len(level_nodes) >= self.parallel_threshold:
-                # Execute in parallel
-                level_results = await self.execute_parallel_level(
-                    level_nodes, 
-                    chunk_collector
-                )
-            else:
-                # Execute sequentially for small levels
-                for node_id in level_nodes:
-                    node = self.nodes[node_id]
-                    node.state = Status.RUNNING
-                    query = self.graph.nodes[node_id].get('query')
-                    task_id = self.graph.nodes[node_id].get('task_id')
-                    context_id = self.graph.nodes[node_id].get('context_id')
-                    
-                    async for chunk in node.run_node(query, task_id, context_id):
-                        collected_chunks.append(chunk)
-                        if isinstance(
-                            chunk.root, SendStreamingMessageSuccessResponse
-                        ) and isinstance(chunk.root.result, TaskStatusUpdateEvent):
-                            task_status_event = chunk.root.result
-                            if (
-                                task_status_event.status.state == TaskState.input_required
-                            ):
-                                node.state = Status.PAUSED
-                                self.state = Status.PAUSED
-                                self.paused_node_id = node.id
-                    
-                    if node.state == Status.RUNNING:
-                        node.state = Status.COMPLETED
-            
-            # Yield all chunks from this level
-            for chunk in collected_chunks:
-                yield chunk
-            
-            # Check if workflow is paused
-            if self.state == Status.PAUSED:
-                break
+        if self.failed_nodes:
+            skipped = [n for n, count in remaining.items() if count > 0]
+            logger.warning(
+                f'{len(self.failed_nodes)} nodes failed; skipped {len(skipped)} dependent nodes'
+            )
+            if self.state == Status.RUNNING:
+                self.state = Status.FAILED
         
         if self.state == Status.RUNNING:
             self.state = Status.COMPLETED
 
+    def _push_ready(self, ready: list, node_id: str, order: dict[str, int]) -> None:
+        priority = self.graph.nodes[node_id].get('priority', 0) or 0
+        heapq.heappush(ready, (-priority, order[node_id], node_id))
+
+    async def _stream_node(self, node_id: str, queue: asyncio.Queue) -> None:
+        """Run one node, pushing tagged chunks and a final marker to the queue.
+
+        ``queue.put`` blocks while the queue is full, which holds back a
+        node that produces faster than the consumer reads.
+        """
+        node = self.nodes[node_id]
+        node.state = Status.RUNNING
+        query = self.graph.nodes[node_id].get('query')
+        task_id = self.graph.nodes[node_id].get('task_id')
+        context_id = self.graph.nodes[node_id].get('context_id')
+        
+        agent = self.get_target_agent(node_id)
+        if self.admission is not None:
+            queue_time = await self.admission.acquire(agent)
+            self.graph.nodes[node_id]['queue_time'] = queue_time
+            if queue_time:
+                logger.debug(f'Node {node_id} waited {queue_time:.3f}s for agent {agent}')
+        
+        error = None
+        sequence = 0
+        try:
+            async for chunk in node.run_node(query, task_id, context_id):
+                if isinstance(
+                    chunk.root, SendStreamingMessageSuccessResponse
+                ) and isinstance(chunk.root.result, TaskStatusUpdateEvent):
+                    task_status_event = chunk.root.result
+                    if (
+                        task_status_event.status.state == TaskState.input_required
+                    ):
+                        node.state = Status.PAUSED
+                        self.state = Status.PAUSED
+                        self.paused_node_id = node.id
+                await queue.put(NodeChunk(node_id, sequence, chunk))
+                sequence += 1
+        except Exception as e:
+            error = e
+        finally:
+            if self.admission is not None:
+                self.admission.release(agent)
+        await queue.put(_NodeFinished(node_id, error))
+
+    def get_target_agent(self, node_id: str) -> str:
+        """Agent a node calls, used as its admission control key."""
+        return (
+            self.graph.nodes[node_id].get('agent_id')
+            or self.nodes[node_id].node_key
+            or 'default'
+        )
+
     def set_node_attribute(self, node_id, attribute, value):
         nx.set_node_attributes(self.graph, {node_id: value}, attribute)
 
@@ -0,0 +1,282 @@
+# ABOUTME: Bounded in-memory state for long-lived orchestrators with LRU, TTL and byte-size eviction
+# ABOUTME: Evicted entries can be handed to a callback, e.g. to archive sessions on local disk
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+EvictionCallback = Callable[[str, Any, Any, str], None]  # (cache name, key, value, reason)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a value in bytes, via its JSON encoding."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class BoundedStateCache(MutableMapping):
+    """
+    Dict-like store bounded by entry count, idle time and total size.
+
+    Reads and writes move an entry to the most recently used end. An entry
+    not touched for ``ttl_seconds`` expires; when a write takes the cache
+    over ``max_entries`` or ``max_bytes``, least recently used entries are
+    evicted until it fits. Sizes are estimated when an entry is written;
+    callers that grow a value in place report it with ``update_size`` or
+    ``adjust_size``. Every eviction (not explicit deletion) is passed to
+    ``on_evict`` with its reason: ``'lru'``, ``'ttl'`` or ``'size'``.
+
+    Entries that are in use but not read through the cache, such as the
+    state of a running stream updated via a local reference, can be
+    pinned: a pinned entry is never evicted, and its idle time starts
+    counting again when it is unpinned.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        on_evict: Optional[EvictionCallback] = None,
+        size_of: Callable[[Any], int] = estimate_size
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            name: Name used in logs, metrics and eviction callbacks
+            max_entries: Maximum number of entries; None means no limit
+            ttl_seconds: Idle time after which an entry expires; None means never
+            max_bytes: Maximum estimated total size; None means sizes are not tracked
+            on_evict: Called with (name, key, value, reason) for each evicted entry
+            size_of: Size estimator used when ``max_bytes`` is set
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.size_of = size_of
+
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._touched: Dict[Any, float] = {}
+        self._sizes: Dict[Any, int] = {}
+        self._pinned: Set[Any] = set()
+        self._resident_bytes = 0
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions_lru": 0,
+            "evictions_ttl": 0,
+            "evictions_size": 0,
+            "eviction_callback_errors": 0
+        }
+
+    def _is_expired(self, key, now: float) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and key not in self._pinned
+            and now - self._touched[key] > self.ttl_seconds
+        )
+
+    def _touch(self, key, now: float):
+        self._data.move_to_end(key)
+        self._touched[key] = now
+
+    def _drop(self, key):
+        value = self._data.pop(key)
+        del self._touched[key]
+        self._pinned.discard(key)
+        self._resident_bytes -= self._sizes.pop(key, 0)
+        return value
+
+    def _evict(self, key, reason: str):
+        value = self._drop(key)
+        self._metrics[f"evictions_{reason}"] += 1
+        if self.on_evict is not None:
+            try:
+                self.on_evict(self.name, key, value, reason)
+            except Exception as e:
+                self._metrics["eviction_callback_errors"] += 1
+                logger.error(f"Eviction callback failed for {self.name}[{key}]: {e}")
+
+    def expire(self):
+        """Evict expired entries; they sit at the least recently used end."""
+        if self.ttl_seconds is None:
+            return
+        now = time.monotonic()
+        expired = []
+        for key in self._data:
+            if key in self._pinned:
+                continue
+            if not self._is_expired(key, now):
+                break
+            expired.append(key)
+        for key in expired:
+            self._evict(key, 'ttl')
+
+    def _least_recently_used(self, keep=None):
+        """Oldest entry that may be evicted, or None."""
+        return next((key for key in self._data if key not in self._pinned and key != keep), None)
+
+    def _enforce_limits(self, keep=None):
+        self.expire()
+        if self.max_entries is not None:
+            while len(self._data) > self.max_entries:
+                victim = self._least_recently_used(keep)
+                if victim is None:
+                    break
+                self._evict(victim, 'lru')
+        if self.max_bytes is not None:
+            while self._resident_bytes > self.max_bytes:
+                victim = self._least_recently_used(keep)
+                if victim is None:
+                    break
+                self._evict(victim, 'size')
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            self._metrics["misses"] += 1
+            raise KeyError(key)
+        now = time.monotonic()
+        if self._is_expired(key, now):
+            self._evict(key, 'ttl')
+            self._metrics["misses"] += 1
+            raise KeyError(key)
+        self._metrics["hits"] += 1
+        self._touch(key, now)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._resident_bytes -= self._sizes.pop(key, 0)
+        self._data[key] = value
+        self._touch(key, time.monotonic())
+        if self.max_bytes is not None:
+            size = self.size_of(value)
+            self._sizes[key] = size
+            self._resident_bytes += size
+        self._enforce_limits(keep=key)
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._drop(key)
+
+    def __contains__(self, key) -> bool:
+        # Membership does not count as a use
+        return key in self._data and not self._is_expired(key, time.monotonic())
+
+    def __iter__(self) -> Iterator:
+        self.expire()
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._data)
+
+    # Scans return snapshots and, like membership, do not count as uses
+    def keys(self):
+        self.expire()
+        return list(self._data.keys())
+
+    def values(self):
+        self.expire()
+        return list(self._data.values())
+
+    def items(self):
+        self.expire()
+        return list(self._data.items())
+
+    def pin(self, key):
+        """Exempt an entry (present or about to be stored) from eviction."""
+        self._pinned.add(key)
+
+    def unpin(self, key):
+        """Make a pinned entry evictable again; its idle time restarts now."""
+        self._pinned.discard(key)
+        if key in self._data:
+            self._touch(key, time.monotonic())
+
+    def pop_silently(self, key, default=None):
+        """Remove an entry without counting or reporting it as an eviction."""
+        if key not in self._data:
+            return default
+        return self._drop(key)
+
+    def update_size(self, key):
+        """Re-estimate the size of an entry that was changed in place."""
+        if self.max_bytes is None or key not in self._data:
+            return
+        self._resident_bytes -= self._sizes.get(key, 0)
+        self._sizes[key] = self.size_of(self._data[key])
+        self._resident_bytes += self._sizes[key]
+        self._enforce_limits(keep=key)
+
+    def adjust_size(self, key, delta_bytes: int):
+        """Add ``delta_bytes`` to an entry's size, e.g. after appending to it."""
+        if self.max_bytes is None or key not in self._data:
+            return
+        self._sizes[key] = self._sizes.get(key, 0) + delta_bytes
+        self._resident_bytes += delta_bytes
+        self._enforce_limits(keep=key)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "entries": len(self._data),
+            "pinned": len(self._pinned),
+            "resident_bytes": self._resident_bytes if self.max_bytes is not None else None,
+            "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "max_bytes": self.max_bytes
+        }
+
+
+class SessionArchive:
+    """
+    Eviction callback that writes evicted entries to JSON files.
+
+    Entries land in ``<directory>/<cache name>/<key>.json`` and can be read
+    back with ``load``.
+    """
+
+    _UNSAFE = re.compile(r'[^A-Za-z0-9_.-]')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.archived = 0
+
+    def _path(self, name: str, key: Any) -> str:
+        return os.path.join(self.directory, name, f"{self._UNSAFE.sub('_', str(key))}.json")
+
+    def __call__(self, name: str, key: Any, value: Any, reason: str):
+        path = self._path(name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': str(key), 'reason': reason, 'value': value}, f, default=str)
+        os.replace(tmp_path, path)
+        self.archived += 1
+
+    def load(self, name: str, key: Any) -> Optional[Any]:
+        """Value archived for a key, or None if nothing was archived."""
+        try:
+            with open(self._path(name, key), 'r', encoding='utf-8') as f:
+                return json.load(f)['value']
+        except FileNotFoundError:
+            return None
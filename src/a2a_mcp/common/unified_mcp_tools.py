@@ -105,13 +105,13 @@ class UnifiedMCPToolServer:
             try:
                 self._update_tool_stats('list_available_agents', 'called')
                 
-                # Load agent cards and return summary
-                from a2a_mcp.mcp.server import load_agent_cards
+                # Summarize cards from the shared, hot-reloaded card registry
+                from a2a_mcp.mcp.server import get_card_registry
                 
-                _, agent_cards = load_agent_cards()
+                snapshot = get_card_registry().ensure_loaded()
                 agent_summary = []
                 
-                for card in agent_cards:
+                for card in snapshot.agent_cards:
                     agent_summary.append({
                         'id': card.get('id', 'unknown'),
                         'name': card.get('name', 'Unknown'),
@@ -0,0 +1,175 @@
+# ABOUTME: Incremental approximate nearest-neighbor index over normalized vectors
+# ABOUTME: Random-hyperplane LSH tables with multi-probe lookup and exact cosine re-ranking
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbor index for cosine similarity.
+
+    Vectors are L2-normalized on insert and kept in a contiguous float32
+    matrix that grows by doubling. Each of ``num_tables`` hash tables maps
+    the sign pattern of a vector against ``hash_bits`` random hyperplanes
+    to the keys in that bucket; similar vectors agree on most signs, so a
+    query only re-ranks keys found in its own buckets and in the buckets
+    one bit away (multi-probe). Small indexes, where a full scan is
+    cheaper than hashing, are searched exactly. Inserts and removals are
+    incremental; removal moves the last row into the freed slot.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        num_tables: int = 32,
+        hash_bits: int = 14,
+        exact_search_below: int = 256,
+        seed: int = 1
+    ):
+        """
+        Initialize index.
+
+        Args:
+            dimension: Length of indexed vectors
+            num_tables: Number of LSH tables; more tables raise recall
+            hash_bits: Hyperplanes per table; more bits mean smaller buckets
+            exact_search_below: Indexes with fewer vectors are scanned exactly
+            seed: Seed for the random hyperplanes
+        """
+        self.dimension = dimension
+        self.num_tables = num_tables
+        self.hash_bits = hash_bits
+        self.exact_search_below = exact_search_below
+
+        rng = np.random.RandomState(seed)
+        self._planes = rng.standard_normal((num_tables * hash_bits, dimension)).astype(np.float32)
+        self._powers = 1 << np.arange(hash_bits, dtype=np.int64)
+
+        self._matrix = np.zeros((16, dimension), dtype=np.float32)
+        self._keys: List[Hashable] = []
+        self._slot_of: Dict[Hashable, int] = {}
+        self._codes: Dict[Hashable, np.ndarray] = {}
+        self._tables: List[Dict[int, Set[Hashable]]] = [{} for _ in range(num_tables)]
+        self._metrics = {
+            "exact_searches": 0,
+            "approximate_searches": 0,
+            "candidates_scored": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if array.shape[0] != self.dimension:
+            raise ValueError(f"Expected a vector of length {self.dimension}, got {array.shape[0]}")
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _bucket_codes(self, vector: np.ndarray) -> np.ndarray:
+        """One bucket code per table: the vector's side of each hyperplane as bits."""
+        signs = (self._planes @ vector > 0).reshape(self.num_tables, self.hash_bits)
+        return signs.astype(np.int64) @ self._powers
+
+    def add(self, key: Hashable, vector: Sequence[float]):
+        """Insert a vector, replacing any earlier one under the same key."""
+        if key in self._slot_of:
+            self.remove(key)
+        normalized = self._normalize(vector)
+
+        slot = len(self._keys)
+        if slot == len(self._matrix):
+            grown = np.zeros((2 * len(self._matrix), self.dimension), dtype=np.float32)
+            grown[:slot] = self._matrix
+            self._matrix = grown
+        self._matrix[slot] = normalized
+        self._keys.append(key)
+        self._slot_of[key] = slot
+
+        codes = self._bucket_codes(normalized)
+        self._codes[key] = codes
+        for table, code in zip(self._tables, codes.tolist()):
+            table.setdefault(code, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a vector; unknown keys are ignored."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return
+        for table, code in zip(self._tables, self._codes.pop(key).tolist()):
+            bucket = table.get(code)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[code]
+
+        last = len(self._keys) - 1
+        if slot != last:
+            moved = self._keys[last]
+            self._matrix[slot] = self._matrix[last]
+            self._keys[slot] = moved
+            self._slot_of[moved] = slot
+        self._keys.pop()
+
+    def _candidate_slots(self, vector: np.ndarray) -> np.ndarray:
+        candidates: Set[Hashable] = set()
+        for table, code in zip(self._tables, self._bucket_codes(vector).tolist()):
+            candidates.update(table.get(code, ()))
+            for bit in range(self.hash_bits):
+                candidates.update(table.get(code ^ (1 << bit), ()))
+        return np.fromiter((self._slot_of[key] for key in candidates), dtype=np.int64, count=len(candidates))
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int = 5,
+        min_score: Optional[float] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Find the vectors most similar to a query.
+
+        Args:
+            vector: Query vector
+            k: Maximum number of results
+            min_score: Only return matches with at least this cosine similarity
+
+        Returns:
+            (key, cosine similarity) pairs, most similar first
+        """
+        if not self._keys or k <= 0:
+            return []
+        query = self._normalize(vector)
+
+        if len(self._keys) < self.exact_search_below:
+            self._metrics["exact_searches"] += 1
+            slots = np.arange(len(self._keys))
+        else:
+            self._metrics["approximate_searches"] += 1
+            slots = self._candidate_slots(query)
+            if not len(slots):
+                return []
+        self._metrics["candidates_scored"] += len(slots)
+
+        scores = self._matrix[slots] @ query
+        if min_score is not None:
+            keep = scores >= min_score
+            slots, scores = slots[keep], scores[keep]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            slots, scores = slots[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(self._keys[slots[i]], float(scores[i])) for i in order]
+
+    def get_stats(self) -> Dict[str, Any]:
+        searches = self._metrics["exact_searches"] + self._metrics["approximate_searches"]
+        return {
+            **self._metrics,
+            "vectors": len(self._keys),
+            "buckets": sum(len(table) for table in self._tables),
+            "avg_candidates_per_search": self._metrics["candidates_scored"] / searches if searches else 0.0
+        }
@@ -1,9 +1,11 @@
 # ABOUTME: Workflow orchestration system for multi-agent task execution
 # ABOUTME: Provides graph-based workflow management with A2A agent integration
 
+import asyncio
 import json
 import logging
 import uuid
+import weakref
 
 from collections.abc import AsyncIterable
 from enum import Enum
@@ -28,6 +30,21 @@ from a2a_mcp.mcp import client
 
 logger = logging.getLogger(__name__)
 
+# Event loop -> shared HTTP client used for A2A calls from workflow nodes
+_httpx_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_httpx_client() -> httpx.AsyncClient:
+    """Get the keep-alive HTTP client shared by workflow nodes on this loop."""
+    loop = asyncio.get_running_loop()
+    httpx_client = _httpx_clients.get(loop)
+    if httpx_client is None or httpx_client.is_closed:
+        httpx_client = httpx.AsyncClient()
+        _httpx_clients[loop] = httpx_client
+    return httpx_client
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -37,6 +54,7 @@ class Status(Enum):
     COMPLETED = 'COMPLETED'
     PAUSED = 'PAUSED'
     INITIALIZED = 'INITIALIZED'
+    FAILED = 'FAILED'
 
 
 class WorkflowNode:
@@ -96,30 +114,29 @@ class WorkflowNode:
             agent_card = await self.get_planner_resource()
         else:
             agent_card = await self.find_agent_for_task()
-        async with httpx.AsyncClient() as httpx_client:
-            client = A2AClient(httpx_client, agent_card)
-
-            payload: dict[str, any] = {
-                'message': {
-                    'role': 'user',
-                    'parts': [{'kind': 'text', 'text': query}],
-                    'messageId': uuid4().hex,
-                    'taskId': task_id,
-                    'contextId': context_id,
-                },
-            }
-            request = SendStreamingMessageRequest(
-                id=str(uuid4()), params=MessageSendParams(**payload)
-            )
-            response_stream = client.send_message_streaming(request)
-            async for chunk in response_stream:
-                # Save the artifact as a result of the node
-                if isinstance(
-                    chunk.root, SendStreamingMessageSuccessResponse
-                ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
-                    artifact = chunk.root.result.artifact
-                    self.results = artifact
-                yield chunk
+        client = A2AClient(get_shared_httpx_client(), agent_card)
+
+        payload: dict[str, any] = {
+            'message': {
+                'role': 'user',
+                'parts': [{'kind': 'text', 'text': query}],
+                'messageId': uuid4().hex,
+                'taskId': task_id,
+                'contextId': context_id,
+            },
+        }
+        request = SendStreamingMessageRequest(
+            id=str(uuid4()), params=MessageSendParams(**payload)
+        )
+        response_stream = client.send_message_streaming(request)
+        async for chunk in response_stream:
+            # Save the artifact as a result of the node
+            if isinstance(
+                chunk.root, SendStreamingMessageSuccessResponse
+            ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
+                artifact = chunk.root.result.artifact
+                self.results = artifact
+            yield chunk
 
 
 class WorkflowGraph:
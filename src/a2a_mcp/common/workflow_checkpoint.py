@@ -0,0 +1,280 @@
+# ABOUTME: Durable checkpoint stores for dynamic workflow graphs and orchestrator checkpoints
+# ABOUTME: Provides the CheckpointStore interface and a local SQLite implementation
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> str:
+    # Results and contexts may hold arbitrary objects; keep what JSON can't as text
+    return json.dumps(value, default=str)
+
+
+def _flush_at_exit(store_ref: "weakref.ref[SQLiteCheckpointStore]"):
+    # The writer is a daemon thread; commit what it still has queued before exit
+    store = store_ref()
+    if store is not None:
+        store.flush()
+
+
+class CheckpointStore(ABC):
+    """
+    Storage interface for workflow progress.
+
+    A store keeps one record per workflow, one record per node and the
+    orchestrator's pause checkpoints per session. Node records are written
+    on every state transition, so after a restart a graph can be rebuilt
+    with all completed nodes and their results.
+    """
+
+    @abstractmethod
+    def save_workflow(self, record: Dict[str, Any]):
+        """Insert or replace the workflow-level record (keyed by ``workflow_id``)."""
+
+    @abstractmethod
+    def save_node(self, workflow_id: str, record: Dict[str, Any]):
+        """Insert or replace one node record (keyed by ``id``)."""
+
+    @abstractmethod
+    def delete_node(self, workflow_id: str, node_id: str):
+        """Remove a node record."""
+
+    @abstractmethod
+    def load_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a workflow.
+
+        Returns:
+            ``{'workflow': record, 'nodes': [records]}`` or None if unknown
+        """
+
+    @abstractmethod
+    def delete_workflow(self, workflow_id: str):
+        """Remove a workflow and all its nodes."""
+
+    @abstractmethod
+    def list_workflows(self, state: Optional[str] = None) -> List[str]:
+        """Workflow IDs, optionally only those in the given state."""
+
+    @abstractmethod
+    def save_checkpoint(self, session_id: str, checkpoint: Dict[str, Any]):
+        """Append an orchestrator checkpoint (keyed by ``checkpoint_id``) to a session."""
+
+    @abstractmethod
+    def load_checkpoints(self, session_id: str) -> List[Dict[str, Any]]:
+        """A session's checkpoints, oldest first."""
+
+    @abstractmethod
+    def delete_checkpoints(self, session_id: str):
+        """Remove all checkpoints of a session."""
+
+    def close(self):
+        """Release any resources held by the store."""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store backed by a local SQLite database.
+
+    Writes are called from node transitions on the orchestrator's event
+    loop, so by default they only serialize the record and queue it; a
+    single writer thread applies queued writes in order, committing
+    everything queued so far in one transaction. The database is in WAL
+    mode, so a crash loses at most the writes still queued. Reads wait
+    for queued writes first and therefore always see them. One connection
+    is shared across threads behind a lock.
+    """
+
+    def __init__(
+        self,
+        path: str = "workflow_checkpoints.db",
+        max_checkpoints_per_session: int = 10,
+        background_writes: bool = True
+    ):
+        """
+        Initialize store.
+
+        Args:
+            path: Database file, or ``:memory:`` for a private in-memory database
+            max_checkpoints_per_session: Older orchestrator checkpoints are pruned
+            background_writes: Apply writes on a writer thread; when False,
+                every write is committed before the call returns
+        """
+        self.path = path
+        self.max_checkpoints_per_session = max_checkpoints_per_session
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+        self._writes: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if background_writes:
+            self._writes = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._write_loop, name="checkpoint-writer", daemon=True
+            )
+            self._writer.start()
+            atexit.register(_flush_at_exit, weakref.ref(self))
+        logger.info(f"Opened workflow checkpoint store at {path}")
+
+    def _write(self, *statements: Tuple[str, Sequence[Any]]):
+        """Apply statements as one unit, now or on the writer thread."""
+        if self._writes is None:
+            with self._lock, self._conn:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+            return
+        self._writes.put(statements)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                with self._lock, self._conn:
+                    for statements in batch:
+                        for sql, params in statements or ():
+                            self._conn.execute(sql, params)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} checkpoint updates: {e}")
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Wait until every queued write has been committed."""
+        if self._writer is not None and self._writer.is_alive():
+            self._writes.join()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS workflows (
+                    workflow_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS workflow_nodes (
+                    workflow_id TEXT NOT NULL,
+                    node_id TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (workflow_id, node_id)
+                );
+                CREATE TABLE IF NOT EXISTS execution_checkpoints (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    checkpoint_id TEXT NOT NULL UNIQUE,
+                    session_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_checkpoints_session
+                    ON execution_checkpoints (session_id, seq);
+            """)
+
+    def save_workflow(self, record: Dict[str, Any]):
+        self._write((
+            "INSERT OR REPLACE INTO workflows (workflow_id, state, data, updated_at) VALUES (?, ?, ?, ?)",
+            (record['workflow_id'], record['state'], _dumps(record), datetime.now().isoformat())
+        ))
+
+    def save_node(self, workflow_id: str, record: Dict[str, Any]):
+        self._write((
+            "INSERT OR REPLACE INTO workflow_nodes (workflow_id, node_id, state, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (workflow_id, record['id'], record['state'], _dumps(record), datetime.now().isoformat())
+        ))
+
+    def delete_node(self, workflow_id: str, node_id: str):
+        self._write((
+            "DELETE FROM workflow_nodes WHERE workflow_id = ? AND node_id = ?",
+            (workflow_id, node_id)
+        ))
+
+    def load_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM workflows WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            node_rows = self._conn.execute(
+                "SELECT data FROM workflow_nodes WHERE workflow_id = ? ORDER BY rowid", (workflow_id,)
+            ).fetchall()
+        return {
+            'workflow': json.loads(row[0]),
+            'nodes': [json.loads(data) for (data,) in node_rows]
+        }
+
+    def delete_workflow(self, workflow_id: str):
+        self._write(
+            ("DELETE FROM workflow_nodes WHERE workflow_id = ?", (workflow_id,)),
+            ("DELETE FROM workflows WHERE workflow_id = ?", (workflow_id,))
+        )
+
+    def list_workflows(self, state: Optional[str] = None) -> List[str]:
+        self.flush()
+        with self._lock:
+            if state is None:
+                rows = self._conn.execute("SELECT workflow_id FROM workflows ORDER BY updated_at").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT workflow_id FROM workflows WHERE state = ? ORDER BY updated_at", (state,)
+                ).fetchall()
+        return [workflow_id for (workflow_id,) in rows]
+
+    def save_checkpoint(self, session_id: str, checkpoint: Dict[str, Any]):
+        statements = [(
+            "INSERT OR REPLACE INTO execution_checkpoints (checkpoint_id, session_id, data, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (checkpoint['checkpoint_id'], session_id, _dumps(checkpoint),
+             checkpoint.get('timestamp') or datetime.now().isoformat())
+        )]
+        if self.max_checkpoints_per_session:
+            statements.append((
+                "DELETE FROM execution_checkpoints WHERE session_id = ? AND seq NOT IN ("
+                "SELECT seq FROM execution_checkpoints WHERE session_id = ? ORDER BY seq DESC LIMIT ?)",
+                (session_id, session_id, self.max_checkpoints_per_session)
+            ))
+        self._write(*statements)
+
+    def load_checkpoints(self, session_id: str) -> List[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM execution_checkpoints WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def delete_checkpoints(self, session_id: str):
+        self._write(("DELETE FROM execution_checkpoints WHERE session_id = ?", (session_id,)))
+
+    def close(self):
+        """Commit queued writes, stop the writer thread and close the database."""
+        if self._writer is not None and self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
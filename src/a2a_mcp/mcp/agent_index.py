@@ -0,0 +1,182 @@
+# ABOUTME: Immutable cosine-similarity index over agent card embeddings
+# ABOUTME: Prebuilt normalized float32 matrix with top-k and batch query retrieval
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AgentMatch:
+    """One scored candidate returned by an AgentIndex query."""
+    card_uri: str
+    score: float
+    agent_card: Dict[str, Any]
+    position: int
+
+    def card_with_score(self) -> Dict[str, Any]:
+        """Copy of the agent card with its ``_match_score`` added."""
+        card = dict(self.agent_card)
+        card['_match_score'] = self.score
+        return card
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'card_uri': self.card_uri,
+            'score': self.score,
+            'agent_card': self.agent_card
+        }
+
+
+class AgentIndex:
+    """
+    Immutable cosine-similarity index over agent card embeddings.
+
+    Embeddings are L2-normalized once at build time into a contiguous,
+    read-only float32 matrix, so each query costs one matrix-vector
+    product and an ``argpartition`` for the top k. Scores are cosine
+    similarities and do not depend on embedding magnitude. A new index
+    is built whenever the cards change; an existing one never mutates,
+    which makes it safe to share between concurrent readers.
+    """
+
+    def __init__(
+        self,
+        card_uris: Sequence[str],
+        agent_cards: Sequence[Dict[str, Any]],
+        embeddings: Any,
+        min_score: float = -1.0
+    ):
+        """
+        Build index.
+
+        Args:
+            card_uris: Resource URI of each card
+            agent_cards: Card data, aligned with ``card_uris``
+            embeddings: One embedding per card, shape (n, d)
+            min_score: Default similarity floor for queries
+
+        Raises:
+            ValueError: If the inputs are misaligned or not two-dimensional
+        """
+        if not (len(card_uris) == len(agent_cards) == len(embeddings)):
+            raise ValueError(
+                f"Misaligned index inputs: {len(card_uris)} uris, "
+                f"{len(agent_cards)} cards, {len(embeddings)} embeddings"
+            )
+
+        if len(embeddings):
+            matrix = np.array(embeddings, dtype=np.float32)
+            if matrix.ndim != 2:
+                raise ValueError(f"Embeddings must be two-dimensional, got shape {matrix.shape}")
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        matrix = np.ascontiguousarray(matrix)
+        matrix.setflags(write=False)
+
+        self._matrix = matrix
+        self._card_uris = tuple(card_uris)
+        self._agent_cards = tuple(agent_cards)
+        self.min_score = min_score
+
+    @classmethod
+    def empty(cls) -> 'AgentIndex':
+        return cls([], [], [])
+
+    def __len__(self) -> int:
+        return len(self._card_uris)
+
+    @property
+    def dimension(self) -> int:
+        return self._matrix.shape[1]
+
+    @property
+    def card_uris(self) -> tuple:
+        return self._card_uris
+
+    @property
+    def agent_cards(self) -> tuple:
+        return self._agent_cards
+
+    def search(
+        self,
+        query_embedding: Any,
+        top_k: int = 1,
+        min_score: Optional[float] = None
+    ) -> List[AgentMatch]:
+        """
+        Find the cards most similar to one query embedding.
+
+        Args:
+            query_embedding: Query vector of the index dimension
+            top_k: Maximum number of candidates
+            min_score: Similarity floor; the index default when None
+
+        Returns:
+            Candidates ordered by descending cosine similarity
+        """
+        return self.search_batch([query_embedding], top_k=top_k, min_score=min_score)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Any,
+        top_k: int = 1,
+        min_score: Optional[float] = None
+    ) -> List[List[AgentMatch]]:
+        """
+        Find the most similar cards for several queries in one product.
+
+        Args:
+            query_embeddings: Query vectors, shape (m, d)
+            top_k: Maximum number of candidates per query
+            min_score: Similarity floor; the index default when None
+
+        Returns:
+            One candidate list per query, each by descending similarity
+
+        Raises:
+            ValueError: If the query dimension does not match the index
+        """
+        queries = np.array(query_embeddings, dtype=np.float32, ndmin=2)
+        if len(self) == 0 or queries.shape[0] == 0 or top_k < 1:
+            return [[] for _ in range(queries.shape[0])]
+        if queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match index dimension {self.dimension}"
+            )
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        np.divide(queries, norms, out=queries, where=norms > 0)
+        scores = queries @ self._matrix.T
+
+        k = min(top_k, len(self))
+        if k < len(self):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        floor = self.min_score if min_score is None else min_score
+        results = []
+        for positions, row_scores in zip(top, top_scores):
+            results.append([
+                AgentMatch(
+                    card_uri=self._card_uris[position],
+                    score=float(score),
+                    agent_card=self._agent_cards[position],
+                    position=int(position)
+                )
+                for position, score in zip(positions, row_scores)
+                if score >= floor
+            ])
+        return results
@@ -0,0 +1,310 @@
+# ABOUTME: Single registry of agent cards with their embeddings and similarity index
+# ABOUTME: Watches the cards directory and atomically swaps in a rebuilt snapshot on change
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from a2a_mcp.common.embeddings import CachedEmbedder, content_hash
+from a2a_mcp.mcp.agent_index import AgentIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CardEntry:
+    """One loaded agent card and the file it came from."""
+    card_uri: str
+    path: str
+    signature: Tuple[int, int]  # (mtime_ns, size) of the file when read
+    agent_card: Dict[str, Any]
+    text: str
+    embedding: np.ndarray
+    card_json: str  # Pre-serialized card
+    resource_json: str  # Pre-serialized {"agent_card": ...} resource payload
+
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def _normalize_url(url: str) -> str:
+    return url.strip().rstrip('/').lower()
+
+
+@dataclass(frozen=True)
+class CardSnapshot:
+    """Immutable view of all agent cards at one point in time.
+
+    Besides the card entries keyed by URI, a snapshot holds hash indexes by
+    card name, URL and skill tag, built once with the snapshot, so every
+    lookup is a dict read returning an entry with its pre-serialized JSON.
+    """
+    version: int = 0
+    entries: Mapping[str, CardEntry] = field(default_factory=lambda: _EMPTY)
+    index: AgentIndex = field(default_factory=AgentIndex.empty)
+    by_name: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+    by_url: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+    by_skill_tag: Mapping[str, Tuple[str, ...]] = field(default_factory=lambda: _EMPTY)
+    list_json: str = '{"agent_cards": []}'
+
+    @property
+    def card_uris(self) -> List[str]:
+        return list(self.entries)
+
+    @property
+    def agent_cards(self) -> List[Dict[str, Any]]:
+        return [entry.agent_card for entry in self.entries.values()]
+
+    def get(self, card_uri: str) -> Optional[CardEntry]:
+        return self.entries.get(card_uri)
+
+    def get_by_name(self, name: str) -> Optional[CardEntry]:
+        """Look up a card by its ``name`` field, ignoring case."""
+        card_uri = self.by_name.get(name.casefold())
+        return self.entries.get(card_uri) if card_uri else None
+
+    def get_by_url(self, url: str) -> Optional[CardEntry]:
+        """Look up a card by its ``url`` field, ignoring case and trailing slashes."""
+        card_uri = self.by_url.get(_normalize_url(url))
+        return self.entries.get(card_uri) if card_uri else None
+
+    def find_by_skill_tag(self, tag: str) -> List[CardEntry]:
+        """All cards with a skill carrying the given tag, ignoring case."""
+        return [self.entries[uri] for uri in self.by_skill_tag.get(tag.casefold(), ())]
+
+    def resolve(self, card_name: str) -> Optional[CardEntry]:
+        """Look up a card by resource name (file stem), falling back to card name."""
+        return self.entries.get(f'resource://agent_cards/{card_name}') or self.get_by_name(card_name)
+
+
+class AgentCardRegistry:
+    """
+    Single source of agent cards, embeddings and the similarity index.
+
+    ``refresh`` rescans the cards directory, reads and re-embeds only files
+    whose modification time or size changed, drops deleted cards and, if
+    anything changed, publishes a new ``CardSnapshot``. Snapshots are
+    replaced by a single attribute assignment, so a reader holding
+    ``registry.snapshot`` always sees one complete, consistent version.
+    ``start_watching`` polls the directory in a daemon thread.
+    """
+
+    def __init__(
+        self,
+        cards_dir: str,
+        embedder: CachedEmbedder,
+        min_score: float = -1.0,
+        poll_interval: float = 2.0
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            cards_dir: Directory holding agent card JSON files
+            embedder: Embedder used for new and changed cards
+            min_score: Default similarity floor of the built index
+            poll_interval: Seconds between directory scans when watching
+        """
+        self.cards_dir = cards_dir
+        self.embedder = embedder
+        self.min_score = min_score
+        self.poll_interval = poll_interval
+
+        self._snapshot = CardSnapshot()
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._metrics = {
+            "reloads": 0,
+            "cards_embedded": 0,
+            "cards_removed": 0,
+            "read_errors": 0
+        }
+
+    @property
+    def snapshot(self) -> CardSnapshot:
+        """Current snapshot; hold on to it for a consistent view."""
+        return self._snapshot
+
+    def ensure_loaded(self, watch: bool = True) -> CardSnapshot:
+        """Load the cards on first use and optionally start watching."""
+        if not self._loaded:
+            self.refresh()
+        if watch:
+            self.start_watching()
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """
+        Rescan the cards directory and publish a new snapshot on change.
+
+        Returns:
+            True if a new snapshot was published
+        """
+        with self._refresh_lock:
+            first_load = not self._loaded
+            self._loaded = True
+            current = self._snapshot
+            files = self._scan()
+
+            entries: Dict[str, CardEntry] = {}
+            changed: List[Tuple[str, str, Tuple[int, int], Dict[str, Any]]] = []
+            for card_uri, (path, signature) in files.items():
+                previous = current.entries.get(card_uri)
+                if previous is not None and previous.path == path and previous.signature == signature:
+                    entries[card_uri] = previous
+                    continue
+                agent_card = self._read_card(path)
+                if agent_card is None:
+                    # Keep the last good version, e.g. while a file is being written
+                    if previous is not None:
+                        entries[card_uri] = previous
+                    continue
+                changed.append((card_uri, path, signature, agent_card))
+
+            removed = [uri for uri in current.entries if uri not in files]
+            if not changed and not removed and not first_load:
+                return False
+
+            if changed:
+                texts = [json.dumps(card, sort_keys=True) for _, _, _, card in changed]
+                embeddings = self.embedder.embed(texts)
+                for (card_uri, path, signature, card), text, embedding in zip(changed, texts, embeddings):
+                    card_json = json.dumps(card)
+                    entries[card_uri] = CardEntry(
+                        card_uri, path, signature, card, text, embedding,
+                        card_json=card_json,
+                        resource_json=f'{{"agent_card": {card_json}}}'
+                    )
+                self._metrics["cards_embedded"] += len(changed)
+            self._metrics["cards_removed"] += len(removed)
+
+            ordered = {uri: entries[uri] for uri in sorted(entries)}
+            self._snapshot = self._build_snapshot(current.version + 1, ordered)
+            self._metrics["reloads"] += 1
+            self._persist_embeddings(ordered.values())
+
+            logger.info(
+                f"Agent card registry v{self._snapshot.version}: {len(ordered)} cards "
+                f"({len(changed)} embedded, {len(removed)} removed)"
+            )
+            return True
+
+    def _build_snapshot(self, version: int, entries: Dict[str, CardEntry]) -> CardSnapshot:
+        if entries:
+            index = AgentIndex(
+                card_uris=list(entries),
+                agent_cards=[entry.agent_card for entry in entries.values()],
+                embeddings=np.stack([entry.embedding for entry in entries.values()]),
+                min_score=self.min_score
+            )
+        else:
+            index = AgentIndex.empty()
+
+        by_name: Dict[str, str] = {}
+        by_url: Dict[str, str] = {}
+        by_skill_tag: Dict[str, List[str]] = {}
+        for card_uri, entry in entries.items():
+            card = entry.agent_card
+            if isinstance(card.get('name'), str):
+                by_name.setdefault(card['name'].casefold(), card_uri)
+            if isinstance(card.get('url'), str):
+                by_url.setdefault(_normalize_url(card['url']), card_uri)
+            tags = {
+                tag.casefold()
+                for skill in card.get('skills') or []
+                if isinstance(skill, dict)
+                for tag in skill.get('tags') or []
+                if isinstance(tag, str)
+            }
+            for tag in tags:
+                by_skill_tag.setdefault(tag, []).append(card_uri)
+
+        return CardSnapshot(
+            version=version,
+            entries=MappingProxyType(entries),
+            index=index,
+            by_name=MappingProxyType(by_name),
+            by_url=MappingProxyType(by_url),
+            by_skill_tag=MappingProxyType({tag: tuple(uris) for tag, uris in by_skill_tag.items()}),
+            list_json=json.dumps({'agent_cards': list(entries)})
+        )
+
+    def _scan(self) -> Dict[str, Tuple[str, Tuple[int, int]]]:
+        """Map card URI to (path, signature) for every JSON file in the directory."""
+        files = {}
+        try:
+            with os.scandir(self.cards_dir) as it:
+                for entry in it:
+                    if not entry.name.lower().endswith('.json') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    card_uri = f'resource://agent_cards/{Path(entry.name).stem}'
+                    files[card_uri] = (entry.path, (stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            logger.warning(f'Agent cards directory not found: {self.cards_dir}')
+        except NotADirectoryError:
+            logger.warning(f'Agent cards path is not a directory: {self.cards_dir}')
+        return files
+
+    def _read_card(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError as jde:
+            logger.error(f'JSON Decoder Error in {path}: {jde}')
+        except OSError as e:
+            logger.error(f'Error reading file {path}: {e}')
+        self._metrics["read_errors"] += 1
+        return None
+
+    def _persist_embeddings(self, entries):
+        """Drop cached vectors of removed cards and save the cache."""
+        cache = self.embedder.cache
+        cache.prune([
+            content_hash(entry.text, model_name)
+            for entry in entries
+            for model_name in (self.embedder.model_name, self.embedder.fallback_model_name)
+        ])
+        cache.save()
+
+    def start_watching(self):
+        """Poll the cards directory for changes in a background thread."""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, name='agent-card-watcher', daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self, timeout: float = 5.0):
+        """Stop the background watcher."""
+        self._stop_event.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout)
+            self._watch_thread = None
+
+    def _watch_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f'Agent card reload failed: {e}', exc_info=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self._metrics,
+            "version": snapshot.version,
+            "cards": len(snapshot.entries),
+            "watching": self._watch_thread is not None and self._watch_thread.is_alive()
+        }
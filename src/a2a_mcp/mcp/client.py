@@ -15,6 +15,8 @@ from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.types import CallToolResult, ReadResourceResult
 
+from a2a_mcp.mcp.session_pool import MCPSessionPool, get_mcp_session_pool
+
 logger = get_logger(__name__)
 
 
@@ -26,12 +28,20 @@ class GenericMCPClient:
     tools/resources. Domains can extend this class or use it directly.
     """
     
-    def __init__(self, server_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        server_config: Optional[Dict[str, Any]] = None,
+        use_session_pool: bool = True,
+        session_pool: Optional[MCPSessionPool] = None
+    ):
         """
         Initialize the generic MCP client.
         
         Args:
             server_config: Optional server configuration override
+            use_session_pool: Lease long-lived sessions from the shared pool
+                instead of connecting on every init_session call
+            session_pool: Custom session pool (uses global pool if None)
         """
         self.server_config = server_config or {
             'host': 'localhost',
@@ -42,6 +52,9 @@ class GenericMCPClient:
             'env_vars': ['GOOGLE_API_KEY']
         }
         
+        self.use_session_pool = use_session_pool
+        self._session_pool = session_pool
+        
         # Build environment with required variables
         self.env = {}
         for var in self.server_config.get('env_vars', []):
@@ -59,6 +72,10 @@ class GenericMCPClient:
         It handles the setup and teardown of the connection and yields an active
         `ClientSession` object ready for communication.
 
+        With session pooling enabled (the default), the session is leased from
+        the process-wide `MCPSessionPool` and stays open for later callers, so
+        the transport handshake and `initialize` round trip happen once.
+
         Args:
             host: The hostname or IP address of the MCP server (used for SSE).
             port: The port number of the MCP server (used for SSE).
@@ -76,6 +93,31 @@ class GenericMCPClient:
         port = port or self.server_config['port']
         transport = transport or self.server_config['transport']
         
+        if not self.use_session_pool:
+            async with self._open_session(host, port, transport) as session:
+                yield session
+            return
+        
+        pool = self._session_pool or get_mcp_session_pool()
+        async with pool.lease(
+            self._session_key(host, port, transport),
+            lambda: self._open_session(host, port, transport)
+        ) as session:
+            yield session
+
+    def _session_key(self, host: str, port: int, transport: str) -> tuple:
+        """Pool key identifying a server by transport and address."""
+        if transport == 'stdio':
+            return (
+                'stdio',
+                self.server_config.get('command', 'uv'),
+                tuple(self.server_config.get('args', ['run', 'a2a-mcp']))
+            )
+        return (transport, host, port)
+
+    @asynccontextmanager
+    async def _open_session(self, host: str, port: int, transport: str):
+        """Open a new, initialized MCP session over the given transport."""
         if transport == 'sse':
             url = f'http://{host}:{port}/sse'
             async with sse_client(url) as (read_stream, write_stream):
@@ -186,13 +228,20 @@ class GenericMCPClient:
 
 
 # Legacy function wrappers for backward compatibility
+@asynccontextmanager
 async def init_session(host, port, transport):
-    """Legacy function wrapper for backward compatibility."""
+    """Legacy function wrapper for backward compatibility (uses the session pool)."""
     client = GenericMCPClient()
     async with client.init_session(host, port, transport) as session:
         yield session
 
 
+async def find_resource(session: ClientSession, resource: str) -> ReadResourceResult:
+    """Legacy resource reader used by workflow nodes."""
+    logger.info(f'Reading resource: {resource}')
+    return await session.read_resource(resource)
+
+
 # Domain-specific tool functions (examples that domains can customize)
 async def find_agent(session: ClientSession, query: str) -> CallToolResult:
     """
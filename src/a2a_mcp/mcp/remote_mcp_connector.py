@@ -3,9 +3,11 @@
 import asyncio
 import json
 import logging
+import re
+import time
 from typing import Dict, List, Optional, Any
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from mcp import ClientSession
 from mcp.client.sse import sse_client
@@ -18,6 +20,8 @@ from mcp.types import (
     ServerCapabilities
 )
 
+from a2a_mcp.mcp.session_pool import MCPSessionPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,13 +44,32 @@ class RemoteMCPServer:
 
 
 class RemoteMCPConnector:
-    """Manages connections to multiple remote MCP servers."""
+    """Manages connections to multiple remote MCP servers.
+
+    Each registered server gets one long-lived session held in an
+    ``MCPSessionPool``. For stdio servers that means one supervised child
+    process: it is started lazily on first use, shared by every call,
+    restarted with exponential backoff when it crashes and stopped after
+    ``idle_timeout`` seconds without use.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        session_pool: Optional[MCPSessionPool] = None,
+        idle_timeout: float = 300.0,
+        restart_backoff: float = 0.5,
+        max_restart_backoff: float = 30.0
+    ):
         self.servers: Dict[str, RemoteMCPServer] = {}
         self.sessions: Dict[str, ClientSession] = {}
         self.tools_cache: Dict[str, List[Tool]] = {}
         self.resources_cache: Dict[str, List[Resource]] = {}
+        self.capabilities: Dict[str, Any] = {}
+        self.session_pool = session_pool or MCPSessionPool(
+            idle_timeout=idle_timeout,
+            restart_backoff=restart_backoff,
+            max_restart_backoff=max_restart_backoff
+        )
     
     def register_server(self, server: RemoteMCPServer):
         """Register a remote MCP server."""
@@ -67,81 +90,127 @@ class RemoteMCPConnector:
             )
             self.register_server(server)
     
+    def _session_key(self, server: RemoteMCPServer) -> tuple:
+        """Pool key for a server; changes when its configuration changes."""
+        if server.transport == 'stdio':
+            return (
+                'remote', server.name, 'stdio', server.command,
+                tuple(server.args or []), tuple(sorted((server.env or {}).items()))
+            )
+        return ('remote', server.name, server.transport, server.url)
+    
     @asynccontextmanager
     async def connect_server(self, server_name: str):
-        """Connect to a specific remote MCP server."""
+        """Lease the long-lived session of a remote MCP server.
+
+        The server process or connection is started on first use and kept
+        open for later calls; leaving the context does not close it.
+        """
         if server_name not in self.servers:
             raise ValueError(f"Server '{server_name}' not registered")
         
         server = self.servers[server_name]
+        if server.transport not in ('sse', 'stdio'):
+            raise ValueError(f"Unsupported transport: {server.transport}")
         
-        if server.transport == 'sse':
-            async with sse_client(server.url) as (read_stream, write_stream):
-                async with ClientSession(
-                    read_stream=read_stream,
-                    write_stream=write_stream
-                ) as session:
-                    logger.info(f"Connected to SSE server: {server_name}")
-                    await session.initialize()
-                    self.sessions[server_name] = session
-                    
-                    # Cache available tools and resources
-                    await self._cache_server_capabilities(server_name, session)
-                    
-                    yield session
+        async with self.session_pool.lease(
+            self._session_key(server),
+            lambda: self._open_server_session(server)
+        ) as session:
+            yield session
+    
+    @asynccontextmanager
+    async def _open_server_session(self, server: RemoteMCPServer):
+        """Open, initialize and cache capabilities for one server session."""
+        server_name = server.name
         
-        elif server.transport == 'stdio':
+        if server.transport == 'sse':
+            transport = sse_client(server.url)
+        else:
             stdio_params = StdioServerParameters(
                 command=server.command,
                 args=server.args or [],
                 env=server.env or {}
             )
-            async with stdio_client(stdio_params) as (read_stream, write_stream):
-                async with ClientSession(
-                    read_stream=read_stream,
-                    write_stream=write_stream
-                ) as session:
-                    logger.info(f"Connected to stdio server: {server_name}")
-                    await session.initialize()
-                    self.sessions[server_name] = session
-                    
-                    # Cache available tools and resources
-                    await self._cache_server_capabilities(server_name, session)
-                    
-                    yield session
+            transport = stdio_client(stdio_params)
         
-        else:
-            raise ValueError(f"Unsupported transport: {server.transport}")
-        
-        # Clean up after disconnect
-        if server_name in self.sessions:
-            del self.sessions[server_name]
-        if server_name in self.tools_cache:
-            del self.tools_cache[server_name]
-        if server_name in self.resources_cache:
-            del self.resources_cache[server_name]
-    
-    async def _cache_server_capabilities(self, server_name: str, session: ClientSession):
-        """Cache the tools and resources available from a server."""
+        async with transport as (read_stream, write_stream):
+            async with ClientSession(
+                read_stream=read_stream,
+                write_stream=write_stream
+            ) as session:
+                logger.info(f"Connected to {server.transport} server: {server_name}")
+                init_result = await session.initialize()
+                self.sessions[server_name] = session
+                
+                # Cache available tools and resources once per session
+                await self._cache_server_capabilities(server_name, session, init_result)
+                
+                try:
+                    yield session
+                finally:
+                    if self.sessions.get(server_name) is session:
+                        del self.sessions[server_name]
+                    logger.info(f"Disconnected from {server.transport} server: {server_name}")
+    
+    async def _cache_server_capabilities(
+        self,
+        server_name: str,
+        session: ClientSession,
+        init_result: Any
+    ):
+        """Cache the tools and resources available from a server.
+
+        Uses the capabilities from the session's initialize result instead
+        of initializing a second time.
+        """
+        capabilities = getattr(init_result, 'capabilities', None)
+        self.capabilities[server_name] = capabilities
         try:
-            # Get server capabilities
-            result = await session.initialize()
-            
             # Cache tools
-            if hasattr(result, 'capabilities') and hasattr(result.capabilities, 'tools'):
-                tools = result.capabilities.tools
-                self.tools_cache[server_name] = tools if tools else []
+            if capabilities is not None and getattr(capabilities, 'tools', None):
+                tools_result = await session.list_tools()
+                self.tools_cache[server_name] = tools_result.tools or []
                 logger.info(f"Cached {len(self.tools_cache[server_name])} tools from {server_name}")
             
             # Cache resources
-            if hasattr(result, 'capabilities') and hasattr(result.capabilities, 'resources'):
-                resources = result.capabilities.resources
-                self.resources_cache[server_name] = resources if resources else []
+            if capabilities is not None and getattr(capabilities, 'resources', None):
+                resources_result = await session.list_resources()
+                self.resources_cache[server_name] = resources_result.resources or []
                 logger.info(f"Cached {len(self.resources_cache[server_name])} resources from {server_name}")
                 
         except Exception as e:
             logger.error(f"Error caching capabilities for {server_name}: {e}")
     
+    async def refresh_server_capabilities(self, server_name: str) -> Dict[str, List[Any]]:
+        """List a server's tools and resources again over its pooled session."""
+        async with self.connect_server(server_name) as session:
+            capabilities = self.capabilities.get(server_name)
+            if capabilities is None or getattr(capabilities, 'tools', None):
+                tools_result = await session.list_tools()
+                self.tools_cache[server_name] = tools_result.tools or []
+            if capabilities is not None and getattr(capabilities, 'resources', None):
+                resources_result = await session.list_resources()
+                self.resources_cache[server_name] = resources_result.resources or []
+        return {
+            'tools': self.tools_cache.get(server_name, []),
+            'resources': self.resources_cache.get(server_name, [])
+        }
+    
+    async def disconnect_server(self, server_name: str):
+        """Close a server's session and stop its process, if running."""
+        server = self.servers.get(server_name)
+        if server is not None:
+            await self.session_pool.close(self._session_key(server))
+    
+    async def close(self):
+        """Close every server session and stop all child processes."""
+        await self.session_pool.close_all()
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get session pool metrics for the registered servers."""
+        return self.session_pool.get_stats()
+    
     async def call_remote_tool(
         self, 
         server_name: str, 
@@ -237,11 +306,47 @@ class RemoteMCPConnector:
             return 'other'
 
 
+@dataclass
+class ServerCapabilityEntry:
+    """Cached capabilities of one remote MCP server."""
+    server: str
+    tools: List[Any] = field(default_factory=list)
+    resources: List[Any] = field(default_factory=list)
+    status: str = 'pending'  # 'pending', 'ok', 'error' or 'timeout'
+    error: Optional[str] = None
+    version: int = 0
+    refreshed_at: Optional[float] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        age = None if self.refreshed_at is None else round(time.monotonic() - self.refreshed_at, 1)
+        return {
+            'status': self.status,
+            'error': self.error,
+            'version': self.version,
+            'age_seconds': age,
+            'tools': [tool.model_dump() if hasattr(tool, 'model_dump') else tool for tool in self.tools]
+        }
+
+
 class RemoteMCPRegistry:
-    """Registry for managing multiple remote MCP connectors."""
+    """Registry for managing multiple remote MCP connectors.
+
+    Server capabilities are discovered concurrently with a timeout per
+    server and kept in a versioned cache. A background task refreshes
+    the cache every ``refresh_interval`` seconds, so tool listings are
+    served from memory and a slow or offline server only marks its own
+    entry as failed, keeping the last known tools.
+    """
     
-    def __init__(self):
+    def __init__(self, discovery_timeout: float = 10.0, refresh_interval: float = 300.0):
         self.connector = RemoteMCPConnector()
+        self.discovery_timeout = discovery_timeout
+        self.refresh_interval = refresh_interval
+        self.catalog_version = 0
+        self._capabilities: Dict[str, ServerCapabilityEntry] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._stale_refresh_task: Optional[asyncio.Task] = None
+        self._discovery_lock: Optional[asyncio.Lock] = None
         self._load_servers_from_config()
     
     def _load_servers_from_config(self):
@@ -283,66 +388,301 @@ class RemoteMCPRegistry:
         except Exception as e:
             logger.error(f"Error registering default servers: {e}")
     
-    async def get_all_available_tools(self) -> Dict[str, Any]:
-        """Get all available tools from all registered servers."""
-        all_tools = {}
+    async def discover_capabilities(
+        self,
+        server_names: Optional[List[str]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, ServerCapabilityEntry]:
+        """Query servers concurrently and update the capability cache.
+
+        Args:
+            server_names: Servers to query; all registered servers by default
+            timeout: Seconds allowed per server; ``discovery_timeout`` by default
+
+        Returns:
+            Cache entries of the queried servers, including failed ones
+        """
+        if self._discovery_lock is None:
+            self._discovery_lock = asyncio.Lock()
+        names = list(server_names) if server_names is not None else list(self.connector.servers)
+        timeout = timeout if timeout is not None else self.discovery_timeout
         
-        for server_name in self.connector.servers:
+        async with self._discovery_lock:
+            await asyncio.gather(*(self._discover_server(name, timeout) for name in names))
+        return {name: self._capabilities[name] for name in names}
+    
+    async def _discover_server(self, server_name: str, timeout: float):
+        """Refresh one server's cache entry, keeping old tools on failure."""
+        entry = self._capabilities.get(server_name)
+        if entry is None:
+            entry = self._capabilities[server_name] = ServerCapabilityEntry(server=server_name)
+        try:
+            listing = await asyncio.wait_for(
+                self.connector.refresh_server_capabilities(server_name),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Capability discovery timed out for {server_name} after {timeout}s")
+            entry.status = 'timeout'
+            entry.error = f"No response within {timeout}s"
+            return
+        except Exception as e:
+            logger.error(f"Error getting tools from {server_name}: {e}")
+            entry.status = 'error'
+            entry.error = str(e)
+            return
+        
+        if (entry.version == 0
+                or self._catalog_names(listing['tools']) != self._catalog_names(entry.tools)
+                or self._catalog_names(listing['resources']) != self._catalog_names(entry.resources)):
+            entry.version += 1
+            self.catalog_version += 1
+        entry.tools = listing['tools']
+        entry.resources = listing['resources']
+        entry.status = 'ok'
+        entry.error = None
+        entry.refreshed_at = time.monotonic()
+    
+    @staticmethod
+    def _catalog_names(items: List[Any]) -> List[str]:
+        return sorted(str(getattr(item, 'name', None) or getattr(item, 'uri', item)) for item in items)
+    
+    def _is_stale(self, entry: Optional[ServerCapabilityEntry]) -> bool:
+        return (
+            entry is None
+            or entry.refreshed_at is None
+            or time.monotonic() - entry.refreshed_at > self.refresh_interval
+        )
+    
+    def start_background_refresh(self):
+        """Start refreshing the capability cache periodically."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop_background_refresh(self):
+        """Stop the periodic capability refresh and any pending stale refresh."""
+        for task in (self._refresh_task, self._stale_refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._refresh_task = None
+        self._stale_refresh_task = None
+    
+    async def close(self):
+        """Stop background refreshes and close every server session."""
+        await self.stop_background_refresh()
+        await self.connector.close()
+    
+    def _refresh_stale(self, server_names: List[str]):
+        """Refresh stale entries in the background, one refresh at a time."""
+        if self._stale_refresh_task is not None and not self._stale_refresh_task.done():
+            return
+        if self._discovery_lock is not None and self._discovery_lock.locked():
+            return
+        self._stale_refresh_task = asyncio.create_task(self.discover_capabilities(server_names))
+        self._stale_refresh_task.add_done_callback(self._log_refresh_failure)
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background capability refresh failed: {task.exception()}")
+    
+    async def _refresh_loop(self):
+        while True:
             try:
-                async with self.connector.connect_server(server_name) as session:
-                    tools = self.connector.get_available_tools(server_name)
-                    all_tools[server_name] = tools
+                await asyncio.sleep(self.refresh_interval)
+                await self.discover_capabilities()
+            except asyncio.CancelledError:
+                break
             except Exception as e:
-                logger.error(f"Error getting tools from {server_name}: {e}")
-                all_tools[server_name] = {"error": str(e)}
+                logger.error(f"Capability refresh error: {e}")
+    
+    async def get_all_available_tools(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get all available tools from all registered servers.
+
+        Served from the capability cache. Servers never discovered are
+        queried concurrently before returning; stale entries are refreshed
+        in the background.
+
+        Args:
+            refresh: Query every server before returning
+
+        Returns:
+            Per-server entries with ``status``, ``error``, ``version``,
+            ``age_seconds`` and ``tools``
+        """
+        server_names = list(self.connector.servers)
+        if refresh:
+            await self.discover_capabilities(server_names)
+        else:
+            missing = [
+                name for name in server_names
+                if name not in self._capabilities or self._capabilities[name].status == 'pending'
+            ]
+            if missing:
+                await self.discover_capabilities(missing)
+            if any(self._is_stale(self._capabilities.get(name)) for name in server_names):
+                self._refresh_stale(server_names)
+        self.start_background_refresh()
         
-        return all_tools
+        return {
+            name: self._capabilities[name].to_dict()
+            for name in server_names
+            if name in self._capabilities
+        }
     
     async def execute_cross_server_workflow(
         self, 
-        workflow: List[Dict[str, Any]]
+        workflow: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        return_exceptions: bool = False
     ) -> List[Any]:
-        """Execute a workflow that spans multiple MCP servers."""
-        results = []
-        context = {}  # Shared context between steps
+        """Execute a workflow that spans multiple MCP servers.
+
+        Steps run as a dependency graph: a step waits only for the earlier
+        steps whose ``store_as`` names it references through ``{{var}}`` in
+        its arguments. Independent steps run concurrently, at most
+        ``max_concurrency`` at a time. When a step fails, the steps that
+        depend on it are skipped while unrelated branches still finish.
+
+        Args:
+            workflow: Steps with ``server``, ``action`` and action arguments
+            max_concurrency: Maximum number of steps running at once
+            return_exceptions: Put errors in the results instead of raising
+
+        Returns:
+            Step results in workflow order
+
+        Raises:
+            CrossServerWorkflowError: If a step failed and return_exceptions is False
+        """
+        steps = [
+            (index, step) for index, step in enumerate(workflow)
+            if step.get('action') in ('tool', 'resource')
+        ]
+        dependencies = self._infer_step_dependencies(workflow)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        tasks: Dict[int, asyncio.Task] = {}
         
-        for step in workflow:
-            server_name = step.get('server')
-            action = step.get('action')
-            
-            if action == 'tool':
-                tool_name = step.get('tool_name')
-                arguments = step.get('arguments', {})
-                
-                # Substitute context variables
-                for key, value in arguments.items():
-                    if isinstance(value, str) and value.startswith('{{') and value.endswith('}}'):
-                        context_key = value[2:-2]
-                        arguments[key] = context.get(context_key, value)
-                
-                result = await self.connector.call_remote_tool(
-                    server_name, tool_name, arguments
-                )
-                
-                # Store result in context
-                if step.get('store_as'):
-                    context[step['store_as']] = result
-                
-                results.append(result)
-            
-            elif action == 'resource':
-                resource_uri = step.get('resource_uri')
-                result = await self.connector.read_remote_resource(
-                    server_name, resource_uri
-                )
-                
-                # Store result in context
-                if step.get('store_as'):
-                    context[step['store_as']] = result
-                
-                results.append(result)
+        async def run_step(index: int, step: Dict[str, Any]) -> Any:
+            context = {}
+            for var, dep_index in dependencies[index].items():
+                try:
+                    context[var] = await tasks[dep_index]
+                except Exception as e:
+                    raise WorkflowStepSkipped(
+                        f"Step {index} skipped: dependency step {dep_index} failed: {e}"
+                    ) from e
+            async with semaphore:
+                return await self._run_workflow_step(step, context)
+        
+        for index, step in steps:
+            tasks[index] = asyncio.create_task(run_step(index, step))
         
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        results = list(outcomes)
+        
+        errors = [
+            (index, outcome) for (index, _), outcome in zip(steps, outcomes)
+            if isinstance(outcome, BaseException)
+        ]
+        for index, error in errors:
+            if not isinstance(error, WorkflowStepSkipped):
+                logger.error(f"Cross-server workflow step {index} failed: {error}")
+        if errors and not return_exceptions:
+            raise CrossServerWorkflowError(
+                f"{len(errors)} of {len(steps)} workflow steps did not complete",
+                results=results,
+                errors=dict(errors)
+            )
         return results
+    
+    @staticmethod
+    def _infer_step_dependencies(workflow: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+        """Map each step's referenced variables to the step that produces them.
+
+        A reference binds to the closest earlier step with a matching
+        ``store_as``, which keeps the semantics of sequential execution.
+        References to unknown variables are left for substitution as-is.
+        """
+        producers: Dict[str, int] = {}
+        dependencies: List[Dict[str, int]] = []
+        for index, step in enumerate(workflow):
+            step_deps = {}
+            for var in _referenced_variables(step.get('arguments', {})):
+                if var in producers:
+                    step_deps[var] = producers[var]
+            dependencies.append(step_deps)
+            if step.get('store_as'):
+                producers[step['store_as']] = index
+        return dependencies
+    
+    async def _run_workflow_step(self, step: Dict[str, Any], context: Dict[str, Any]) -> Any:
+        """Run one workflow step with its variables substituted."""
+        server_name = step.get('server')
+        
+        if step.get('action') == 'tool':
+            arguments = _substitute_variables(step.get('arguments', {}), context)
+            return await self.connector.call_remote_tool(
+                server_name, step.get('tool_name'), arguments
+            )
+        
+        return await self.connector.read_remote_resource(
+            server_name, step.get('resource_uri')
+        )
+
+
+_VARIABLE_PATTERN = re.compile(r'\{\{\s*([\w.-]+)\s*\}\}')
+
+
+def _referenced_variables(value: Any) -> List[str]:
+    """Collect ``{{var}}`` names referenced anywhere in a step argument."""
+    if isinstance(value, str):
+        return _VARIABLE_PATTERN.findall(value)
+    if isinstance(value, dict):
+        return [var for item in value.values() for var in _referenced_variables(item)]
+    if isinstance(value, (list, tuple)):
+        return [var for item in value for var in _referenced_variables(item)]
+    return []
+
+
+def _substitute_variables(value: Any, context: Dict[str, Any]) -> Any:
+    """Replace ``{{var}}`` references with values from the workflow context.
+
+    A string that is exactly one reference takes the stored value as-is;
+    references embedded in longer strings are replaced by its text.
+    Unknown variables are left untouched.
+    """
+    if isinstance(value, str):
+        match = _VARIABLE_PATTERN.fullmatch(value)
+        if match:
+            return context.get(match.group(1), value)
+        return _VARIABLE_PATTERN.sub(
+            lambda m: str(context[m.group(1)]) if m.group(1) in context else m.group(0),
+            value
+        )
+    if isinstance(value, dict):
+        return {key: _substitute_variables(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute_variables(item, context) for item in value]
+    return value
+
+
+class WorkflowStepSkipped(Exception):
+    """A workflow step did not run because a step it depends on failed."""
+    pass
+
+
+class CrossServerWorkflowError(Exception):
+    """One or more steps of a cross-server workflow did not complete."""
+    
+    def __init__(self, message: str, results: List[Any], errors: Dict[int, BaseException]):
+        super().__init__(message)
+        self.results = results
+        self.errors = errors
 
 
 # Example usage
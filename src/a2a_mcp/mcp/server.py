@@ -1,6 +1,7 @@
 # ABOUTME: Enhanced MCP server using generic template with agent discovery and extensible tool patterns
 # ABOUTME: Framework V2.0 server combining agent management with reusable API/database integration patterns
 
+import hashlib
 import json
 import os
 import traceback
@@ -8,10 +9,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-import numpy as np
 import pandas as pd
 
 from a2a_mcp.common.utils import init_api_key
+from a2a_mcp.common.embeddings import (
+    CachedEmbedder,
+    EmbeddingCache,
+    deterministic_embedding
+)
+from a2a_mcp.mcp.card_registry import AgentCardRegistry
 from a2a_mcp.common.generic_mcp_server_template import (
     GenericMCPServerTemplate, 
     APIConfig,
@@ -28,9 +34,36 @@ EMBEDDING_MODEL = 'models/embedding-001'
 SYSTEM_DB = os.getenv('SYSTEM_DB', 'system.db')
 PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
 SQLLITE_DB = os.getenv('SQLLITE_DB', 'travel.db')
+AGENT_MATCH_MIN_SCORE = float(os.getenv('AGENT_MATCH_MIN_SCORE', '-1.0'))
+# Outside the (watched, version-controlled) cards directory; one file per cards directory
+EMBEDDING_CACHE_PATH = os.getenv(
+    'AGENT_EMBEDDING_CACHE',
+    os.path.join(
+        os.getenv('XDG_CACHE_HOME', os.path.join(str(Path.home()), '.cache')),
+        'a2a_mcp',
+        'agent_embeddings-'
+        f'{hashlib.sha256(os.path.abspath(AGENT_CARDS_DIR).encode()).hexdigest()[:12]}.npz'
+    )
+)
+EMBEDDING_BATCH_SIZE = int(os.getenv('AGENT_EMBEDDING_BATCH_SIZE', '100'))
+AGENT_CARDS_POLL_INTERVAL = float(os.getenv('AGENT_CARDS_POLL_INTERVAL', '2.0'))
 
-# Agent card management
-agent_embeddings_df = None
+
+def _embed_remote(texts: List[str]) -> List[List[float]]:
+    """Embeds a batch of texts with one Google Generative AI call."""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        from google import genai
+    embeddings = genai.embed_content(
+        model=EMBEDDING_MODEL,
+        content=texts,
+        task_type='retrieval_document',
+    )['embedding']
+    # A single text comes back as one flat vector
+    if texts and len(texts) == 1 and embeddings and not isinstance(embeddings[0], list):
+        embeddings = [embeddings]
+    return embeddings
 
 
 def generate_embeddings(text: str) -> List[float]:
@@ -43,19 +76,62 @@ def generate_embeddings(text: str) -> List[float]:
         A list of embeddings representing the input text.
     """
     try:
-        try:
-            import google.generativeai as genai
-        except ImportError:
-            from google import genai
-        return genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=text,
-            task_type='retrieval_document',
-        )['embedding']
+        return _embed_remote([text])[0]
     except Exception as e:
         logger.warning(f"Embedding generation failed: {e}. Using fallback method.")
-        # Fallback: simple hash-based pseudo-embedding for demo purposes
-        return [float(hash(text + str(i)) % 1000) / 1000 for i in range(768)]
+        # Fallback: deterministic local embedding, identical across processes
+        return deterministic_embedding(text).tolist()
+
+
+def generate_embeddings_batch(texts: List[str]) -> List[List[float]]:
+    """Generates embeddings for several texts in a single call when possible.
+
+    Args:
+        texts: The input strings.
+
+    Returns:
+        One embedding per input string, in order.
+    """
+    if not texts:
+        return []
+    try:
+        return _embed_remote(list(texts))
+    except Exception as e:
+        logger.warning(f"Batch embedding generation failed: {e}. Using fallback method.")
+        return [deterministic_embedding(text).tolist() for text in texts]
+
+
+_card_embedder: Optional[CachedEmbedder] = None
+
+
+def get_card_embedder() -> CachedEmbedder:
+    """Gets the agent card embedder backed by the on-disk embedding cache."""
+    global _card_embedder
+    if _card_embedder is None:
+        _card_embedder = CachedEmbedder(
+            embed_batch=_embed_remote,
+            model_name=EMBEDDING_MODEL,
+            cache=EmbeddingCache(EMBEDDING_CACHE_PATH),
+            batch_size=EMBEDDING_BATCH_SIZE
+        )
+    return _card_embedder
+
+
+# Agent card management
+_card_registry: Optional[AgentCardRegistry] = None
+
+
+def get_card_registry() -> AgentCardRegistry:
+    """Gets the process-wide agent card registry."""
+    global _card_registry
+    if _card_registry is None:
+        _card_registry = AgentCardRegistry(
+            cards_dir=AGENT_CARDS_DIR,
+            embedder=get_card_embedder(),
+            min_score=AGENT_MATCH_MIN_SCORE,
+            poll_interval=AGENT_CARDS_POLL_INTERVAL
+        )
+    return _card_registry
 
 
 def load_agent_cards() -> tuple[List[str], List[dict]]:
@@ -111,62 +187,90 @@ def build_agent_card_embeddings() -> Optional[pd.DataFrame]:
     Returns:
         A Pandas DataFrame containing agent card data and embeddings, or None if failed.
     """
-    card_uris, agent_cards = load_agent_cards()
-    
-    if not agent_cards:
-        logger.warning('No agent cards loaded')
-        return None
-    
-    logger.info('Generating embeddings for agent cards')
     try:
-        df = pd.DataFrame(
-            {'card_uri': card_uris, 'agent_card': agent_cards}
-        )
-        df['card_embeddings'] = df.apply(
-            lambda row: generate_embeddings(json.dumps(row['agent_card'])),
-            axis=1,
-        )
-        logger.info('Successfully generated embeddings')
-        return df
+        snapshot = get_card_registry().ensure_loaded(watch=False)
     except Exception as e:
         logger.error(f'Error generating embeddings: {e}', exc_info=True)
         return None
+    
+    if not snapshot.entries:
+        logger.warning('No agent cards loaded')
+        return None
+    
+    return pd.DataFrame({
+        'card_uri': snapshot.card_uris,
+        'agent_card': snapshot.agent_cards,
+        'card_embeddings': [entry.embedding for entry in snapshot.entries.values()]
+    })
+
+
+def find_relevant_agent_cards(
+    query: str,
+    top_k: int = 1,
+    min_score: Optional[float] = None
+) -> Dict[str, Any]:
+    """Finds the agent cards most similar to a query string.
+
+    Args:
+        query: Natural language description of the task.
+        top_k: Number of candidates to return.
+        min_score: Cosine similarity floor; AGENT_MATCH_MIN_SCORE if None.
+
+    Returns:
+        The best card with its ``_match_score`` when top_k is 1, otherwise
+        a dict with scored ``candidates``; an error dict if nothing matches.
+    """
+    index = get_card_registry().ensure_loaded().index
+    if len(index) == 0:
+        return {
+            'error': 'No agent cards loaded',
+            'suggestion': 'Ensure agent cards are present in the configured directory'
+        }
+    
+    matches = index.search(generate_embeddings(query), top_k=top_k, min_score=min_score)
+    if not matches:
+        return {
+            'error': 'No agent matched the query',
+            'details': f'No candidate scored above {index.min_score if min_score is None else min_score}'
+        }
+    
+    logger.debug(f'Found best match {matches[0].card_uri} with score {matches[0].score}')
+    if top_k == 1:
+        return matches[0].card_with_score()
+    return {'candidates': [match.to_dict() for match in matches]}
+
+
+def find_relevant_agent_cards_batch(
+    queries: List[str],
+    top_k: int = 1,
+    min_score: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Matches several queries against the agent index in one pass.
+
+    Args:
+        queries: Natural language task descriptions.
+        top_k: Number of candidates per query.
+        min_score: Cosine similarity floor; AGENT_MATCH_MIN_SCORE if None.
+
+    Returns:
+        One entry per query with its scored ``candidates``.
+    """
+    index = get_card_registry().ensure_loaded().index
+    query_embeddings = generate_embeddings_batch(queries)
+    results = index.search_batch(query_embeddings, top_k=top_k, min_score=min_score)
+    return [
+        {'query': query, 'candidates': [match.to_dict() for match in matches]}
+        for query, matches in zip(queries, results)
+    ]
 
 
 def create_agent_discovery_tools(server: GenericMCPServerTemplate):
     """Add agent discovery tools to the MCP server."""
     
-    def find_agent(query: str) -> Dict[str, Any]:
+    def find_agent(query: str, top_k: int = 1, min_score: Optional[float] = None) -> Dict[str, Any]:
         """Finds the most relevant agent card based on a query string."""
-        if agent_embeddings_df is None or agent_embeddings_df.empty:
-            return {
-                'error': 'No agent cards loaded',
-                'suggestion': 'Ensure agent cards are present in the configured directory'
-            }
-        
         try:
-            # Generate query embedding
-            query_embedding = generate_embeddings(query)
-            
-            # Calculate similarity scores
-            dot_products = np.dot(
-                np.stack(agent_embeddings_df['card_embeddings']),
-                query_embedding
-            )
-            
-            # Find best match
-            best_match_index = np.argmax(dot_products)
-            best_score = dot_products[best_match_index]
-            
-            logger.debug(
-                f'Found best match at index {best_match_index} with score {best_score}'
-            )
-            
-            result = agent_embeddings_df.iloc[best_match_index]['agent_card']
-            result['_match_score'] = float(best_score)
-            
-            return result
-            
+            return find_relevant_agent_cards(query, top_k=top_k, min_score=min_score)
         except Exception as e:
             logger.error(f'Error finding agent: {e}', exc_info=True)
             return {
@@ -174,9 +278,25 @@ def create_agent_discovery_tools(server: GenericMCPServerTemplate):
                 'details': str(e)
             }
     
+    def find_agents_batch(
+        queries: List[str],
+        top_k: int = 1,
+        min_score: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Finds the most relevant agent cards for several queries at once."""
+        try:
+            return {'results': find_relevant_agent_cards_batch(queries, top_k=top_k, min_score=min_score)}
+        except Exception as e:
+            logger.error(f'Error finding agents: {e}', exc_info=True)
+            return {
+                'error': 'Failed to find matching agents',
+                'details': str(e)
+            }
+    
     def list_available_agents() -> Dict[str, Any]:
         """Lists all available agents with their basic information."""
-        if agent_embeddings_df is None or agent_embeddings_df.empty:
+        snapshot = get_card_registry().snapshot
+        if not snapshot.entries:
             return {
                 'agents': [],
                 'count': 0,
@@ -185,10 +305,10 @@ def create_agent_discovery_tools(server: GenericMCPServerTemplate):
         
         try:
             agents_summary = []
-            for _, row in agent_embeddings_df.iterrows():
-                agent_card = row['agent_card']
+            for card_uri, entry in snapshot.entries.items():
+                agent_card = entry.agent_card
                 summary = {
-                    'uri': row['card_uri'],
+                    'uri': card_uri,
                     'name': agent_card.get('name', 'Unknown'),
                     'description': agent_card.get('description', 'No description'),
                     'capabilities': agent_card.get('capabilities', []),
@@ -208,6 +328,27 @@ def create_agent_discovery_tools(server: GenericMCPServerTemplate):
                 'details': str(e)
             }
     
+    def lookup_agent_card(
+        name: Optional[str] = None,
+        url: Optional[str] = None,
+        skill_tag: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Looks up agent cards by exact name, URL or skill tag."""
+        snapshot = get_card_registry().ensure_loaded()
+        if name:
+            entry = snapshot.get_by_name(name)
+        elif url:
+            entry = snapshot.get_by_url(url)
+        elif skill_tag:
+            entries = snapshot.find_by_skill_tag(skill_tag)
+            return {'agent_cards': [entry.agent_card for entry in entries]}
+        else:
+            return {'error': 'Provide one of name, url or skill_tag'}
+        
+        if entry is None:
+            return {'error': f'Agent card not found: {name or url}'}
+        return {'agent_card': entry.agent_card}
+    
     def get_server_config() -> Dict[str, Any]:
         """Gets the current configuration of the MCP server."""
         return {
@@ -243,12 +384,59 @@ def create_agent_discovery_tools(server: GenericMCPServerTemplate):
                 "query": {
                     "type": "string", 
                     "description": "Natural language query to find relevant agent"
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of scored candidates to return"
+                },
+                "min_score": {
+                    "type": "number",
+                    "description": "Minimum cosine similarity of returned candidates"
                 }
             },
             "required": ["query"]
         }
     )
     
+    server.add_custom_tool(
+        name="find_agents_batch",
+        description="Finds the most relevant agent cards for several natural language queries at once",
+        handler_func=find_agents_batch,
+        parameters={
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Natural language queries to match"
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of scored candidates per query"
+                },
+                "min_score": {
+                    "type": "number",
+                    "description": "Minimum cosine similarity of returned candidates"
+                }
+            },
+            "required": ["queries"]
+        }
+    )
+    
+    server.add_custom_tool(
+        name="lookup_agent_card",
+        description="Looks up agent cards by exact name, URL or skill tag without semantic search",
+        handler_func=lookup_agent_card,
+        parameters={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Agent card name"},
+                "url": {"type": "string", "description": "Agent URL"},
+                "skill_tag": {"type": "string", "description": "Tag of one of the agent's skills"}
+            }
+        }
+    )
+    
     server.add_custom_tool(
         name="list_available_agents",
         description="List all available agents with their basic information",
@@ -346,9 +534,9 @@ def serve(host: str, port: int, transport: str):
         transport=transport
     )
 
-    # Build agent embeddings
-    global agent_embeddings_df
-    agent_embeddings_df = build_agent_card_embeddings()
+    # Load agent cards, embeddings and the similarity index, then watch for changes
+    card_registry = get_card_registry()
+    card_registry.ensure_loaded(watch=True)
 
     # Add agent discovery tools
     logger.info("Adding agent discovery and management tools...")
@@ -360,33 +548,27 @@ def serve(host: str, port: int, transport: str):
     
     # Add MCP resource endpoints for agent cards
     @server.mcp.resource('resource://agent_cards/list', mime_type='application/json')
-    def get_agent_cards() -> dict:
+    def get_agent_cards() -> str:
         """Retrieves all loaded agent cards for the MCP resource endpoint."""
-        if agent_embeddings_df is None or agent_embeddings_df.empty:
-            return {'agent_cards': []}
-        
         logger.info('Reading agent cards resource list')
-        return {'agent_cards': agent_embeddings_df['card_uri'].tolist()}
+        return card_registry.snapshot.list_json
 
     @server.mcp.resource(
         'resource://agent_cards/{card_name}', mime_type='application/json'
     )
-    def get_agent_card(card_name: str) -> dict:
+    def get_agent_card(card_name: str) -> str:
         """Retrieves a specific agent card for the MCP resource endpoint."""
-        if agent_embeddings_df is None or agent_embeddings_df.empty:
-            return {'error': 'No agent cards loaded'}
+        snapshot = card_registry.snapshot
+        if not snapshot.entries:
+            return json.dumps({'error': 'No agent cards loaded'})
         
         logger.info(f'Reading agent card resource: {card_name}')
         
-        card_uri = f'resource://agent_cards/{card_name}'
-        matching_cards = agent_embeddings_df.loc[
-            agent_embeddings_df['card_uri'] == card_uri, 'agent_card'
-        ].tolist()
-        
-        if matching_cards:
-            return {'agent_card': matching_cards[0]}
+        entry = snapshot.resolve(card_name)
+        if entry is not None:
+            return entry.resource_json
         else:
-            return {'error': f'Agent card not found: {card_name}'}
+            return json.dumps({'error': f'Agent card not found: {card_name}'})
 
     logger.info(f"Enhanced A2A MCP Server ready with {len(server.tool_handlers)} tools")
     
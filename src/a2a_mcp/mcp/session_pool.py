@@ -0,0 +1,319 @@
+# ABOUTME: Process-wide pool of long-lived, health-checked MCP client sessions
+# ABOUTME: Removes the transport handshake and initialize round trip from every MCP call
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, Callable, Dict, Hashable, Optional
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+
+SessionFactory = Callable[[], AsyncContextManager[ClientSession]]
+
+# Errors that mean the transport under a session is gone
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    EOFError,
+    asyncio.TimeoutError,
+)
+
+
+class _PooledSession:
+    """
+    A session kept open by a dedicated holder task.
+
+    MCP transports are async context managers built on anyio task groups,
+    which must be entered and exited by the same task. The holder task
+    enters the factory's context, publishes the session and then waits
+    until it is told to close.
+    """
+
+    def __init__(self, key: Hashable, factory: SessionFactory):
+        self.key = key
+        self.factory = factory
+        self.session: Optional[ClientSession] = None
+        self.error: Optional[BaseException] = None
+        self.loop = asyncio.get_running_loop()
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+        self.leases = 0
+        self.broken = False
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Open the session and wait until it is initialized."""
+        self._task = asyncio.create_task(self._hold())
+        await self._ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    async def _hold(self):
+        try:
+            async with self.factory() as session:
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self.error = e
+            if self._ready.is_set():
+                logger.warning(f"Pooled MCP session {self.key} died: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return (
+            not self.broken
+            and self.session is not None
+            and self._task is not None
+            and not self._task.done()
+            and self.loop is asyncio.get_running_loop()
+        )
+
+    async def close(self, timeout: float = 5.0):
+        """Ask the holder task to exit the session context and wait for it."""
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+        if self.loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+
+class MCPSessionPool:
+    """
+    Process-wide pool of long-lived MCP client sessions.
+
+    Sessions are keyed by transport and address (for example
+    ``('sse', url)`` or ``('stdio', command, args)``). One session per key
+    is shared by every caller, since MCP multiplexes concurrent requests
+    over a session by request id. Leasing a session checks its health
+    with a ping at most once per ``health_check_interval`` and reconnects
+    when the session is dead or was marked broken by a transport error.
+    Repeated failures to keep a session up (for example a stdio server
+    process that keeps crashing) delay the next restart with exponential
+    backoff. Sessions with no leases are closed after ``idle_timeout``
+    seconds, which also stops their server process for stdio transports.
+    """
+
+    def __init__(
+        self,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        connect_timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        restart_backoff: float = 0.5,
+        max_restart_backoff: float = 30.0,
+        stable_after: float = 60.0
+    ):
+        """
+        Initialize session pool.
+
+        Args:
+            health_check_interval: Seconds between pings of a leased session
+            ping_timeout: Seconds before a ping counts as failed
+            connect_timeout: Seconds allowed to open and initialize a session
+            idle_timeout: Seconds an unleased session stays open
+            restart_backoff: Delay before the first restart after a failure
+            max_restart_backoff: Upper bound on the restart delay
+            stable_after: Seconds a session must live before its failure
+                count is reset
+        """
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stable_after = stable_after
+
+        self._failures: Dict[Hashable, int] = {}
+        self._sessions: Dict[Hashable, _PooledSession] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._metrics = {
+            "sessions_created": 0,
+            "sessions_reused": 0,
+            "sessions_closed": 0,
+            "reconnects": 0,
+            "health_checks_failed": 0,
+            "connect_failures": 0
+        }
+
+    @asynccontextmanager
+    async def lease(self, key: Hashable, factory: SessionFactory):
+        """
+        Lease the pooled session for a key, opening it if needed.
+
+        Args:
+            key: Transport and address identifying the server
+            factory: Callable returning an async context manager that
+                yields an initialized ClientSession
+
+        Yields:
+            An initialized ClientSession shared with other callers
+        """
+        pooled = await self._acquire(key, factory)
+        pooled.leases += 1
+        try:
+            yield pooled.session
+        except McpError:
+            # The server answered; the session itself is fine
+            raise
+        except CONNECTION_ERRORS as e:
+            logger.warning(f"Transport error on pooled MCP session {key}, will reconnect: {e}")
+            pooled.broken = True
+            raise
+        finally:
+            pooled.leases -= 1
+            pooled.last_used = time.monotonic()
+
+    async def _acquire(self, key: Hashable, factory: SessionFactory) -> _PooledSession:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is not None and pooled.alive and await self._check_health(pooled):
+                self._metrics["sessions_reused"] += 1
+                return pooled
+
+            if pooled is not None:
+                self._metrics["reconnects"] += 1
+                if time.monotonic() - pooled.created_at < self.stable_after:
+                    self._failures[key] = self._failures.get(key, 0) + 1
+                else:
+                    self._failures[key] = 1
+                await self._discard(key)
+
+            delay = self._restart_delay(key)
+            if delay > 0:
+                logger.info(f"Waiting {delay:.1f}s before restarting MCP session {key}")
+                await asyncio.sleep(delay)
+
+            pooled = _PooledSession(key, factory)
+            try:
+                await asyncio.wait_for(pooled.start(), timeout=self.connect_timeout)
+            except BaseException:
+                self._metrics["connect_failures"] += 1
+                self._failures[key] = self._failures.get(key, 0) + 1
+                await pooled.close()
+                raise
+            self._sessions[key] = pooled
+            self._metrics["sessions_created"] += 1
+            logger.info(f"Opened pooled MCP session {key}")
+
+        self._ensure_reaper()
+        return pooled
+
+    def _restart_delay(self, key: Hashable) -> float:
+        """Exponential backoff delay based on recent failures for a key."""
+        failures = self._failures.get(key, 0)
+        if failures == 0:
+            return 0.0
+        return min(self.max_restart_backoff, self.restart_backoff * (2 ** (failures - 1)))
+
+    async def _check_health(self, pooled: _PooledSession) -> bool:
+        """Ping the session if it has not been checked recently."""
+        now = time.monotonic()
+        if now - pooled.last_checked < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), timeout=self.ping_timeout)
+        except Exception as e:
+            logger.warning(f"Pooled MCP session {pooled.key} failed health check: {e}")
+            self._metrics["health_checks_failed"] += 1
+            return False
+        pooled.last_checked = now
+        return True
+
+    async def _discard(self, key: Hashable):
+        pooled = self._sessions.pop(key, None)
+        if pooled is not None:
+            await pooled.close()
+            self._metrics["sessions_closed"] += 1
+
+    def _ensure_reaper(self):
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle_sessions())
+
+    async def _reap_idle_sessions(self):
+        """Close sessions nobody has leased for longer than the idle timeout."""
+        while self._sessions:
+            try:
+                await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+                now = time.monotonic()
+                for key, pooled in list(self._sessions.items()):
+                    if pooled.leases == 0 and now - pooled.last_used > self.idle_timeout:
+                        logger.info(f"Closing idle pooled MCP session {key}")
+                        await self._discard(key)
+                        self._failures.pop(key, None)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"MCP session reaper error: {e}")
+
+    async def close(self, key: Hashable):
+        """Close the pooled session for one key."""
+        await self._discard(key)
+
+    async def close_all(self):
+        """Close every pooled session."""
+        if self._reaper_task and not self._reaper_task.done():
+            self._reaper_task.cancel()
+        for key in list(self._sessions.keys()):
+            await self._discard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool metrics and per-session state."""
+        now = time.monotonic()
+        return {
+            **self._metrics,
+            "sessions": {
+                str(key): {
+                    "alive": pooled.session is not None and not pooled.broken,
+                    "leases": pooled.leases,
+                    "age_seconds": round(now - pooled.created_at, 1),
+                    "recent_failures": self._failures.get(key, 0),
+                    "idle_seconds": round(now - pooled.last_used, 1)
+                }
+                for key, pooled in list(self._sessions.items())
+            }
+        }
+
+
+# Global session pool instance
+_global_session_pool: Optional[MCPSessionPool] = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get or create the global MCP session pool."""
+    global _global_session_pool
+    if _global_session_pool is None:
+        _global_session_pool = MCPSessionPool()
+    return _global_session_pool
+
+
+async def shutdown_mcp_session_pool():
+    """Close all pooled sessions and drop the global pool."""
+    global _global_session_pool
+    if _global_session_pool:
+        await _global_session_pool.close_all()
+        _global_session_pool = None
@@ -0,0 +1,170 @@
+# ABOUTME: Tests for A2AProtocolClient request handling against a faked transport
+# ABOUTME: Covers breaker bookkeeping on cancellation, hedging and JSON-RPC batching with retries
+
+import asyncio
+
+import pytest
+
+from a2a_mcp.common.a2a_protocol import A2ACommunicationError, A2AProtocolClient, _A2AHTTPStatusError
+from a2a_mcp.common.a2a_resilience import CircuitBreakerRegistry, CircuitState, LatencyTracker, RetryBudget
+
+URL = "http://localhost:10901"
+ALTERNATE = "http://localhost:10902"
+
+
+def _client(**kwargs):
+    kwargs.setdefault("circuit_breakers", CircuitBreakerRegistry(minimum_calls=1, open_duration=0.0))
+    kwargs.setdefault("retry_budget", RetryBudget())
+    return A2AProtocolClient(use_connection_pool=False, max_retries=1, retry_delay=0.0, **kwargs)
+
+
+class TestA2AProtocolClientBreaker:
+    """Test suite for circuit breaker handling in send_message"""
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_half_open_slot(self):
+        """Cancelling a half-open probe does not block later probes"""
+        client = _client()
+        breaker = client._circuit_breakers.get(URL)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.HALF_OPEN
+
+        started = asyncio.Event()
+
+        async def hanging_post(*args):
+            started.set()
+            await asyncio.sleep(10)
+
+        client._post_request = hanging_post
+        probe = asyncio.create_task(client.send_message(URL, "hello"))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+
+
+class TestA2AHedging:
+    """Test suite for hedged requests"""
+
+    def _hedging_client(self, **kwargs):
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(URL, 0.02)
+        client = _client(enable_hedging=True, hedge_endpoints={URL: [ALTERNATE]}, latency_tracker=tracker, **kwargs)
+
+        async def slow_primary(url, *args):
+            await asyncio.sleep(0.3 if url == URL else 0.01)
+            return {"result": url}
+
+        client._post_request = slow_primary
+        return client, tracker
+
+    @pytest.mark.asyncio
+    async def test_only_primary_latency_is_recorded(self):
+        """A winning hedge records the primary's time in flight, never its own latency"""
+        client, tracker = self._hedging_client()
+
+        result = await client.send_message(URL, "hello")
+
+        assert result["content"] == ALTERNATE
+        assert client.session_stats["hedges_won"] == 1
+        samples = list(tracker._samples[URL])
+        assert len(samples) == 2 and samples[1] >= 0.02
+        assert ALTERNATE not in tracker._samples
+
+    @pytest.mark.asyncio
+    async def test_winning_hedge_leaves_primary_breaker_untouched(self):
+        """Only the request that answered is recorded; a half-open primary just gets its probe back"""
+        client, _ = self._hedging_client()
+        primary_breaker = client._circuit_breakers.get(URL)
+        primary_breaker.record_failure()
+        assert primary_breaker.state == CircuitState.HALF_OPEN
+
+        result = await client.send_message(URL, "hello")
+        await asyncio.sleep(0.01)  # let the cancelled primary finish unwinding
+
+        assert result["content"] == ALTERNATE
+        assert primary_breaker.state == CircuitState.HALF_OPEN
+        assert primary_breaker.allow_request() is True
+        assert client._circuit_breakers.get(ALTERNATE).get_stats()["window_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_rate_is_capped(self):
+        """Once the hedge budget is spent, slow requests wait for the primary"""
+        client, tracker = self._hedging_client(max_hedge_ratio=0.0)
+
+        results = [await client.send_message(URL, "hello") for _ in range(2)]
+
+        assert [result["content"] for result in results] == [ALTERNATE, URL]
+        assert client.session_stats["hedges_sent"] == 1
+        assert client.session_stats["hedges_denied"] == 1
+
+
+class TestA2ARequestBatcher:
+    """Test suite for send_message_batched"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_post(self):
+        """Requests in the same window go out as one batch and get their own replies"""
+        client = _client()
+        posted = []
+
+        async def post_batch(url, target, payloads, headers, timeout):
+            posted.append(payloads)
+            return [{"id": payload["id"], "result": payload["params"]["message"]} for payload in reversed(payloads)]
+
+        client._post_request = post_batch
+        results = await asyncio.gather(*(client.send_message_batched(URL, f"m{i}") for i in range(3)))
+
+        assert len(posted) == 1 and len(posted[0]) == 3
+        assert [result["content"] for result in results] == ["m0", "m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_breaker(self):
+        """A rejected batch (4xx) is neither retried nor counted as a breaker failure"""
+        client = _client()
+        client.max_retries = 3
+        calls = 0
+
+        async def bad_request(*args):
+            nonlocal calls
+            calls += 1
+            raise _A2AHTTPStatusError(400, "malformed")
+
+        client._post_request = bad_request
+        for _ in range(3):
+            with pytest.raises(A2ACommunicationError):
+                await client.send_message_batched(URL, "oops")
+
+        assert calls == 3
+        assert client._circuit_breakers.get(URL).state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_server_errors_retry_within_budget(self):
+        """Failed batches are retried only while the retry budget has tokens"""
+        budget = RetryBudget(retry_ratio=0.0, min_retries_per_second=0.0)
+        client = _client(
+            retry_budget=budget,
+            circuit_breakers=CircuitBreakerRegistry(minimum_calls=100)
+        )
+        client.max_retries = 5
+        calls = 0
+
+        async def unavailable(*args):
+            nonlocal calls
+            calls += 1
+            raise _A2AHTTPStatusError(503, "down")
+
+        client._post_request = unavailable
+        with pytest.raises(A2ACommunicationError):
+            await client.send_message_batched(URL, "hello")
+
+        # One original attempt plus the single token the budget starts with
+        assert calls == 2
+        assert budget.get_stats()["retries_denied"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+# ABOUTME: Tests for the A2A connection pool's per-event-loop shared connectors
+# ABOUTME: Covers session sharing across hosts, loop isolation, pruning of closed loops and shutdown
+
+import asyncio
+
+import pytest
+
+from a2a_mcp.common.a2a_connection_pool import A2AConnectionPool, normalize_base_url
+
+
+class TestA2AConnectionPool:
+    """Test suite for A2AConnectionPool"""
+
+    def test_targets_normalize_to_one_key(self):
+        """Ports, host:port strings and URLs for one agent map to the same base URL"""
+        assert normalize_base_url(10101) == "http://localhost:10101"
+        assert normalize_base_url("10101") == "http://localhost:10101"
+        assert normalize_base_url("LocalHost:10101") == "http://localhost:10101"
+        assert normalize_base_url("http://localhost:10101/a2a") == "http://localhost:10101"
+        assert normalize_base_url("https://agents.example") == "https://agents.example:443"
+
+    @pytest.mark.asyncio
+    async def test_hosts_share_the_loop_session(self):
+        """Every host used from one event loop goes through one session"""
+        pool = A2AConnectionPool()
+        async with pool.get_session(10101) as first:
+            pass
+        async with pool.get_session("http://localhost:10102") as second:
+            pass
+
+        assert first is second
+        metrics = pool.get_metrics()
+        assert metrics["connections_created"] == 1
+        assert metrics["connections_reused"] == 1
+        assert metrics["tracked_hosts"] == 2
+        await pool.close_all()
+        assert first.closed
+
+    @pytest.mark.asyncio
+    async def test_each_loop_gets_its_own_session(self):
+        """Another event loop never receives this loop's session and is pruned once closed"""
+        pool = A2AConnectionPool()
+        async with pool.get_session(10101) as main_session:
+            pass
+
+        async def use_from_other_loop():
+            async with pool.get_session(10101) as session:
+                pass
+            await session.close()
+            return session
+
+        other_session = await asyncio.to_thread(asyncio.run, use_from_other_loop())
+        assert other_session is not main_session
+        assert pool.get_metrics()["connections_created"] == 2
+
+        async with pool.get_session(10101) as again:
+            pass
+        assert again is main_session
+        assert list(pool._loops) == [asyncio.get_running_loop()]
+        assert pool.get_metrics()["connections_closed"] == 1
+        await pool.close_all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
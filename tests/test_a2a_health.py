@@ -0,0 +1,91 @@
+# ABOUTME: Tests for concurrent A2A health probing and the liveness table
+# ABOUTME: Covers concurrency bounds, TTL expiry and failure recording
+
+import asyncio
+import pytest
+
+from a2a_mcp.common.a2a_health import AgentHealthMonitor, LivenessTable
+
+
+class TestAgentHealthMonitor:
+    """Test suite for AgentHealthMonitor sweeps"""
+
+    @pytest.mark.asyncio
+    async def test_probes_run_concurrently(self):
+        """A sweep takes about as long as one probe, not the sum"""
+        async def slow_probe(endpoint):
+            await asyncio.sleep(0.2)
+            return {"ok": True}
+
+        monitor = AgentHealthMonitor(probe=slow_probe, table=LivenessTable())
+        endpoints = [f"http://localhost:{10900 + i}" for i in range(10)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        records = await monitor.probe_many(endpoints)
+        elapsed = loop.time() - started
+
+        assert elapsed < 1.0
+        assert set(records) == set(endpoints)
+        assert all(record.healthy for record in records.values())
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrent_probes run at once"""
+        in_flight = 0
+        peak = 0
+
+        async def probe(endpoint):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        monitor = AgentHealthMonitor(probe=probe, table=LivenessTable(), max_concurrent_probes=3)
+        await monitor.probe_many([f"http://localhost:{i}" for i in range(12)])
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts_are_recorded(self):
+        """Raising or hanging probes produce unhealthy records"""
+        async def probe(endpoint):
+            if endpoint.endswith(":1"):
+                raise ConnectionError("refused")
+            await asyncio.sleep(1.0)
+
+        table = LivenessTable()
+        monitor = AgentHealthMonitor(probe=probe, table=table, probe_timeout=0.05)
+        records = await monitor.probe_many(["http://localhost:1", "http://localhost:2"])
+
+        assert records["http://localhost:1"].error == "refused"
+        assert not records["http://localhost:2"].healthy
+        assert table.is_alive("http://localhost:1") is False
+        assert monitor.get_metrics()["probes_failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_status_expires(self):
+        """Cached records are served until the TTL passes"""
+        calls = 0
+
+        async def probe(endpoint):
+            nonlocal calls
+            calls += 1
+
+        table = LivenessTable(ttl=0.05)
+        monitor = AgentHealthMonitor(probe=probe, table=table)
+
+        await monitor.get_status("http://localhost:1", probe_if_stale=True)
+        await monitor.get_status("http://localhost:1", probe_if_stale=True)
+        assert calls == 1
+
+        await asyncio.sleep(0.06)
+        assert table.get("http://localhost:1") is None
+        assert table.is_alive("http://localhost:1", default=False) is False
+        await monitor.get_status("http://localhost:1", probe_if_stale=True)
+        assert calls == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
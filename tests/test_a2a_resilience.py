@@ -0,0 +1,171 @@
+# ABOUTME: Tests for A2A circuit breakers, retry budgets and latency tracking
+# ABOUTME: Covers breaker state transitions, token-bucket retry limits and percentiles
+
+import pytest
+from unittest.mock import patch
+
+from a2a_mcp.common.a2a_resilience import (
+    CircuitBreaker, CircuitBreakerRegistry, CircuitState, LatencyTracker, RetryBudget
+)
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("a2a_mcp.common.a2a_resilience.time.monotonic", fake):
+        yield fake
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker state transitions"""
+
+    def test_opens_on_error_rate(self, clock):
+        """Breaker opens once the error rate crosses the threshold"""
+        breaker = CircuitBreaker(minimum_calls=4, failure_rate_threshold=0.5)
+
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitState.CLOSED
+
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+
+    def test_opens_on_slow_calls(self, clock):
+        """Slow successes count towards the slow call rate"""
+        breaker = CircuitBreaker(minimum_calls=2, slow_call_threshold=1.0, slow_call_rate_threshold=1.0)
+
+        breaker.record_success(2.0)
+        breaker.record_success(3.0)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_half_open_probe_closes(self, clock):
+        """A successful probe after the cooldown closes the circuit"""
+        breaker = CircuitBreaker(minimum_calls=1, open_duration=10.0)
+        breaker.record_failure()
+        assert breaker.allow_request() is False
+
+        clock.now += 10.0
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        # Only one probe at a time
+        assert breaker.allow_request() is False
+
+        breaker.record_success(0.1)
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probe_failure_reopens(self, clock):
+        """A failed probe sends the circuit back to open"""
+        breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0)
+        breaker.record_failure()
+        clock.now += 5.0
+
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_released_probe_frees_slot(self, clock):
+        """A probe that ends without an outcome lets the next probe through"""
+        breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0)
+        breaker.record_failure()
+        clock.now += 5.0
+
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.release_probe()
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+
+    def test_window_expiry(self, clock):
+        """Old failures leave the sliding window"""
+        breaker = CircuitBreaker(window_seconds=10.0, minimum_calls=3, failure_rate_threshold=0.6)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        clock.now += 11.0
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_registry_shares_breakers(self):
+        """Registry returns one breaker per endpoint"""
+        registry = CircuitBreakerRegistry(minimum_calls=1)
+
+        assert registry.get("http://a:1") is registry.get("http://a:1")
+        assert registry.get("http://a:1") is not registry.get("http://b:1")
+
+
+class TestRetryBudget:
+    """Test suite for RetryBudget token accounting"""
+
+    def test_budget_limits_retries(self, clock):
+        """Retries are capped by deposited tokens"""
+        budget = RetryBudget(retry_ratio=0.5, min_retries_per_second=0.0, max_tokens=10)
+        # Initial allowance of one token
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+
+        stats = budget.get_stats()
+        assert stats["retries_allowed"] == 2
+        assert stats["retries_denied"] == 2
+
+    def test_time_refill(self, clock):
+        """Budget refills slowly over time"""
+        budget = RetryBudget(retry_ratio=0.0, min_retries_per_second=1.0, max_tokens=2)
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+
+        clock.now += 1.0
+        assert budget.try_acquire() is True
+
+
+class TestLatencyTracker:
+    """Test suite for LatencyTracker percentiles"""
+
+    def test_requires_min_samples(self):
+        """No percentile is reported before enough samples exist"""
+        tracker = LatencyTracker(min_samples=5)
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            tracker.record("http://a:1", latency)
+
+        assert tracker.percentile("http://a:1", 95) is None
+        assert tracker.percentile("http://unknown:1", 95) is None
+
+    def test_percentiles(self):
+        """Percentiles come from the rolling sample window"""
+        tracker = LatencyTracker(max_samples=100, min_samples=1)
+        for i in range(1, 101):
+            tracker.record("http://a:1", i / 100)
+
+        assert tracker.percentile("http://a:1", 50) == pytest.approx(0.5, abs=0.015)
+        assert tracker.percentile("http://a:1", 99) == pytest.approx(0.99, abs=0.015)
+
+        # Old samples roll out of the window
+        for _ in range(100):
+            tracker.record("http://a:1", 2.0)
+        assert tracker.percentile("http://a:1", 50) == 2.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+# ABOUTME: Tests for AdmissionController global and per-agent concurrency limits
+# ABOUTME: Covers queueing instead of rejection, FIFO admission, cancellation and queue-time metrics
+
+import asyncio
+
+import pytest
+
+from a2a_mcp.common.admission_control import AdmissionController
+
+
+async def _call(controller, agent, active, peaks, order=None, duration=0.02):
+    async with controller.slot(agent):
+        if order is not None:
+            order.append(agent)
+        active[agent] = active.get(agent, 0) + 1
+        active["*"] = active.get("*", 0) + 1
+        peaks[agent] = max(peaks.get(agent, 0), active[agent])
+        peaks["*"] = max(peaks.get("*", 0), active["*"])
+        await asyncio.sleep(duration)
+        active[agent] -= 1
+        active["*"] -= 1
+
+
+class TestAdmissionController:
+    """Test suite for AdmissionController"""
+
+    @pytest.mark.asyncio
+    async def test_limits_are_respected(self):
+        """Concurrency never exceeds the global or per-agent limits"""
+        controller = AdmissionController(max_concurrency=3, per_agent_limits={"slow": 1}, default_agent_limit=2)
+        active, peaks = {}, {}
+
+        await asyncio.gather(*(
+            _call(controller, agent, active, peaks)
+            for agent in ["slow"] * 4 + ["fast"] * 4 + ["other"] * 2
+        ))
+
+        assert peaks["slow"] == 1
+        assert peaks["fast"] == 2
+        assert peaks["*"] == 3
+        metrics = controller.get_metrics()
+        assert metrics["admitted"] == 10
+        assert metrics["in_flight"] == 0
+        assert metrics["queue_length"] == 0
+        assert metrics["agents"]["slow"]["max_queue_time"] > 0
+
+    @pytest.mark.asyncio
+    async def test_saturated_agent_does_not_block_others(self):
+        """Waiters for a saturated agent do not hold back other agents"""
+        controller = AdmissionController(max_concurrency=4, default_agent_limit=1)
+        active, peaks, order = {}, {}, []
+
+        await asyncio.gather(
+            *(_call(controller, "busy", active, peaks, order, duration=0.05) for _ in range(3)),
+            _call(controller, "idle", active, peaks, order, duration=0.01)
+        )
+
+        assert order.index("idle") == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """A waiter cancelled in the queue frees nothing and is dropped"""
+        controller = AdmissionController(max_concurrency=1)
+        await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        assert controller.get_metrics()["queue_length"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release("a")
+
+        metrics = controller.get_metrics()
+        assert metrics["queue_length"] == 0
+        assert metrics["in_flight"] == 0
+        assert metrics["cancelled_while_queued"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
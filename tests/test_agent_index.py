@@ -0,0 +1,71 @@
+# ABOUTME: Tests for the immutable cosine-similarity agent index
+# ABOUTME: Covers normalization, top-k ordering, similarity floors and batch queries
+
+import numpy as np
+import pytest
+
+from a2a_mcp.mcp.agent_index import AgentIndex
+
+
+def _build_index(**kwargs):
+    cards = [{'name': 'travel'}, {'name': 'hotel'}, {'name': 'finance'}]
+    uris = [f"resource://agent_cards/{card['name']}" for card in cards]
+    embeddings = [
+        [10.0, 0.0, 0.0],
+        [0.6, 0.8, 0.0],
+        [0.0, 0.0, 1.0],
+    ]
+    return AgentIndex(uris, cards, embeddings, **kwargs)
+
+
+class TestAgentIndex:
+    """Test suite for AgentIndex retrieval"""
+
+    def test_scores_ignore_embedding_magnitude(self):
+        """A large-norm card does not win on magnitude alone"""
+        index = _build_index()
+        matches = index.search([0.0, 1.0, 0.0], top_k=3)
+
+        assert [match.agent_card['name'] for match in matches] == ['hotel', 'travel', 'finance']
+        assert matches[0].score == pytest.approx(0.8, abs=1e-6)
+        assert matches[1].score == pytest.approx(0.0, abs=1e-6)
+
+    def test_top_k_and_min_score(self):
+        """Only the k best candidates above the floor are returned"""
+        index = _build_index(min_score=0.5)
+
+        assert len(index.search([1.0, 0.1, 0.0], top_k=2)) == 2
+        assert [m.agent_card['name'] for m in index.search([1.0, 0.0, 0.0], top_k=3)] == ['travel', 'hotel']
+        assert index.search([1.0, 0.0, 0.0], top_k=3, min_score=0.9)[0].agent_card['name'] == 'travel'
+        assert index.search([-1.0, 0.0, 0.0]) == []
+
+    def test_batch_matches_single_queries(self):
+        """Batch queries return the same candidates as individual ones"""
+        index = _build_index()
+        queries = [[1.0, 0.0, 0.0], [0.0, 0.0, 2.0], [0.5, 0.5, 0.0]]
+
+        batch = index.search_batch(queries, top_k=2)
+
+        assert batch == [index.search(query, top_k=2) for query in queries]
+
+    def test_index_is_read_only(self):
+        """Matches return copies and the matrix cannot be written"""
+        index = _build_index()
+        match = index.search([1.0, 0.0, 0.0])[0]
+
+        card = match.card_with_score()
+        assert card['_match_score'] == pytest.approx(1.0)
+        assert '_match_score' not in index.agent_cards[0]
+        with pytest.raises(ValueError):
+            index._matrix[0, 0] = 0.0
+
+    def test_dimension_mismatch_and_empty_index(self):
+        """Wrong query size raises; an empty index returns no matches"""
+        with pytest.raises(ValueError):
+            _build_index().search([1.0, 0.0])
+
+        assert AgentIndex.empty().search(np.ones(3)) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
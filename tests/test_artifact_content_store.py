@@ -0,0 +1,81 @@
+# ABOUTME: Tests for content-addressed artifact payload storage
+# ABOUTME: Covers deduplication with reference counts and spilling large payloads to disk
+
+import os
+
+import pytest
+
+from a2a_mcp.common.artifact_content_store import ArtifactContentStore
+
+
+class TestArtifactContentStore:
+    """Test suite for ArtifactContentStore"""
+
+    def test_identical_payloads_are_stored_once(self):
+        """Equal payloads share one entry until their last reference is released"""
+        store = ArtifactContentStore()
+        first_hash, size = store.put({"b": 1, "a": [1, 2]})
+        second_hash, _ = store.put({"a": [1, 2], "b": 1})
+        other_hash, _ = store.put("different")
+
+        assert first_hash == second_hash != other_hash
+        assert size == len('{"a": [1, 2], "b": 1}')
+        assert store.refcount(first_hash) == 2
+        assert store.get_metrics()["dedup_hits"] == 1
+
+        store.release(first_hash)
+        assert store.get(first_hash) == {"b": 1, "a": [1, 2]}
+        store.release(first_hash)
+        assert first_hash not in store
+        assert store.get(first_hash) is None
+
+    def test_payload_type_is_part_of_the_address(self):
+        """A dict and its JSON text, or a number and its digits, are not deduplicated"""
+        store = ArtifactContentStore()
+        dict_hash, _ = store.put({"a": 1})
+        text_hash, _ = store.put('{"a": 1}')
+        number_hash, _ = store.put(1)
+        digits_hash, _ = store.put("1")
+
+        assert dict_hash != text_hash and number_hash != digits_hash
+        assert store.get(dict_hash) == {"a": 1}
+        assert store.get(text_hash) == '{"a": 1}'
+        assert store.get(digits_hash) == "1"
+        assert store.get_metrics()["dedup_hits"] == 0
+
+    def test_large_payloads_spill_to_disk(self, tmp_path):
+        """Payloads over the threshold live on disk and are read back on demand"""
+        store = ArtifactContentStore(spill_dir=str(tmp_path), spill_threshold=100)
+        large = {"text": "x" * 500}
+        small_hash, _ = store.put("small")
+        large_hash, _ = store.put(large)
+
+        metrics = store.get_metrics()
+        assert metrics["spilled"] == 1
+        assert metrics["bytes_in_memory"] == len("small")
+        assert store.get(large_hash) == large
+        assert store.get(small_hash) == "small"
+
+        path = os.path.join(store.spill_dir, large_hash[:2], large_hash)
+        assert os.path.dirname(store.spill_dir) == str(tmp_path)
+        assert os.path.exists(path)
+        store.release(large_hash)
+        assert not os.path.exists(path)
+
+    def test_stores_sharing_a_directory_keep_their_files(self, tmp_path):
+        """Releasing a payload in one store leaves another store's copy readable"""
+        first = ArtifactContentStore(spill_dir=str(tmp_path), spill_threshold=10)
+        second = ArtifactContentStore(spill_dir=str(tmp_path), spill_threshold=10)
+        payload = {"text": "y" * 100}
+        content_hash, _ = first.put(payload)
+        second.put(payload)
+
+        first.release(content_hash)
+
+        assert second.get(content_hash) == payload
+        second.close()
+        assert not os.path.exists(second.spill_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+# ABOUTME: Tests for the BM25 artifact inverted index
+# ABOUTME: Covers ranking, filters, recency ordering and removal
+
+import pytest
+
+from a2a_mcp.common.artifact_index import ArtifactIndex
+
+
+def _artifact(artifact_id, content, created_ts, session_id="s1", artifact_type="task_result", tags=()):
+    return {
+        "artifact_id": artifact_id,
+        "artifact_type": artifact_type,
+        "content": content,
+        "source_info": {"specialist": "analyst"},
+        "session_id": session_id,
+        "collection_id": None,
+        "tags": list(tags),
+        "created_ts": created_ts
+    }
+
+
+@pytest.fixture
+def index():
+    index = ArtifactIndex()
+    index.add(_artifact("a", {"summary": "revenue growth revenue forecast"}, 1.0))
+    index.add(_artifact("b", {"summary": "revenue dip in one region"}, 2.0, tags=["finance"]))
+    index.add(_artifact("c", {"summary": "hiring plan for engineering"}, 3.0, session_id="s2"))
+    index.add(_artifact("d", "plain text plan", 4.0, artifact_type="execution_plan"))
+    return index
+
+
+class TestArtifactIndex:
+    """Test suite for ArtifactIndex"""
+
+    def test_multi_term_query_ranks_by_bm25(self, index):
+        """Artifacts matching more and rarer terms rank first"""
+        assert index.search("revenue forecast") == ["a", "b"]
+        assert set(index.search("revenue hiring")) == {"a", "b", "c"}
+
+    def test_filters_and_recency(self, index):
+        """Without a query, filtered artifacts come newest first"""
+        assert index.search() == ["d", "c", "b", "a"]
+        assert index.search(session_id="s1", artifact_type="task_result") == ["b", "a"]
+        assert index.search(tags=["finance"]) == ["b"]
+        assert index.search("plan", session_id="s1") == ["d"]
+        assert index.search("unknownterm") == []
+
+    def test_remove_and_replace(self, index):
+        """Removed artifacts leave no postings; re-adding replaces terms"""
+        index.remove("a")
+        assert "a" not in index
+        assert index.search("forecast") == []
+
+        index.add(_artifact("b", {"summary": "forecast"}, 5.0))
+        assert index.search("forecast") == ["b"]
+        assert index.search("region") == []
+        assert index.get_stats()["indexed_artifacts"] == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+# ABOUTME: Tests for MinHash-based incremental artifact relationship detection
+# ABOUTME: Covers exact-key links, content similarity, session isolation and removal
+
+import pytest
+
+from a2a_mcp.common.artifact_relationships import ArtifactRelationshipIndex, MinHasher
+
+
+def _artifact(artifact_id, session_id="s1", task_id=None, content_hash=None):
+    return {
+        "artifact_id": artifact_id,
+        "session_id": session_id,
+        "source_info": {"task_id": task_id} if task_id else {},
+        "content_hash": content_hash or artifact_id
+    }
+
+
+TEXT = "quarterly revenue grew in every region while costs stayed flat".split()
+
+
+class TestArtifactRelationshipIndex:
+    """Test suite for ArtifactRelationshipIndex"""
+
+    def test_minhash_estimates_similarity(self):
+        """Similar token sets give close signatures, disjoint ones do not"""
+        hasher = MinHasher(num_perm=128)
+        base = hasher.signature(TEXT)
+        assert MinHasher.similarity(base, hasher.signature(TEXT + ["extra"])) > 0.7
+        assert MinHasher.similarity(base, hasher.signature(["unrelated", "words", "only"])) < 0.2
+        assert hasher.signature([]) is None
+
+    def test_links_by_shared_keys_and_similar_content(self):
+        """Shared tasks or similar content create undirected edges"""
+        index = ArtifactRelationshipIndex()
+        index.add(_artifact("a", task_id="t1"), ["alpha"])
+        index.add(_artifact("b", task_id="t1"), ["beta"])
+        index.add(_artifact("c"), TEXT)
+        index.add(_artifact("d"), TEXT + ["again"])
+        index.add(_artifact("e"), ["something", "else", "entirely"])
+        index.add(_artifact("f", session_id="s2"), TEXT)
+
+        assert index.neighbors("a") == {"b"}
+        assert index.neighbors("c") == {"d"}
+        assert index.neighbors("d") == {"c"}
+        assert index.neighbors("e") == set()
+        assert index.neighbors("f") == set()  # other session
+        assert index.edge_count == 2
+
+    def test_remove_drops_both_ends(self):
+        """Removing an artifact removes it from its neighbors' adjacency"""
+        index = ArtifactRelationshipIndex()
+        index.add(_artifact("a", content_hash="same"), ["x"])
+        index.add(_artifact("b", content_hash="same"), ["y"])
+        index.remove("a")
+
+        assert "a" not in index
+        assert index.neighbors("b") == set()
+        assert index.add(_artifact("c", content_hash="same"), ["z"]) == {"b"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+# ABOUTME: Tests for the hot-reloading agent card registry
+# ABOUTME: Covers incremental re-embedding, deletions and atomic snapshot swaps
+
+import json
+import os
+
+import pytest
+
+from a2a_mcp.common.embeddings import CachedEmbedder
+from a2a_mcp.mcp.card_registry import AgentCardRegistry
+
+
+def _write_card(directory, name, description, mtime_ns=None):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps({"name": name, "description": description}))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+class TestAgentCardRegistry:
+    """Test suite for AgentCardRegistry reloads"""
+
+    def _registry(self, cards_dir):
+        embedded = []
+
+        def embed_batch(texts):
+            embedded.extend(texts)
+            return [[1.0, float(len(text))] for text in texts]
+
+        registry = AgentCardRegistry(str(cards_dir), CachedEmbedder(embed_batch, "test-model"))
+        return registry, embedded
+
+    def test_only_changed_cards_are_embedded(self, tmp_path):
+        """A reload re-embeds the edited card and keeps the others"""
+        _write_card(tmp_path, "travel", "plans trips", mtime_ns=1_000_000_000)
+        _write_card(tmp_path, "hotel", "books rooms", mtime_ns=1_000_000_000)
+        registry, embedded = self._registry(tmp_path)
+
+        first = registry.ensure_loaded(watch=False)
+        assert len(embedded) == 2
+        assert first.card_uris == ["resource://agent_cards/hotel", "resource://agent_cards/travel"]
+
+        _write_card(tmp_path, "hotel", "books rooms and suites", mtime_ns=2_000_000_000)
+        assert registry.refresh() is True
+
+        second = registry.snapshot
+        assert len(embedded) == 3
+        assert second.version == first.version + 1
+        assert second.entries["resource://agent_cards/travel"] is first.entries["resource://agent_cards/travel"]
+        assert first.entries["resource://agent_cards/hotel"].agent_card["description"] == "books rooms"
+
+    def test_add_delete_and_no_change(self, tmp_path):
+        """New and removed files update the index; idle scans publish nothing"""
+        _write_card(tmp_path, "travel", "plans trips")
+        registry, _ = self._registry(tmp_path)
+        registry.ensure_loaded(watch=False)
+
+        assert registry.refresh() is False
+
+        _write_card(tmp_path, "finance", "files taxes")
+        (tmp_path / "travel.json").unlink()
+        assert registry.refresh() is True
+
+        snapshot = registry.snapshot
+        assert snapshot.card_uris == ["resource://agent_cards/finance"]
+        assert len(snapshot.index) == 1
+        assert registry.get_metrics()["cards_removed"] == 1
+
+    def test_invalid_json_keeps_last_good_card(self, tmp_path):
+        """A half-written card does not drop the previous version"""
+        path = _write_card(tmp_path, "travel", "plans trips", mtime_ns=1_000_000_000)
+        registry, _ = self._registry(tmp_path)
+        registry.ensure_loaded(watch=False)
+
+        path.write_text("{not json")
+        registry.refresh()
+
+        entry = registry.snapshot.entries["resource://agent_cards/travel"]
+        assert entry.agent_card["description"] == "plans trips"
+
+    def test_lookup_indexes_follow_reloads(self, tmp_path):
+        """Name, URL and skill tag indexes return pre-serialized cards"""
+        card = {
+            "name": "Hotel Agent",
+            "url": "http://localhost:10104/",
+            "skills": [{"name": "book", "tags": ["Hotels", "booking"]}]
+        }
+        (tmp_path / "hotel_agent.json").write_text(json.dumps(card))
+        registry, _ = self._registry(tmp_path)
+        snapshot = registry.ensure_loaded(watch=False)
+
+        assert snapshot.get_by_name("hotel agent").card_uri == "resource://agent_cards/hotel_agent"
+        assert snapshot.get_by_url("http://LOCALHOST:10104") is snapshot.resolve("hotel_agent")
+        assert [e.card_uri for e in snapshot.find_by_skill_tag("hotels")] == ["resource://agent_cards/hotel_agent"]
+        assert json.loads(snapshot.resolve("Hotel Agent").resource_json) == {"agent_card": card}
+        assert json.loads(snapshot.list_json) == {"agent_cards": ["resource://agent_cards/hotel_agent"]}
+
+        (tmp_path / "hotel_agent.json").unlink()
+        registry.refresh()
+        assert registry.snapshot.get_by_name("Hotel Agent") is None
+        assert registry.snapshot.find_by_skill_tag("hotels") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,84 @@
+# ABOUTME: Tests for batched embedding with the persistent content-hash cache
+# ABOUTME: Covers deterministic local embeddings, batching, fallback and cache persistence
+
+import numpy as np
+import pytest
+
+from a2a_mcp.common.embeddings import (
+    CachedEmbedder,
+    EmbeddingCache,
+    content_hash,
+    deterministic_embedding,
+)
+
+
+class TestDeterministicEmbedding:
+    """Test suite for the local fallback embedder"""
+
+    def test_stable_and_normalized(self):
+        """Same text gives the same unit vector"""
+        first = deterministic_embedding("book a flight to Paris")
+        second = deterministic_embedding("book a flight to Paris")
+
+        assert np.array_equal(first, second)
+        assert np.linalg.norm(first) == pytest.approx(1.0)
+
+    def test_shared_words_are_closer(self):
+        """Texts with common words score higher than unrelated ones"""
+        query = deterministic_embedding("hotel booking agent")
+        related = deterministic_embedding("agent for hotel booking and rooms")
+        unrelated = deterministic_embedding("quarterly tax filing")
+
+        assert query @ related > query @ unrelated
+
+
+class TestCachedEmbedder:
+    """Test suite for CachedEmbedder batching and caching"""
+
+    def test_batches_and_reuses_cache(self, tmp_path):
+        """Misses are embedded in batches; a new process reads the disk cache"""
+        calls = []
+
+        def embed_batch(texts):
+            calls.append(list(texts))
+            return [[float(len(text)), 1.0] for text in texts]
+
+        path = str(tmp_path / "cache.npz")
+        embedder = CachedEmbedder(embed_batch, "model-a", EmbeddingCache(path), batch_size=2)
+        vectors = embedder.embed(["a", "bb", "ccc"])
+        embedder.cache.save()
+
+        assert [len(batch) for batch in calls] == [2, 1]
+        assert vectors[2].tolist() == [3.0, 1.0]
+
+        reloaded = CachedEmbedder(embed_batch, "model-a", EmbeddingCache(path))
+        assert [v.tolist() for v in reloaded.embed(["a", "bb", "ccc"])] == [v.tolist() for v in vectors]
+        assert len(calls) == 2
+        assert reloaded.get_metrics()["cache_hits"] == 3
+
+    def test_model_name_is_part_of_key(self):
+        """A different model does not reuse another model's vectors"""
+        assert content_hash("card", "model-a") != content_hash("card", "model-b")
+
+    def test_fallback_on_remote_failure(self):
+        """Failed batches get local vectors and are retried next time"""
+        attempts = 0
+
+        def flaky(texts):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ConnectionError("offline")
+            return [[1.0, 0.0] for _ in texts]
+
+        embedder = CachedEmbedder(flaky, "model-a", fallback_dimension=8)
+        first = embedder.embed(["card"])[0]
+        assert np.array_equal(first, deterministic_embedding("card", 8))
+
+        second = embedder.embed(["card"])[0]
+        assert second.tolist() == [1.0, 0.0]
+        assert embedder.get_metrics()["remote_failures"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
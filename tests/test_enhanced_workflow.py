@@ -0,0 +1,81 @@
+# ABOUTME: Tests for DynamicWorkflowGraph dependency tracking and execution planning
+# ABOUTME: Covers incremental in-degree maintenance, removal and cycle detection
+
+import pytest
+
+from a2a_mcp.common.enhanced_workflow import DynamicWorkflowGraph, WorkflowNode
+
+
+def _graph(*names):
+    graph = DynamicWorkflowGraph("test")
+    nodes = {name: WorkflowNode(task=name, id=name) for name in names}
+    for node in nodes.values():
+        graph.add_node(node)
+    return graph, nodes
+
+
+class TestDynamicWorkflowGraph:
+    """Test suite for DynamicWorkflowGraph planning"""
+
+    def test_plan_layers(self):
+        """Nodes are layered by their dependencies"""
+        graph, _ = _graph("a", "b", "c", "d")
+        graph.add_edge("a", "c")
+        graph.add_edge("b", "c")
+        graph.add_edge("c", "d")
+        graph.add_edge("a", "c")  # duplicate edges are ignored
+
+        plan = graph.get_execution_plan()
+
+        assert [sorted(layer) for layer in plan] == [["a", "b"], ["c"], ["d"]]
+
+    def test_remove_node_and_edge_update_plan(self):
+        """Removing nodes or edges releases their dependents"""
+        graph, nodes = _graph("a", "b", "c")
+        graph.add_edge("a", "b")
+        graph.add_edge("b", "c")
+
+        graph.remove_node("b")
+        assert nodes["c"].dependencies == set()
+        assert "b" not in nodes["a"].dependents
+        assert [sorted(layer) for layer in graph.get_execution_plan()] == [["a", "c"]]
+
+        graph.add_edge("a", "c")
+        graph.remove_edge("a", "c")
+        assert graph.get_execution_plan() == [["a", "c"]]
+
+    def test_declared_dependencies_resolve_when_added(self):
+        """Dependencies listed on a node link once the other node exists"""
+        graph = DynamicWorkflowGraph("test")
+        graph.add_node(WorkflowNode(task="late", id="late", dependencies={"early"}))
+        assert graph.get_execution_plan() == []
+
+        graph.add_node(WorkflowNode(task="early", id="early"))
+        assert graph.get_execution_plan() == [["early"], ["late"]]
+
+    def test_cycles_are_detected(self):
+        """Nodes on a cycle are left out of the plan and reported"""
+        graph, _ = _graph("a", "b", "c")
+        graph.add_edge("a", "b")
+        graph.add_edge("b", "a")
+
+        assert graph.get_execution_plan() == [["c"]]
+        assert graph.get_workflow_stats()["has_cycles"] is True
+
+    def test_wide_graph_plans_quickly(self):
+        """A large chain-and-fan graph plans without recursion limits"""
+        graph = DynamicWorkflowGraph("test")
+        previous = None
+        for i in range(5000):
+            node = WorkflowNode(task=f"n{i}", id=f"n{i}")
+            graph.add_node(node)
+            if previous is not None:
+                graph.add_edge(previous, node.id)
+            previous = node.id
+
+        assert len(graph.get_execution_plan()) == 5000
+        assert graph.get_workflow_stats()["has_cycles"] is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+# ABOUTME: Tests for the JSON-RPC 2.0 batch ASGI middleware
+# ABOUTME: Covers concurrent dispatch, notifications, oversized batches and pass-through
+
+import asyncio
+import json
+
+import pytest
+
+from a2a_mcp.common.jsonrpc_batch import JSONRPCBatchMiddleware
+
+
+def _echo_app(delay=0.0, log=None):
+    """ASGI app answering a single JSON-RPC call with its own params."""
+    async def app(scope, receive, send):
+        message = await receive()
+        call = json.loads(message["body"])
+        if call.get("method") == "explode":
+            raise RuntimeError("handler crashed")
+        if log is not None:
+            log.append(call.get("id"))
+        await asyncio.sleep(delay)
+        body = json.dumps({"jsonrpc": "2.0", "id": call.get("id"), "result": call.get("params")}).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def _post(app, payload):
+    """Send one POST through an ASGI app and return (status, decoded body)."""
+    body = json.dumps(payload).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": "POST", "headers": []}, receive, send)
+    status = sent[0]["status"]
+    raw = b"".join(message.get("body", b"") for message in sent[1:])
+    return status, json.loads(raw) if raw else None
+
+
+class TestJSONRPCBatchMiddleware:
+    """Test suite for JSONRPCBatchMiddleware"""
+
+    @pytest.mark.asyncio
+    async def test_batch_calls_run_concurrently(self):
+        """Each call is dispatched separately and the replies come back as one array"""
+        app = JSONRPCBatchMiddleware(_echo_app(delay=0.1))
+        calls = [{"jsonrpc": "2.0", "id": i, "method": "m", "params": {"n": i}} for i in range(5)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        status, replies = await _post(app, calls)
+
+        assert loop.time() - started < 0.3
+        assert status == 200
+        assert [reply["result"]["n"] for reply in replies] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_notifications_get_no_reply(self):
+        """Calls without an id are executed but omitted from the reply"""
+        log = []
+        app = JSONRPCBatchMiddleware(_echo_app(log=log))
+
+        status, replies = await _post(app, [
+            {"jsonrpc": "2.0", "method": "notify"},
+            {"jsonrpc": "2.0", "id": "a", "method": "m", "params": 1}
+        ])
+        assert status == 200
+        assert replies == [{"jsonrpc": "2.0", "id": "a", "result": 1}]
+        assert len(log) == 2
+
+        status, replies = await _post(app, [{"jsonrpc": "2.0", "method": "notify"}])
+        assert status == 204 and replies is None
+
+    @pytest.mark.asyncio
+    async def test_failing_call_does_not_lose_other_replies(self):
+        """An exception from the app becomes an error reply for that call only"""
+        app = JSONRPCBatchMiddleware(_echo_app())
+
+        status, replies = await _post(app, [
+            {"jsonrpc": "2.0", "id": 1, "method": "m", "params": "ok"},
+            {"jsonrpc": "2.0", "id": 2, "method": "explode"},
+            {"jsonrpc": "2.0", "method": "explode"}
+        ])
+
+        assert status == 200
+        assert replies[0] == {"jsonrpc": "2.0", "id": 1, "result": "ok"}
+        assert replies[1]["id"] == 2 and replies[1]["error"]["code"] == -32603
+        assert len(replies) == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batches_and_passes_single_calls(self):
+        """Oversized batches get an error object; single calls reach the app untouched"""
+        app = JSONRPCBatchMiddleware(_echo_app(), max_batch_size=2)
+
+        _, reply = await _post(app, [{"jsonrpc": "2.0", "id": i, "method": "m"} for i in range(3)])
+        assert reply["error"]["code"] == -32600
+
+        _, reply = await _post(app, {"jsonrpc": "2.0", "id": 7, "method": "m", "params": "x"})
+        assert reply == {"jsonrpc": "2.0", "id": 7, "result": "x"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
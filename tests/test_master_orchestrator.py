@@ -0,0 +1,184 @@
+# ABOUTME: Tests for MasterOrchestratorTemplate task coordination helpers
+# ABOUTME: Covers dependency-driven hybrid execution and merged task streams without agents or network
+
+import asyncio
+from collections import deque
+
+import pytest
+
+from a2a_mcp.common.admission_control import AdmissionController
+from a2a_mcp.common.master_orchestrator_template import MasterOrchestratorTemplate
+
+
+class OrchestratorHarness:
+    """Carries the coordination methods under test without building a full orchestrator."""
+
+    _coordinate_hybrid_execution = MasterOrchestratorTemplate._coordinate_hybrid_execution
+    _hybrid_task_result = MasterOrchestratorTemplate._hybrid_task_result
+    _coordinate_admitted_task = MasterOrchestratorTemplate._coordinate_admitted_task
+    _merge_task_streams = MasterOrchestratorTemplate._merge_task_streams
+
+    def __init__(self, durations=None, failing=()):
+        self.stream_buffer_size = 100
+        self.task_admission = AdmissionController()
+        self.coordination_history = deque(maxlen=100)
+        self.durations = durations or {}
+        self.failing = set(failing)
+        self.timeline = {}
+
+    async def _coordinate_single_task(self, task, sessionId):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.sleep(self.durations.get(task['id'], 0.02))
+        self.timeline[task['id']] = (started, loop.time())
+        if task['id'] in self.failing:
+            raise RuntimeError(f"{task['id']} failed")
+        return {'task_id': task['id'], 'status': 'completed'}
+
+
+def _task(task_id, *dependencies):
+    return {'id': task_id, 'agent_type': 'generalist', 'dependencies': list(dependencies)}
+
+
+class TestHybridExecution:
+    """Test suite for _coordinate_hybrid_execution"""
+
+    @pytest.mark.asyncio
+    async def test_tasks_start_when_their_own_prerequisites_finish(self):
+        """Siblings run together and each chain advances without waiting for the others"""
+        orchestrator = OrchestratorHarness(durations={'slow': 0.2})
+        tasks = [
+            _task('root'),
+            _task('left', 'root'),
+            _task('right', 'root'),
+            _task('join', 'left', 'right'),
+            _task('slow'),
+            _task('after_slow', 'slow'),
+        ]
+
+        results = await orchestrator._coordinate_hybrid_execution(tasks, 'session')
+
+        timeline = orchestrator.timeline
+        assert [result['task_id'] for result in results] == [task['id'] for task in tasks]
+        assert timeline['left'][0] >= timeline['root'][1]
+        assert timeline['left'][0] < timeline['right'][1] and timeline['right'][0] < timeline['left'][1]
+        assert timeline['join'][0] >= max(timeline['left'][1], timeline['right'][1])
+        assert timeline['join'][1] < timeline['slow'][1]
+        assert timeline['after_slow'][0] >= timeline['slow'][1]
+
+    @pytest.mark.asyncio
+    async def test_failures_unknown_dependencies_and_cycles(self):
+        """Errors become result dicts, unknown IDs are ignored and cycles run last"""
+        orchestrator = OrchestratorHarness(failing={'broken'})
+        tasks = [
+            _task('broken'),
+            _task('orphan', 'missing'),
+            _task('cycle_a', 'cycle_b'),
+            _task('cycle_b', 'cycle_a'),
+        ]
+
+        results = await orchestrator._coordinate_hybrid_execution(tasks, 'session')
+
+        assert results[0] == {'task_id': 'broken', 'status': 'error', 'error': 'broken failed'}
+        assert [result['status'] for result in results[1:]] == ['completed'] * 3
+        assert orchestrator.timeline['cycle_b'][0] >= orchestrator.timeline['cycle_a'][1]
+        assert len(orchestrator.coordination_history) == 4
+
+
+async def _events(name, count, delay=0.0, log=None, fail_after=None):
+    """Task stream yielding ``count`` events, recording production and shutdown in ``log``."""
+    try:
+        for i in range(count):
+            if fail_after is not None and i == fail_after:
+                raise ValueError(f"{name} broke")
+            await asyncio.sleep(delay)
+            if log is not None:
+                log.append((name, i))
+            yield {'event_type': 'progress', 'content': f'{name}-{i}'}
+    finally:
+        if log is not None:
+            log.append((name, 'closed'))
+
+
+class TestMergeTaskStreams:
+    """Test suite for _merge_task_streams"""
+
+    @pytest.mark.asyncio
+    async def test_events_arrive_interleaved_with_ordering_metadata(self):
+        """A fast stream is not held back by a slow one and every event carries its origin"""
+        orchestrator = OrchestratorHarness()
+        events = [
+            event async for event in orchestrator._merge_task_streams([
+                _events('slow', 2, delay=0.1),
+                _events('fast', 3, delay=0.01),
+            ])
+        ]
+
+        contents = [event['content'] for event in events]
+        assert contents.index('fast-2') < contents.index('slow-0')
+        for event in events:
+            name, index = event['content'].split('-')
+            assert event['metadata']['stream_index'] == (0 if name == 'slow' else 1)
+            assert event['metadata']['stream_sequence'] == int(index)
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_ends_with_error_event(self):
+        """A stream that raises yields a task_error while the others finish"""
+        orchestrator = OrchestratorHarness()
+        events = [
+            event async for event in orchestrator._merge_task_streams([
+                _events('broken', 3, fail_after=1),
+                _events('healthy', 3, delay=0.01),
+            ])
+        ]
+
+        errors = [event for event in events if event['event_type'] == 'task_error']
+        assert len(errors) == 1
+        assert errors[0]['metadata']['stream_index'] == 0
+        assert errors[0]['metadata']['error_type'] == 'ValueError'
+        assert sum(1 for event in events if event['content'].startswith('healthy')) == 3
+
+    @pytest.mark.asyncio
+    async def test_buffer_bounds_how_far_streams_run_ahead(self):
+        """Producers block once the buffer is full instead of queueing without limit"""
+        orchestrator = OrchestratorHarness()
+        log = []
+        merged = orchestrator._merge_task_streams([_events('burst', 50, log=log)], buffer_size=3)
+
+        await merged.__anext__()
+        await asyncio.sleep(0.05)
+
+        produced = sum(1 for name, i in log if i != 'closed')
+        assert produced <= 5
+        await merged.aclose()
+        assert ('burst', 'closed') in log
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_consumer_stops_every_stream(self):
+        """Cancelling the consumer mid-stream cancels and closes all task streams"""
+        orchestrator = OrchestratorHarness()
+        log = []
+        received = []
+
+        async def consume():
+            async for event in orchestrator._merge_task_streams([
+                _events('a', 100, delay=0.01, log=log),
+                _events('b', 100, delay=0.01, log=log),
+            ]):
+                received.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+
+        assert 0 < len(received) < 200
+        assert ('a', 'closed') in log and ('b', 'closed') in log
+        produced = len(log)
+        await asyncio.sleep(0.05)
+        assert len(log) == produced
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,169 @@
+# ABOUTME: Tests for the pool of long-lived MCP client sessions
+# ABOUTME: Covers holder-task lifecycle, sharing leases across tasks, idle reaping and restart backoff
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from a2a_mcp.mcp.session_pool import MCPSessionPool
+
+
+class FakeSession:
+    """ClientSession stand-in answering pings."""
+
+    def __init__(self, number):
+        self.number = number
+
+    async def send_ping(self):
+        return None
+
+
+class FakeServer:
+    """Session factory recording which task opens and closes each session."""
+
+    def __init__(self):
+        self.opened = 0
+        self.entered_by = []
+        self.exited_by = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.opened += 1
+        self.entered_by.append(asyncio.current_task())
+        try:
+            yield FakeSession(self.opened)
+        finally:
+            self.exited_by.append(asyncio.current_task())
+
+
+class CrashingServer(FakeServer):
+    """Session factory whose first ``crashes`` connection attempts fail."""
+
+    def __init__(self, crashes):
+        super().__init__()
+        self.crashes = crashes
+        self.attempted_at = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.attempted_at.append(asyncio.get_running_loop().time())
+        if len(self.attempted_at) <= self.crashes:
+            raise ConnectionError("server process exited")
+        async with super().connect() as session:
+            yield session
+
+
+class TestMCPSessionPool:
+    """Test suite for MCPSessionPool"""
+
+    @pytest.mark.asyncio
+    async def test_leases_from_many_tasks_share_one_session(self):
+        """Concurrent leases reuse one session that outlives every leasing task"""
+        pool = MCPSessionPool()
+        server = FakeServer()
+
+        async def call():
+            async with pool.lease("server", server.connect) as session:
+                await asyncio.sleep(0.01)
+                return session
+
+        sessions = await asyncio.gather(*(asyncio.create_task(call()) for _ in range(5)))
+
+        assert server.opened == 1
+        assert all(session is sessions[0] for session in sessions)
+        stats = pool.get_stats()
+        assert stats["sessions_reused"] == 4
+        assert stats["sessions"]["server"]["leases"] == 0
+        assert server.exited_by == []
+
+        await pool.close_all()
+        # The transport context is entered and exited by the same holder task
+        assert server.exited_by == server.entered_by
+        assert server.entered_by[0] is not asyncio.current_task()
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_are_reaped(self):
+        """A session nobody leases for longer than the idle timeout is closed"""
+        pool = MCPSessionPool(idle_timeout=0.05)
+        server = FakeServer()
+        async with pool.lease("server", server.connect):
+            pass
+
+        await asyncio.sleep(1.2)
+
+        assert pool.get_stats()["sessions"] == {}
+        assert pool.get_stats()["sessions_closed"] == 1
+        assert len(server.exited_by) == 1
+
+        async with pool.lease("server", server.connect) as session:
+            assert session.number == 2
+        await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_transport_error_reconnects(self):
+        """A connection error inside a lease marks the session broken for the next caller"""
+        pool = MCPSessionPool(restart_backoff=0.0)
+        server = FakeServer()
+
+        with pytest.raises(ConnectionError):
+            async with pool.lease("server", server.connect):
+                raise ConnectionError("pipe closed")
+        async with pool.lease("server", server.connect) as session:
+            assert session.number == 2
+
+        assert pool.get_stats()["reconnects"] == 1
+        await pool.close_all()
+
+
+class TestRestartBackoff:
+    """Test suite for restarting crashed MCP sessions"""
+
+    def test_delay_doubles_up_to_the_cap(self):
+        """Each recent failure doubles the restart delay, bounded by the maximum"""
+        pool = MCPSessionPool(restart_backoff=0.5, max_restart_backoff=3.0)
+        delays = []
+        for failures in range(5):
+            pool._failures["server"] = failures
+            delays.append(pool._restart_delay("server"))
+
+        assert delays == [0.0, 0.5, 1.0, 2.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_crashing_server_is_restarted_with_backoff(self):
+        """Failed starts are retried after growing delays until the server stays up"""
+        pool = MCPSessionPool(restart_backoff=0.05, max_restart_backoff=1.0)
+        server = CrashingServer(crashes=2)
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                async with pool.lease("server", server.connect):
+                    pass
+        async with pool.lease("server", server.connect) as session:
+            assert session.number == 1
+
+        first, second, third = server.attempted_at
+        assert second - first >= 0.05
+        assert third - second >= 0.1
+        assert pool.get_stats()["connect_failures"] == 2
+        await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_stable_session_resets_failure_count(self):
+        """A session that lived past stable_after restarts after the base delay only"""
+        pool = MCPSessionPool(restart_backoff=0.05, stable_after=0.0)
+        server = FakeServer()
+        pool._failures["server"] = 4
+
+        async with pool.lease("server", server.connect):
+            pass
+        pool._sessions["server"].broken = True
+        async with pool.lease("server", server.connect):
+            pass
+
+        assert pool._restart_delay("server") == 0.05
+        await pool.close_all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
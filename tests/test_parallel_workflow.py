@@ -0,0 +1,71 @@
+# ABOUTME: Tests for ready-queue scheduling in ParallelWorkflowGraph
+# ABOUTME: Covers dependency ordering and the graph state after a node failure
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from a2a_mcp.common.parallel_workflow import ParallelWorkflowGraph, ParallelWorkflowNode
+from a2a_mcp.common.workflow import Status
+
+
+class ScriptedNode(ParallelWorkflowNode):
+    """Node that yields one chunk, or raises, without calling an agent."""
+
+    def __init__(self, name, fail=False, delay=0.01):
+        super().__init__(name, node_label=name)
+        self.fail = fail
+        self.delay = delay
+        self.ran = False
+
+    async def run_node(self, query, task_id, context_id):
+        self.ran = True
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('boom')
+        yield SimpleNamespace(root=None, node=self.task)
+
+
+def _graph(*edges, **nodes):
+    graph = ParallelWorkflowGraph()
+    for node in nodes.values():
+        graph.add_node(node)
+    for source, target in edges:
+        graph.add_edge(nodes[source].id, nodes[target].id)
+    return graph
+
+
+class TestParallelWorkflowGraph:
+    """Test suite for ParallelWorkflowGraph.run_workflow"""
+
+    @pytest.mark.asyncio
+    async def test_runs_dependents_after_predecessors(self):
+        """Every node runs once its predecessors complete and the graph completes"""
+        a, b, c = ScriptedNode('a'), ScriptedNode('b', delay=0.05), ScriptedNode('c')
+        graph = _graph(('a', 'c'), ('b', 'c'), a=a, b=b, c=c)
+
+        chunks = [chunk.node async for chunk in graph.run_workflow()]
+
+        assert chunks[-1] == 'c'
+        assert sorted(chunks) == ['a', 'b', 'c']
+        assert graph.state == Status.COMPLETED
+        assert all(node.state == Status.COMPLETED for node in (a, b, c))
+
+    @pytest.mark.asyncio
+    async def test_failed_node_fails_the_graph(self):
+        """A failure skips dependents and leaves the graph FAILED, not COMPLETED"""
+        a, b, c = ScriptedNode('a', fail=True), ScriptedNode('b'), ScriptedNode('c')
+        graph = _graph(('a', 'c'), a=a, b=b, c=c)
+
+        chunks = [chunk.node async for chunk in graph.run_workflow()]
+
+        assert chunks == ['b']
+        assert list(graph.failed_nodes) == [a.id]
+        assert isinstance(graph.failed_nodes[a.id], RuntimeError)
+        assert not c.ran
+        assert graph.state == Status.FAILED
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+# ABOUTME: Tests for RemoteMCPRegistry capability caching and cross-server workflows
+# ABOUTME: Uses an in-memory connector in place of real MCP server sessions
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from a2a_mcp.mcp.remote_mcp_connector import (
+    CrossServerWorkflowError,
+    RemoteMCPRegistry,
+    WorkflowStepSkipped
+)
+
+
+class FakeConnector:
+    """Connector stand-in serving scripted tool listings."""
+
+    def __init__(self, listings):
+        self.listings = listings
+        self.servers = {name: None for name in listings}
+        self.refreshes = 0
+        self.calls = []
+        self.closed = False
+
+    async def refresh_server_capabilities(self, server_name):
+        self.refreshes += 1
+        listing = self.listings[server_name]
+        if isinstance(listing, Exception):
+            raise listing
+        return {'tools': [SimpleNamespace(name=name) for name in listing], 'resources': []}
+
+    async def call_remote_tool(self, server_name, tool_name, arguments):
+        self.calls.append((tool_name, arguments))
+        await asyncio.sleep(0.05)
+        if tool_name == 'fail':
+            raise RuntimeError(f"{tool_name} failed")
+        return f"{tool_name}-result"
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(RemoteMCPRegistry, '_load_servers_from_config', lambda self: None)
+    registry = RemoteMCPRegistry(discovery_timeout=1.0, refresh_interval=300.0)
+    registry.connector = FakeConnector({'search': ['query'], 'files': ['read']})
+    return registry
+
+
+class TestCapabilityCache:
+    """Test suite for the versioned capability cache"""
+
+    @pytest.mark.asyncio
+    async def test_version_changes_only_with_catalog(self, registry):
+        """Rediscovering an unchanged catalog keeps the version; a new tool bumps it"""
+        await registry.discover_capabilities()
+        assert registry._capabilities['search'].version == 1
+        assert registry.catalog_version == 2
+
+        await registry.discover_capabilities(['search'])
+        assert registry._capabilities['search'].version == 1
+
+        registry.connector.listings['search'] = ['query', 'suggest']
+        await registry.discover_capabilities(['search'])
+        assert registry._capabilities['search'].version == 2
+        assert registry.catalog_version == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_server_keeps_last_known_tools(self, registry):
+        """A failing server is marked as such without losing its cached tools"""
+        await registry.discover_capabilities()
+        registry.connector.listings['files'] = ConnectionError("server down")
+
+        tools = await registry.get_all_available_tools(refresh=True)
+        assert tools['files']['status'] == 'error'
+        assert tools['files']['tools'][0].name == 'read'
+        assert tools['search']['status'] == 'ok'
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_is_tracked_and_cancelled_on_close(self, registry, caplog):
+        """The background refresh of stale entries is kept, logged on failure and stopped by close"""
+        await registry.discover_capabilities()
+        for entry in registry._capabilities.values():
+            entry.refreshed_at -= 600
+
+        async def failing_discovery(server_names=None, timeout=None):
+            raise RuntimeError("refresh failed")
+        registry.discover_capabilities = failing_discovery
+
+        with caplog.at_level(logging.ERROR):
+            await registry.get_all_available_tools()
+            task = registry._stale_refresh_task
+            assert task is not None
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.sleep(0)
+        assert "Background capability refresh failed" in caplog.text
+
+        registry.discover_capabilities = lambda *args, **kwargs: asyncio.sleep(10)
+        await registry.get_all_available_tools()
+        pending = registry._stale_refresh_task
+        await registry.close()
+
+        assert pending.cancelled()
+        assert registry._stale_refresh_task is None
+        assert registry._refresh_task is None
+        assert registry.connector.closed
+
+
+def _tool_step(tool_name, store_as=None, **arguments):
+    step = {'server': 'search', 'action': 'tool', 'tool_name': tool_name, 'arguments': arguments}
+    if store_as:
+        step['store_as'] = store_as
+    return step
+
+
+class TestCrossServerWorkflow:
+    """Test suite for dependency-aware cross-server workflows"""
+
+    def test_dependencies_bind_to_closest_earlier_producer(self):
+        """{{var}} references depend on the latest earlier step storing that name"""
+        workflow = [
+            _tool_step('a', store_as='x'),
+            _tool_step('b', store_as='x'),
+            _tool_step('c', query='{{x}} and {{ unknown }}', nested={'items': ['{{x}}']}),
+            _tool_step('d', store_as='y'),
+        ]
+
+        assert RemoteMCPRegistry._infer_step_dependencies(workflow) == [{}, {}, {'x': 1}, {}]
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self, registry):
+        """Steps without references run at once and results are substituted into dependents"""
+        workflow = [
+            _tool_step('a', store_as='first'),
+            _tool_step('b'),
+            _tool_step('c', query='{{first}}', label='after {{first}}'),
+        ]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await registry.execute_cross_server_workflow(workflow)
+
+        assert loop.time() - started < 0.14
+        assert results == ['a-result', 'b-result', 'c-result']
+        assert registry.connector.calls[-1] == ('c', {'query': 'a-result', 'label': 'after a-result'})
+
+    @pytest.mark.asyncio
+    async def test_failed_step_skips_only_its_dependents(self, registry):
+        """Dependents of a failed step are skipped transitively; other branches finish"""
+        workflow = [
+            _tool_step('fail', store_as='broken'),
+            _tool_step('uses_broken', store_as='derived', query='{{broken}}'),
+            _tool_step('uses_derived', query='{{derived}}'),
+            _tool_step('independent'),
+        ]
+
+        with pytest.raises(CrossServerWorkflowError) as raised:
+            await registry.execute_cross_server_workflow(workflow)
+
+        errors = raised.value.errors
+        assert isinstance(errors[0], RuntimeError)
+        assert isinstance(errors[1], WorkflowStepSkipped)
+        assert isinstance(errors[2], WorkflowStepSkipped)
+        assert raised.value.results[3] == 'independent-result'
+        assert [call[0] for call in registry.connector.calls] == ['fail', 'independent']
+
+        results = await registry.execute_cross_server_workflow(workflow, return_exceptions=True)
+        assert isinstance(results[2], WorkflowStepSkipped)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+# ABOUTME: Tests for bounded session state with LRU, TTL and byte-size eviction
+# ABOUTME: Covers eviction order, callbacks, in-place size updates and on-disk archiving
+
+import time
+
+import pytest
+
+from a2a_mcp.common.session_state import BoundedStateCache, SessionArchive
+
+
+class TestBoundedStateCache:
+    """Test suite for BoundedStateCache"""
+
+    def test_lru_eviction_reports_to_callback(self):
+        """The least recently used entry is evicted and handed to the callback"""
+        evicted = []
+        cache = BoundedStateCache(
+            "contexts", max_entries=2,
+            on_evict=lambda name, key, value, reason: evicted.append((name, key, value, reason))
+        )
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1  # "b" is now least recently used
+        cache["c"] = 3
+
+        assert set(cache) == {"a", "c"}
+        assert evicted == [("contexts", "b", 2, "lru")]
+        del cache["a"]  # explicit deletion is not an eviction
+        assert len(evicted) == 1
+
+        metrics = cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["evictions_lru"] == 1
+        assert metrics["entries"] == 1
+
+    def test_idle_entries_expire(self):
+        """Entries untouched for longer than the TTL are gone"""
+        cache = BoundedStateCache("streams", ttl_seconds=0.05)
+        cache["old"] = {"status": "active"}
+        time.sleep(0.08)
+        cache["new"] = {"status": "active"}
+
+        assert "old" not in cache
+        assert cache.get("old") is None
+        assert cache.get_metrics()["evictions_ttl"] == 1
+        assert cache["new"]["status"] == "active"
+
+    def test_pinned_entries_survive_ttl_and_lru(self):
+        """A pinned entry mutated through a local reference is never evicted"""
+        cache = BoundedStateCache("streams", max_entries=1, ttl_seconds=0.05)
+        state = {"events_count": 0}
+        cache.pin("running")
+        cache["running"] = state
+        cache["other"] = {}
+        time.sleep(0.08)
+        state["events_count"] += 3
+        cache["newer"] = {}
+
+        assert cache.get("running") == {"events_count": 3}
+        assert "other" not in cache
+        cache.unpin("running")
+        cache["newest"] = {}
+        assert "running" not in cache
+        assert cache.get_metrics()["pinned"] == 0
+
+    def test_byte_limit_tracks_in_place_growth(self):
+        """Growing a value in place and reporting it evicts older entries"""
+        cache = BoundedStateCache("history", max_bytes=100)
+        cache["s1"] = []
+        cache["s2"] = []
+        cache["s1"].append("x" * 60)
+        cache.update_size("s1")
+        cache["s2"].append("y" * 60)
+        cache.adjust_size("s2", 64)
+
+        assert "s1" not in cache
+        assert cache["s2"] == ["y" * 60]
+        assert cache.get_metrics()["evictions_size"] == 1
+        assert cache.get_metrics()["resident_bytes"] <= 100
+
+
+class TestSessionArchive:
+    """Test suite for SessionArchive"""
+
+    def test_archives_evicted_entries(self, tmp_path):
+        """Evicted entries are written to disk and can be loaded back"""
+        archive = SessionArchive(str(tmp_path))
+        cache = BoundedStateCache("sessions", max_entries=1, on_evict=archive)
+        cache["session/1"] = {"query": "first"}
+        cache["session/2"] = {"query": "second"}
+
+        assert archive.archived == 1
+        assert archive.load("sessions", "session/1") == {"query": "first"}
+        assert archive.load("sessions", "session/2") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+# ABOUTME: Tests for the incremental LSH vector index
+# ABOUTME: Covers exact and approximate top-k retrieval, thresholds and removal
+
+import numpy as np
+import pytest
+
+from a2a_mcp.common.embeddings import deterministic_embedding
+from a2a_mcp.common.vector_index import VectorIndex
+
+
+class TestVectorIndex:
+    """Test suite for VectorIndex"""
+
+    def test_exact_search_ranks_by_cosine(self):
+        """Small indexes return the top k above the threshold, best first"""
+        index = VectorIndex(dimension=3)
+        index.add("x", [1.0, 0.0, 0.0])
+        index.add("xy", [1.0, 1.0, 0.0])
+        index.add("z", [0.0, 0.0, 2.0])
+
+        results = index.search([2.0, 0.1, 0.0], k=2)
+        assert [key for key, _ in results] == ["x", "xy"]
+        assert results[0][1] == pytest.approx(0.9988, abs=1e-3)
+        assert [key for key, _ in index.search([0.0, 0.0, 1.0], k=5, min_score=0.5)] == ["z"]
+
+    def test_approximate_search_finds_similar_questions(self):
+        """Hashed lookups find near duplicates while scoring a fraction of the index"""
+        index = VectorIndex(dimension=256, exact_search_below=0)
+        rng = np.random.RandomState(0)
+        vocabulary = [f"term{i}" for i in range(2000)]
+        for i in range(2000):
+            question = " ".join(rng.choice(vocabulary, 8, replace=False))
+            index.add(i, deterministic_embedding(question, 256))
+        index.add("target", deterministic_embedding("how do I reset the billing password", 256))
+
+        results = index.search(deterministic_embedding("how do I reset my billing password", 256), k=3, min_score=0.4)
+        assert results[0][0] == "target"
+        stats = index.get_stats()
+        assert stats["approximate_searches"] == 1
+        assert stats["candidates_scored"] < len(index) / 4
+
+    def test_remove_and_replace(self):
+        """Removed keys are never returned; re-adding a key replaces its vector"""
+        index = VectorIndex(dimension=2)
+        for key, vector in [("a", [1.0, 0.0]), ("b", [0.0, 1.0]), ("c", [1.0, 0.1])]:
+            index.add(key, vector)
+        index.remove("a")
+        index.add("b", [1.0, 0.0])
+
+        assert "a" not in index
+        assert len(index) == 2
+        assert [key for key, _ in index.search([1.0, 0.0], k=2)] == ["b", "c"]
+        with pytest.raises(ValueError):
+            index.add("d", [1.0, 0.0, 0.0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+# ABOUTME: Tests for durable workflow checkpointing with the SQLite checkpoint store
+# ABOUTME: Covers write-through of node transitions, graph restore and orchestrator checkpoints
+
+import pytest
+
+from a2a_mcp.common.enhanced_workflow import (
+    DynamicWorkflowGraph,
+    NodeState,
+    WorkflowNode,
+    WorkflowState
+)
+from a2a_mcp.common.workflow_checkpoint import SQLiteCheckpointStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    yield store
+    store.close()
+
+
+def _build(store):
+    graph = DynamicWorkflowGraph("wf", checkpoint_store=store)
+    for name in ("a", "b", "c"):
+        graph.add_node(WorkflowNode(task=f"task {name}", id=name, node_key=name))
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "c")
+    graph.start_workflow()
+    return graph
+
+
+class TestSQLiteCheckpointStore:
+    """Test suite for workflow checkpointing and restore"""
+
+    def test_transitions_are_written_through(self, store):
+        """Node transitions are persisted as they happen"""
+        graph = _build(store)
+        graph.nodes["a"].start_execution()
+        graph.nodes["a"].complete_execution({"answer": 42})
+
+        data = store.load_workflow("wf")
+        records = {record["id"]: record for record in data["nodes"]}
+
+        assert data["workflow"]["state"] == "running"
+        assert records["a"]["state"] == "completed"
+        assert records["a"]["result"] == {"answer": 42}
+        assert records["c"]["dependencies"] == ["b"]
+
+    def test_writes_do_not_wait_for_the_database(self, store):
+        """Saving only queues the write; the writer thread commits it later"""
+        with store._lock:  # the database is busy
+            graph = _build(store)
+            graph.nodes["a"].start_execution()
+
+        assert store.load_workflow("wf")["workflow"]["state"] == "running"
+        records = {record["id"]: record for record in store.load_workflow("wf")["nodes"]}
+        assert records["a"]["state"] == "running"
+
+    def test_restore_resumes_after_completed_nodes(self, tmp_path):
+        """A restored graph keeps results and re-runs interrupted nodes"""
+        path = str(tmp_path / "checkpoints.db")
+        store = SQLiteCheckpointStore(path)
+        graph = _build(store)
+        graph.nodes["a"].start_execution()
+        graph.nodes["a"].complete_execution("done")
+        graph.nodes["b"].start_execution()  # crash before b finishes
+        store.close()
+
+        reopened = SQLiteCheckpointStore(path)
+        restored = DynamicWorkflowGraph.restore(reopened, "wf")
+
+        assert restored.state == WorkflowState.RUNNING
+        assert restored.nodes["a"].state == NodeState.COMPLETED
+        assert restored.nodes["a"].result == "done"
+        assert restored.nodes["b"].state == NodeState.PENDING
+        assert [node.id for node in restored.get_executable_nodes()] == ["b"]
+        assert restored.get_execution_plan() == [["a"], ["b"], ["c"]]
+
+        # The restored graph keeps checkpointing
+        restored.nodes["b"].start_execution()
+        restored.nodes["b"].complete_execution("again")
+        records = {record["id"]: record for record in reopened.load_workflow("wf")["nodes"]}
+        assert records["b"]["result"] == "again"
+        reopened.close()
+
+    def test_metadata_set_before_attach_is_restored(self, store):
+        """A graph built first and attached afterwards restores its plan fingerprint"""
+        graph = DynamicWorkflowGraph("wf")
+        graph.metadata["plan_fingerprint"] = "plan-1"
+        graph.add_node(WorkflowNode(task="task a", id="a", node_key="a"))
+        graph.attach_checkpoint_store(store)
+
+        restored = DynamicWorkflowGraph.restore(store, "wf")
+
+        assert restored.metadata["plan_fingerprint"] == "plan-1"
+        assert set(restored.nodes) == {"a"}
+
+    def test_removed_nodes_are_deleted(self, store):
+        """Removing a node drops its record and updates its dependents"""
+        graph = _build(store)
+        graph.remove_node("b")
+
+        records = {record["id"]: record for record in store.load_workflow("wf")["nodes"]}
+
+        assert set(records) == {"a", "c"}
+        assert records["c"]["dependencies"] == []
+
+    def test_unknown_workflow(self, store):
+        """Restoring an unknown workflow returns None"""
+        assert DynamicWorkflowGraph.restore(store, "missing") is None
+
+    def test_checkpoints_are_pruned_per_session(self, tmp_path):
+        """Only the newest checkpoints of a session are kept"""
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"), max_checkpoints_per_session=3)
+        for i in range(5):
+            store.save_checkpoint("s1", {"checkpoint_id": f"c{i}", "context": {"step": i}})
+        store.save_checkpoint("s2", {"checkpoint_id": "other"})
+
+        assert [c["checkpoint_id"] for c in store.load_checkpoints("s1")] == ["c2", "c3", "c4"]
+        assert len(store.load_checkpoints("s2")) == 1
+
+        store.delete_checkpoints("s1")
+        assert store.load_checkpoints("s1") == []
+        store.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])